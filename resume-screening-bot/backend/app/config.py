@@ -7,6 +7,32 @@ class Settings:
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
     MONGODB_URL = os.getenv("MONGODB_URL", "mongodb://localhost:27017")
+    # Async driver URL for read-heavy routes; derived from DATABASE_URL when empty
+    # (sqlite -> sqlite+aiosqlite, postgresql -> postgresql+asyncpg)
+    ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", "")
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    # Prepared/compiled statements kept per connection (driver cache) and per engine (SQL cache)
+    DB_STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "500"))
+    
+    # SQLite tuning, applied on every new connection
+    SQLITE_WAL = os.getenv("SQLITE_WAL", "true").lower() == "true"
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    
+    # Single-writer queue grouping inserts into shared transactions (on by default for SQLite)
+    WRITE_QUEUE_ENABLED = os.getenv(
+        "WRITE_QUEUE_ENABLED", "true" if DATABASE_URL.startswith("sqlite") else "false"
+    ).lower() == "true"
+    WRITE_QUEUE_MAX_BATCH = int(os.getenv("WRITE_QUEUE_MAX_BATCH", "200"))
+    WRITE_QUEUE_MAX_DELAY_MS = int(os.getenv("WRITE_QUEUE_MAX_DELAY_MS", "5"))
+    # New resumes are inserted in chunks sized from the measured per-row cost, so that one
+    # chunk keeps the writer busy for about this long
+    INSERT_BATCH_TARGET_MS = float(os.getenv("INSERT_BATCH_TARGET_MS", "100"))
     
     # API Keys
     GOOGLE_CLOUD_API_KEY = os.getenv("GOOGLE_CLOUD_API_KEY", "")
@@ -15,6 +41,65 @@ class Settings:
     UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", "uploads/")
     MAX_UPLOAD_SIZE = 10 * 1024 * 1024  # 10MB
     ALLOWED_EXTENSIONS = {"pdf", "docx", "doc", "txt"}
+    # Archive uploads (ZIP/TAR): zip-bomb limits, checked while members are decompressed
+    ARCHIVE_MAX_MEMBERS = int(os.getenv("ARCHIVE_MAX_MEMBERS", "1000"))
+    ARCHIVE_MAX_TOTAL_MB = int(os.getenv("ARCHIVE_MAX_TOTAL_MB", "1024"))
+    ARCHIVE_MAX_RATIO = int(os.getenv("ARCHIVE_MAX_RATIO", "100"))
+    # Resumable upload sessions: most files per session, and hours until an unfinished one is removed
+    UPLOAD_SESSION_MAX_FILES = int(os.getenv("UPLOAD_SESSION_MAX_FILES", "1000"))
+    UPLOAD_SESSION_TTL_HOURS = float(os.getenv("UPLOAD_SESSION_TTL_HOURS", "24"))
+    
+    # Uploaded files live in a content-addressed blob store: "filesystem" (under
+    # BLOB_STORE_PATH, default <UPLOAD_FOLDER>/blobs) or "s3" (any S3-compatible service)
+    BLOB_STORE_BACKEND = os.getenv("BLOB_STORE_BACKEND", "filesystem")
+    BLOB_STORE_PATH = os.getenv("BLOB_STORE_PATH", "")
+    BLOB_S3_BUCKET = os.getenv("BLOB_S3_BUCKET", "")
+    BLOB_S3_PREFIX = os.getenv("BLOB_S3_PREFIX", "resumes")
+    BLOB_S3_ENDPOINT_URL = os.getenv("BLOB_S3_ENDPOINT_URL", "")  # e.g. a MinIO server
+    
+    # Resume text is stored compressed in resume_texts: "zstd" (falls back to zlib when the
+    # zstandard package is missing), "zlib" or "identity"
+    TEXT_CODEC = os.getenv("TEXT_CODEC", "zstd")
+    TEXT_COMPRESSION_LEVEL = int(os.getenv("TEXT_COMPRESSION_LEVEL", "6"))
+    
+    # Extracted PDF page text, keyed by page content hash (PAGE_CACHE_PATH defaults
+    # to <UPLOAD_FOLDER>/page_cache); MEMORY_ITEMS is the per-process LRU in front of it
+    PAGE_CACHE_ENABLED = os.getenv("PAGE_CACHE_ENABLED", "true").lower() == "true"
+    PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", "")
+    PAGE_CACHE_MEMORY_ITEMS = int(os.getenv("PAGE_CACHE_MEMORY_ITEMS", "2048"))
+    
+    # PDF pages whose PyPDF2 text scores below this (0-1) are re-extracted with
+    # pdfplumber's slower layout analysis; above 1 always uses pdfplumber
+    PDF_FAST_PATH_MIN_QUALITY = float(os.getenv("PDF_FAST_PATH_MIN_QUALITY", "0.8"))
+    # PDFs with more pages than this are extracted in page ranges across the parse
+    # workers (0 = never)
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "8"))
+    
+    # Background re-parse of resumes written by an older PARSER_VERSION
+    REPARSE_ON_STARTUP = os.getenv("REPARSE_ON_STARTUP", "true").lower() == "true"
+    # Also re-extract text from the files of resumes behind EXTRACTOR_VERSION
+    REPARSE_FROM_FILES = os.getenv("REPARSE_FROM_FILES", "false").lower() == "true"
+    REPARSE_CHUNK_SIZE = int(os.getenv("REPARSE_CHUNK_SIZE", "100"))
+    REPARSE_RATE_LIMIT = float(os.getenv("REPARSE_RATE_LIMIT", "20"))  # Resumes per second, 0 = unlimited
+    
+    # Concurrency: worker processes for resume parsing, threads for blocking handlers
+    PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+    # Per-file limits in the parse workers; offending files are quarantined
+    PARSE_TIMEOUT_SECONDS = float(os.getenv("PARSE_TIMEOUT_SECONDS", "60"))
+    PARSE_WORKER_MEMORY_MB = int(os.getenv("PARSE_WORKER_MEMORY_MB", "1024"))  # On top of the worker's own footprint
+    PARSE_WORKER_MAX_TASKS = int(os.getenv("PARSE_WORKER_MAX_TASKS", "100"))  # Files before a worker is recycled
+    # Hours before a timeout/memory/crash quarantine entry expires and the file may be tried again (0 = never);
+    # image-only entries are kept, since a scanned PDF stays scanned
+    QUARANTINE_TTL_HOURS = float(os.getenv("QUARANTINE_TTL_HOURS", "168"))
+    THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "40"))
+    
+    # List endpoints: default/maximum page size, and how long per-owner counts are cached (seconds)
+    LIST_PAGE_SIZE = int(os.getenv("LIST_PAGE_SIZE", "100"))
+    LIST_MAX_PAGE_SIZE = int(os.getenv("LIST_MAX_PAGE_SIZE", "1000"))
+    COUNT_CACHE_TTL = float(os.getenv("COUNT_CACHE_TTL", "30"))
+    
+    # Responses larger than this (bytes) are gzip/brotli compressed when the client accepts it
+    COMPRESSION_MINIMUM_SIZE = int(os.getenv("COMPRESSION_MINIMUM_SIZE", "1024"))
     
     # NLP Models
     SPACY_MODEL = "en_core_web_sm"
@@ -34,3 +119,10 @@ class Settings:
     APP_NAME = "Resume Screening Bot"
 
 settings = Settings()
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def resolve_upload_folder() -> str:
+    """UPLOAD_FOLDER as an absolute path (relative paths are relative to the backend directory)"""
+    folder = settings.UPLOAD_FOLDER
+    return folder if os.path.isabs(folder) else os.path.join(BACKEND_DIR, folder)
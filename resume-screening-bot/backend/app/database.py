@@ -1,16 +1,100 @@
-from sqlalchemy import create_engine
+from sqlalchemy import bindparam, create_engine, event, inspect, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.config import settings
+from app.utils.text_codec import compress_text
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgresql+psycopg": "postgresql+psycopg_async",
+}
+
+def _pool_options(url) -> dict:
+    """Explicit pool sizing; in-memory SQLite keeps SQLAlchemy's single-connection pool"""
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": True,
+    }
+
+def _async_url(sync_url: str):
+    """The async-driver URL: ASYNC_DATABASE_URL, or DATABASE_URL with its driver swapped"""
+    if settings.ASYNC_DATABASE_URL:
+        url = make_url(settings.ASYNC_DATABASE_URL)
+    else:
+        url = make_url(sync_url)
+        url = url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername))
+    if url.drivername == "postgresql+asyncpg":
+        # asyncpg prepares every statement; keep the prepared ones per connection
+        url = url.update_query_dict({"prepared_statement_cache_size": str(settings.DB_STATEMENT_CACHE_SIZE)})
+    return url
+
+def _connect_args(url) -> dict:
+    if url.get_backend_name() == "sqlite":
+        # sqlite3 keeps this many prepared statements per connection
+        args = {"cached_statements": settings.DB_STATEMENT_CACHE_SIZE}
+        if url.get_driver_name() != "aiosqlite":
+            args["check_same_thread"] = False
+        return args
+    return {}
 
 # Create database engine
+_sync_url = make_url(settings.DATABASE_URL)
 engine = create_engine(
-    settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    _sync_url,
+    connect_args=_connect_args(_sync_url),
+    query_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+    **_pool_options(_sync_url)
 )
 
+def _on_sqlite_connect(dbapi_connection, connection_record):
+    """WAL lets readers run alongside the single writer; the rest trades durability of the
+    last few commits on power loss (never corruption) for far fewer fsyncs"""
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.close()
+
+if _sync_url.get_backend_name() == "sqlite":
+    event.listen(engine, "connect", _on_sqlite_connect)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Sessions owned by the write queue: objects stay readable after commit, once handed back
+WriterSession = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+
+# Async engine for read-heavy routes (aiosqlite locally, asyncpg on Postgres)
+_async_db_url = _async_url(settings.DATABASE_URL)
+_async_pool = _pool_options(_async_db_url)
+async_engine = create_async_engine(
+    _async_db_url,
+    connect_args=_connect_args(_async_db_url),
+    query_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+    **({"poolclass": AsyncAdaptedQueuePool, **_async_pool} if _async_pool else {})
+)
+
+if _async_db_url.get_backend_name() == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _on_sqlite_connect)
+
+# expire_on_commit=False: async sessions cannot lazy-load attributes after a commit
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -21,3 +105,90 @@ def get_db():
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+# Indexes replaced by a differently keyed one (indexes are matched by name, so a changed
+# key gets a new name); dropped from existing databases by upgrade_schema()
+RETIRED_INDEXES = {
+    # Keyed (resume_id, created_at): keyset pages by id had to sort every entry of the resume
+    "analysis_results": ["ix_analysis_results_resume_created"],
+}
+
+def upgrade_schema():
+    """Add columns and indexes that were introduced after a table was first created.
+
+    create_all() only creates missing tables, so existing databases (like the bundled
+    test.db) would otherwise never pick up new columns or indexes. A column declared with
+    info={"backfill": "<sql expression>"} is filled from that expression when it is added.
+    Indexes listed in RETIRED_INDEXES are dropped.
+    """
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    column_type = column.type.compile(dialect=engine.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+                    print(f"Schema upgrade: added {table.name}.{column.name}")
+                    backfill = column.info.get("backfill")
+                    if backfill:
+                        conn.execute(text(f"UPDATE {table.name} SET {column.name} = {backfill}"))
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for name in RETIRED_INDEXES.get(table.name, []):
+                if name in existing_indexes:
+                    conn.execute(text(f"DROP INDEX {name}"))
+                    print(f"Schema upgrade: dropped index {name}")
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(conn)
+                    print(f"Schema upgrade: created index {index.name}")
+
+def move_inline_resume_text(batch_size: int = 1000):
+    """Move text from the old inline resumes.raw_text column into compressed resume_texts rows.
+
+    Runs in batches, each moving and clearing its rows in one transaction, so it can be
+    interrupted and resumed. The emptied column is left in place (dropping it would
+    rewrite the table); VACUUM afterwards to give the space back to the filesystem.
+    """
+    if "raw_text" not in {c["name"] for c in inspect(engine).get_columns("resumes")}:
+        return
+    moved = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, raw_text FROM resumes WHERE raw_text IS NOT NULL ORDER BY id LIMIT :n"
+            ), {"n": batch_size}).all()
+            if not rows:
+                break
+            ids = [row.id for row in rows]
+            already = {
+                resume_id for (resume_id,) in conn.execute(
+                    text("SELECT resume_id FROM resume_texts WHERE resume_id IN :ids").bindparams(
+                        bindparam("ids", expanding=True)
+                    ), {"ids": ids}
+                )
+            }
+            records = []
+            for row in rows:
+                if row.id in already:
+                    continue
+                codec, data = compress_text(row.raw_text)
+                records.append({"resume_id": row.id, "codec": codec, "data": data, "size": len(row.raw_text.encode("utf-8"))})
+            if records:
+                conn.execute(text(
+                    "INSERT INTO resume_texts (resume_id, codec, data, size) VALUES (:resume_id, :codec, :data, :size)"
+                ), records)
+            conn.execute(
+                text("UPDATE resumes SET raw_text = NULL WHERE id IN :ids").bindparams(bindparam("ids", expanding=True)),
+                {"ids": ids}
+            )
+            moved += len(records)
+    if moved:
+        print(f"Schema upgrade: moved {moved} resume texts into resume_texts")
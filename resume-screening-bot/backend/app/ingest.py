@@ -0,0 +1,276 @@
+"""
+Offline import of resume files from a directory tree, without going through HTTP.
+
+    python -m app.ingest <dir> [--user-id 1] [--batch 500] [--workers 4] [--restart]
+
+For migrations of tens of thousands of resumes. Files with an allowed extension
+are taken in a stable (sorted) walk order, a batch at a time:
+
+- hashed in a thread pool; content already in the database (or earlier in the
+  run) is skipped as a duplicate, quarantined content as quarantined;
+- parsed in the sandboxed worker pool, straight from the source file. The next
+  batch is hashed and queued before the current one is written, so the workers
+  never wait for the database;
+- stored in the blob store and inserted as Resume rows in one transaction per
+  batch, then scored against open jobs (unless --skip-matching).
+
+After each batch is committed, the position in the walk and the running counts
+go to a checkpoint file (--checkpoint, default under UPLOAD_FOLDER/ingest/), so
+an interrupted run resumes after the last committed batch. Should the tree have
+changed in between, content dedup still keeps files from being imported twice.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from app.config import settings, resolve_upload_folder
+from app.database import Base, SessionLocal, engine, upgrade_schema
+from app.models.models import Resume
+from app.services.blob_store import LocalFile, blob_store
+from app.services.match_index import match_index
+from app.services.quarantine import quarantine
+from app.services.resume_parser import EXTRACTOR_VERSION, PARSER_VERSION, parse_resume_file
+from app.services.resume_writer import resume_writer
+from app.services.resume_search import resume_search
+from app.utils.executors import get_process_pool, shutdown_executors
+from app.utils.sandbox import ParseAborted
+from app.utils.write_queue import write_queue
+
+# Error messages kept as examples in the checkpoint, per distinct message
+ERROR_EXAMPLES = 3
+
+class FolderImporter:
+    def __init__(self, directory: str, user_id: Optional[int] = None, batch_size: int = 500,
+                 checkpoint_path: Optional[str] = None, match: bool = True):
+        self.directory = os.path.abspath(directory)
+        self.user_id = user_id
+        self.batch_size = batch_size
+        self.checkpoint_path = checkpoint_path or self.default_checkpoint(self.directory)
+        self.match = match
+        self.stats = Counter()  # files, imported, duplicates, quarantined, failed
+        self.errors: Dict[str, dict] = {}  # message -> {"count", "examples"}
+        self.position = 0  # Files of the walk committed so far
+        self._seen = set()  # Content hashes queued in this run
+        self._hashing = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ingest-hash")
+
+    @staticmethod
+    def default_checkpoint(directory: str) -> str:
+        name = hashlib.sha1(directory.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(resolve_upload_folder(), "ingest", f"{name}.json")
+
+    def walk(self) -> Iterator[str]:
+        """Resume files under the directory in a stable order (hidden files and directories skipped)"""
+        for root, dirs, files in os.walk(self.directory):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(files):
+                if not name.startswith(".") and Path(name).suffix.lower().lstrip(".") in settings.ALLOWED_EXTENSIONS:
+                    yield os.path.join(root, name)
+
+    def run(self, restart: bool = False) -> Counter:
+        if not restart and self._load_checkpoint():
+            print(f"Resuming {self.directory} after {self.position} files ({self.checkpoint_path})")
+        pool = get_process_pool()
+        started = time.monotonic()
+        resumed_at = queued = self.position
+        batch: List[str] = []
+        pending = None  # Batch whose parses are queued, waiting to be written
+        try:
+            for index, path in enumerate(self.walk()):
+                if index < self.position:
+                    continue
+                batch.append(path)
+                if len(batch) == self.batch_size:
+                    # Queue this batch before writing the previous one
+                    queued += len(batch)
+                    prepared = self._submit(pool, batch, queued)
+                    if pending:
+                        self._finish(pending, started, resumed_at)
+                    pending, batch = prepared, []
+            if batch:
+                prepared = self._submit(pool, batch, queued + len(batch))
+                if pending:
+                    self._finish(pending, started, resumed_at)
+                pending = prepared
+            if pending:
+                self._finish(pending, started, resumed_at)
+            self._save_checkpoint(finished=True)
+        finally:
+            self._hashing.shutdown(wait=False, cancel_futures=True)
+        self._summary(time.monotonic() - started, self.position - resumed_at)
+        return self.stats
+
+    def _describe(self, path: str):
+        try:
+            return blob_store.describe(path)
+        except OSError as e:
+            return e
+
+    def _submit(self, pool, paths: List[str], end: int) -> dict:
+        """Hash a batch (ending at position end of the walk), drop duplicates and queue the rest for parsing"""
+        sources = list(self._hashing.map(self._describe, paths))
+        hashes = [source.sha256 for source in sources if isinstance(source, LocalFile)]
+        db = SessionLocal()
+        try:
+            imported = {sha256 for (sha256,) in db.query(Resume.blob_sha256).filter(Resume.blob_sha256.in_(hashes))}
+        finally:
+            db.close()
+        quarantined = quarantine.lookup(hashes)
+
+        items = []  # (path, source or None, future or outcome message)
+        for path, source in zip(paths, sources):
+            if not isinstance(source, LocalFile):
+                items.append((path, None, f"Could not read file: {source}"))
+            elif source.sha256 in imported or source.sha256 in self._seen:
+                items.append((path, source, "duplicate"))
+            elif source.sha256 in quarantined:
+                items.append((path, source, "quarantined"))
+            else:
+                self._seen.add(source.sha256)
+                items.append((path, source, pool.submit(parse_resume_file, path, Path(path).suffix.lower())))
+        return {"items": items, "end": end}
+
+    def _finish(self, batch: dict, started: float, resumed_at: int):
+        """Collect a batch's parses, write its resumes and checkpoint"""
+        resumes, sources = [], []
+        for path, source, outcome in batch["items"]:
+            self.stats["files"] += 1
+            if outcome == "duplicate":
+                self.stats["duplicates"] += 1
+                continue
+            if outcome == "quarantined":
+                self.stats["quarantined"] += 1
+                continue
+            if isinstance(outcome, str):
+                self._fail(path, outcome)
+                continue
+            filename = os.path.basename(path)
+            try:
+                parsed = outcome.result()
+            except ParseAborted as e:
+                quarantine.add(source.sha256, source, filename, self.user_id, e.reason, e.detail)
+                self._fail(path, f"File quarantined: {e.reason}", "quarantined")
+                continue
+            except Exception as e:
+                self._fail(path, str(e))
+                continue
+            stats = parsed["extraction_stats"]
+            if not parsed["raw_text"]:
+                if stats.get("content") == "image-only":
+                    quarantine.add(source.sha256, source, filename, self.user_id, "image-only",
+                                   f"no text on any of {stats.get('checked_pages')} pages")
+                    self._fail(path, "Scanned PDF without a text layer", "quarantined")
+                else:
+                    self._fail(path, "Could not extract text from file")
+                continue
+            resumes.append(Resume(
+                user_id=self.user_id,
+                filename=filename,
+                file_path=blob_store.locator(source.sha256),
+                blob_sha256=source.sha256,
+                raw_text=parsed["raw_text"],
+                parsed_data=parsed["parsed_data"],
+                parser_version=PARSER_VERSION,
+                extractor_version=EXTRACTOR_VERSION,
+                extraction_stats=stats
+            ))
+            sources.append(source)
+
+        if resumes:
+            # Bytes into the blob store first (hard links on the same filesystem),
+            # so the write transaction only counts references
+            list(self._hashing.map(blob_store.store, sources))
+            # In transactions sized from the measured per-row write cost
+            ids = resume_writer.insert(resumes, sources)
+            self.stats["imported"] += len(ids)
+            if self.match:
+                match_index.refresh_resumes(ids)
+        self.position = batch["end"]
+        self._save_checkpoint()
+
+        elapsed = time.monotonic() - started
+        rate = (self.position - resumed_at) / elapsed if elapsed else 0
+        print(f"{self.position} files: {self.stats['imported']} imported, {self.stats['duplicates']} duplicates, "
+              f"{self.stats['quarantined']} quarantined, {self.stats['failed']} failed ({rate:.1f} files/s)")
+
+    def _fail(self, path: str, message: str, outcome: str = "failed"):
+        self.stats[outcome] += 1
+        entry = self.errors.setdefault(message, {"count": 0, "examples": []})
+        entry["count"] += 1
+        if len(entry["examples"]) < ERROR_EXAMPLES:
+            entry["examples"].append(os.path.relpath(path, self.directory))
+
+    def _load_checkpoint(self) -> bool:
+        try:
+            with open(self.checkpoint_path) as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return False
+        if checkpoint.get("directory") != self.directory or checkpoint.get("finished"):
+            # A finished import starts over (everything it finds is a duplicate by now)
+            return False
+        self.position = checkpoint["position"]
+        self.stats.update(checkpoint.get("stats", {}))
+        self.errors = checkpoint.get("errors", {})
+        return True
+
+    def _save_checkpoint(self, finished: bool = False):
+        os.makedirs(os.path.dirname(self.checkpoint_path), exist_ok=True)
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "directory": self.directory,
+                "position": self.position,
+                "finished": finished,
+                "stats": dict(self.stats),
+                "errors": self.errors,
+                "updated_at": datetime.utcnow().isoformat(),
+            }, f, indent=1)
+        # Never leave a half-written checkpoint behind
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _summary(self, elapsed: float, files: int):
+        print(f"Done: {files} files in {elapsed:.1f} s ({files / elapsed if elapsed else 0:.1f} files/s); "
+              f"totals {dict(self.stats)}")
+        if self.errors:
+            print("Errors:")
+            for message, entry in sorted(self.errors.items(), key=lambda item: -item[1]["count"]):
+                print(f"  {entry['count']:>6}  {message}  (e.g. {', '.join(entry['examples'])})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Import resume files from a directory tree")
+    parser.add_argument("directory")
+    parser.add_argument("--user-id", type=int, default=None, help="owner of the imported resumes")
+    parser.add_argument("--batch", type=int, default=500, help="files per transaction")
+    parser.add_argument("--workers", type=int, default=settings.PARSE_WORKERS, help="parse worker processes")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file (default: under UPLOAD_FOLDER/ingest/)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and walk from the start")
+    parser.add_argument("--skip-matching", action="store_true", help="do not score imports against open jobs")
+    args = parser.parse_args()
+    if not os.path.isdir(args.directory):
+        parser.error(f"not a directory: {args.directory}")
+
+    # A migration may target a fresh database; the search index must see the inserts
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema()
+    resume_search.ensure_index(engine)
+
+    settings.PARSE_WORKERS = args.workers
+    importer = FolderImporter(args.directory, user_id=args.user_id, batch_size=args.batch,
+                              checkpoint_path=args.checkpoint, match=not args.skip_matching)
+    try:
+        importer.run(restart=args.restart)
+    except KeyboardInterrupt:
+        print(f"Interrupted; rerun to resume after {importer.position} files")
+    finally:
+        shutdown_executors()
+        write_queue.stop()
+
+if __name__ == "__main__":
+    main()
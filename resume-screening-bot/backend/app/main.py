@@ -2,6 +2,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
+from app.config import settings
+from app.utils.responses import CompressionMiddleware
+from app.utils.executors import configure_thread_pool, shutdown_executors, run_blocking
+from app.utils.write_queue import write_queue
+from app.utils.pagination import PAGINATION_HEADERS
 
 # Load environment variables
 load_dotenv()
@@ -24,22 +29,34 @@ origins = [
     "http://192.168.1.12:3001",
 ]
 
+# Compress large JSON responses (bulk results, career paths)
+app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=PAGINATION_HEADERS,
 )
 
 # Initialize database tables
-from app.database import engine, Base
+from app.database import engine, async_engine, Base, upgrade_schema, move_inline_resume_text
 from app.models import models  # Import models to register them
 Base.metadata.create_all(bind=engine)
+upgrade_schema()
+move_inline_resume_text()
+
+# Full-text index over resume text (FTS5 on SQLite, tsvector on Postgres)
+from app.services.resume_search import resume_search
+resume_search.ensure_index(engine)
 
 # Import routes
 from app.routes import resume_routes, job_routes, analysis_routes, student_routes
 from app.services import ats_screening
+from app.services.reparse import reparser
+from app.services.quarantine import quarantine
 
 # Include routers
 app.include_router(resume_routes.router, prefix="/api/resumes", tags=["Resumes"])
@@ -48,6 +65,23 @@ app.include_router(analysis_routes.router, prefix="/api/analysis", tags=["Analys
 app.include_router(student_routes.router, prefix="/api/students", tags=["Student Tools"])
 app.include_router(ats_screening.router, tags=["ATS Screening"])
 
+@app.on_event("startup")
+async def startup():
+    configure_thread_pool()
+    try:
+        await run_blocking(quarantine.sweep)
+    except Exception as e:
+        print(f"Quarantine sweep failed: {e}")
+    if settings.REPARSE_ON_STARTUP:
+        reparser.start(from_files=settings.REPARSE_FROM_FILES)
+
+@app.on_event("shutdown")
+async def shutdown():
+    reparser.stop()
+    shutdown_executors()
+    write_queue.stop()
+    await async_engine.dispose()
+
 @app.get("/")
 async def root():
     return {
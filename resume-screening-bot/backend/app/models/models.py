@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Text, Boolean, ForeignKey, JSON, Index, UniqueConstraint, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
+from app.utils.text_codec import compress_text, decompress_text
 
 class User(Base):
     __tablename__ = "users"
@@ -21,24 +22,114 @@ class User(Base):
 
 class Resume(Base):
     __tablename__ = "resumes"
+    __table_args__ = (
+        # Covers get_user_resumes (id, filename, ats_score, uploaded_at) without touching the table
+        Index("ix_resumes_user_listing", "user_id", "id", "filename", "ats_score", "uploaded_at"),
+        # Let the re-parse worker find outdated resumes in id order
+        Index("ix_resumes_parser_version", "parser_version", "id"),
+        Index("ix_resumes_extractor_version", "extractor_version", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     filename = Column(String)
-    file_path = Column(String)
-    raw_text = Column(Text)
+    file_path = Column(String)  # Blob store locator (legacy rows: a file in UPLOAD_FOLDER)
+    blob_sha256 = Column(String(64), ForeignKey("stored_blobs.sha256"), index=True)  # NULL for legacy uploads
     parsed_data = Column(JSON)  # Standardized resume structure
     ats_score = Column(Float, default=0.0)
     uploaded_at = Column(DateTime, default=datetime.utcnow)
+    parser_version = Column(Integer, default=0, info={"backfill": "0"})  # PARSER_VERSION that produced parsed_data
+    extractor_version = Column(Integer, default=0, info={"backfill": "0"})  # EXTRACTOR_VERSION that produced the text
+    extraction_stats = Column(JSON)  # How the text was extracted: strategy, quality scores, timings
     
     user = relationship("User", back_populates="resumes")
     analysis_results = relationship("AnalysisResult", back_populates="resume")
+    # Never loaded implicitly: queries that need raw_text ask for it with selectinload(Resume.text_record)
+    text_record = relationship("ResumeText", uselist=False, cascade="all, delete-orphan", lazy="raise")
+
+    @property
+    def raw_text(self) -> str:
+        """Extracted resume text, decompressed from text_record on each access"""
+        record = self.text_record
+        return decompress_text(record.codec, record.data) if record else ""
+
+    @raw_text.setter
+    def raw_text(self, value: str):
+        codec, data = compress_text(value or "")
+        size = len((value or "").encode("utf-8"))
+        if self.text_record is None:
+            self.text_record = ResumeText(codec=codec, data=data, size=size)
+        else:
+            self.text_record.codec, self.text_record.data, self.text_record.size = codec, data, size
+
+class ResumeText(Base):
+    """Extracted resume text, compressed and kept out of the resumes table"""
+    __tablename__ = "resume_texts"
+    
+    resume_id = Column(Integer, ForeignKey("resumes.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String, nullable=False)  # "zstd", "zlib" or "identity"
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer)  # Uncompressed size in bytes
+
+class StoredBlob(Base):
+    """One uploaded file in the content-addressed blob store, shared by identical uploads"""
+    __tablename__ = "stored_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer)
+    refcount = Column(Integer, nullable=False, default=0)  # Resumes pointing at this blob
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class QuarantinedFile(Base):
+    """An upload that hit a parse worker's time or memory limit, kept for inspection"""
+    __tablename__ = "quarantined_files"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    sha256 = Column(String(64), ForeignKey("stored_blobs.sha256"), index=True)  # Holds a blob reference
+    filename = Column(String)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    reason = Column(String)  # "timeout", "memory" or "crash"
+    detail = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class UploadSession(Base):
+    """A resumable multi-file upload: files arrive in chunks and are parsed as each one completes"""
+    __tablename__ = "upload_sessions"
+    
+    id = Column(String(32), primary_key=True)  # Random hex token
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    status = Column(String, default="open")  # "open" or "committed"
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    
+    files = relationship("UploadSessionFile", order_by="UploadSessionFile.id", cascade="all, delete-orphan")
+
+class UploadSessionFile(Base):
+    """One declared file of an upload session; its received bytes are the size of its part file"""
+    __tablename__ = "upload_session_files"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    session_id = Column(String(32), ForeignKey("upload_sessions.id", ondelete="CASCADE"), index=True)
+    filename = Column(String)
+    size = Column(Integer)  # Declared size in bytes
+    # "receiving", "parsing", "done", "failed", "rejected" (refused when declared) or "incomplete" (at commit)
+    status = Column(String, default="receiving")
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=True)
+    error = Column(Text)
+
+class MaintenanceCheckpoint(Base):
+    """Progress of a resumable background job (e.g. the re-parse backfill)"""
+    __tablename__ = "maintenance_checkpoints"
+    
+    name = Column(String, primary_key=True)
+    version = Column(Integer)  # What the job is working towards; a new version restarts it
+    cursor = Column(Integer, default=0)  # Last id processed
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
 class JobPosting(Base):
     __tablename__ = "job_postings"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     title = Column(String)
     description = Column(Text)
     required_skills = Column(JSON)
@@ -52,27 +143,56 @@ class JobPosting(Base):
 
 class AnalysisResult(Base):
     __tablename__ = "analysis_results"
+    __table_args__ = (
+        # (resume_id, id) to seek get_resume_analyses' keyset pages, plus the columns it
+        # returns: an index-only scan in page order, with no sort
+        Index(
+            "ix_analysis_results_resume_listing",
+            "resume_id", "id", "created_at", "overall_score", "matched_count", "missing_count"
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"))
     resume_id = Column(Integer, ForeignKey("resumes.id"))
-    job_id = Column(Integer, ForeignKey("job_postings.id"), nullable=True)
+    job_id = Column(Integer, ForeignKey("job_postings.id"), nullable=True, index=True)
+    run_id = Column(String, index=True)  # Groups the rows written by one analyze/bulk-analyze call
     overall_score = Column(Float)
     skills_matched = Column(JSON)
     skills_missing = Column(JSON)
+    # Denormalized len(skills_matched) / len(skills_missing), written at insert
+    matched_count = Column(Integer, info={"backfill": "COALESCE(json_array_length(skills_matched), 0)"})
+    missing_count = Column(Integer, info={"backfill": "COALESCE(json_array_length(skills_missing), 0)"})
     extra_skills = Column(JSON)
     recommendations = Column(JSON)
+    components = Column(JSON)  # Component scores used to rebuild explanations on demand
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User", back_populates="analysis_results")
     resume = relationship("Resume", back_populates="analysis_results")
     job = relationship("JobPosting", back_populates="analysis_results")
 
+class JobMatch(Base):
+    """Pre-computed match score for every (open job, resume) pair"""
+    __tablename__ = "job_matches"
+    __table_args__ = (
+        UniqueConstraint("job_id", "resume_id", name="uq_job_matches_job_resume"),
+        Index("ix_job_matches_job_score", "job_id", "score"),
+        Index("ix_job_matches_resume_id", "resume_id"),
+    )
+    
+    id = Column(Integer, primary_key=True)
+    job_id = Column(Integer, ForeignKey("job_postings.id"), nullable=False)
+    resume_id = Column(Integer, ForeignKey("resumes.id"), nullable=False)
+    score = Column(Float)
+    components = Column(JSON)  # {"skill": ..., "keyword": ..., "experience": ..., ...}
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
 class StudentCareerProfile(Base):
     __tablename__ = "student_profiles"
     
     id = Column(Integer, primary_key=True, index=True)
-    user_id = Column(Integer, ForeignKey("users.id"))
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
     resume_id = Column(Integer, ForeignKey("resumes.id"))
     skills = Column(JSON)
     education = Column(JSON)
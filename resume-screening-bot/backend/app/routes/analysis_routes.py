@@ -1,13 +1,25 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.models import Resume, JobPosting, AnalysisResult
+from fastapi import APIRouter, HTTPException, Depends, Query
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
+from app.models.models import Resume, ResumeText, JobPosting, AnalysisResult
 from app.services.nlp_analyzer import NLPAnalyzer
 from app.services.text_processor import TextPreprocessor
 from app.services.advanced_matcher import AdvancedResumeMatcher
+from app.services.match_matrix import MatchMatrixScorer
 from app.utils.scoring import ATSScorer, ResumeRecommender
-from app.schemas.schemas import BulkAnalysisRequest, AnalyzeResumeJobRequest
-from typing import List
+from app.utils.responses import FastJSONResponse
+from app.utils.write_queue import write_queue
+from app.utils.text_codec import decompress_text
+from app.utils.pagination import PageParams, count_cache
+from app.utils.fields import resolve_fields, select_fields, to_columns, ANALYSIS_COMPACT_FIELDS, BULK_ANALYSIS_COMPACT_FIELDS
+from app.schemas.schemas import BulkAnalysisRequest, AnalyzeResumeJobRequest, MatrixAnalysisRequest
+from typing import List, Optional
+import io
+import uuid
+import numpy as np
 
 router = APIRouter()
 
@@ -15,15 +27,25 @@ nlp_analyzer = NLPAnalyzer()
 ats_scorer = ATSScorer()
 text_processor = TextPreprocessor()
 advanced_matcher = AdvancedResumeMatcher()
+matrix_scorer = MatchMatrixScorer(advanced_matcher)
+
+# Keep IN (...) lists under SQLite's bound-parameter limit
+ID_CHUNK_SIZE = 900
 
 @router.post("/analyze-resume-job")
-async def analyze_resume_against_job(request: AnalyzeResumeJobRequest, db: Session = Depends(get_db)):
+def analyze_resume_against_job(
+    request: AnalyzeResumeJobRequest,
+    fields: Optional[str] = Query(default=None),
+    db: Session = Depends(get_db)
+):
     """Analyze single resume against job description using advanced matching"""
+    if request.detail not in AdvancedResumeMatcher.DETAIL_LEVELS:
+        raise HTTPException(status_code=400, detail="detail must be 'score', 'summary' or 'full'")
     try:
         resume_id = request.resume_id
         job_id = request.job_id
         
-        resume = db.query(Resume).filter(Resume.id == resume_id).first()
+        resume = db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id == resume_id).first()
         job = db.query(JobPosting).filter(JobPosting.id == job_id).first()
         
         if not resume or not job:
@@ -42,28 +64,35 @@ async def analyze_resume_against_job(request: AnalyzeResumeJobRequest, db: Sessi
         match_result = advanced_matcher.match_resume_to_job(
             resume_data=resume_data,
             resume_text=resume.raw_text or "",
-            job_description=job_description
+            job_description=job_description,
+            detail=request.detail
         )
         
         print(f"Match Result - Score: {match_result.get('overall_score')}, Category: {match_result.get('category')}")
         
         # Save analysis result
+        run_id = uuid.uuid4().hex
         analysis = AnalysisResult(
             user_id=resume.user_id,
             resume_id=resume_id,
             job_id=job_id,
+            run_id=run_id,
             overall_score=match_result["overall_score"],
             skills_matched=match_result["matched_skills"],
             skills_missing=match_result["missing_skills"],
+            matched_count=len(match_result["matched_skills"]),
+            missing_count=len(match_result["missing_skills"]),
             extra_skills=[],
-            recommendations=match_result["explanation"]
+            recommendations=match_result.get("explanation"),
+            components=match_result["components"]
         )
-        db.add(analysis)
-        db.commit()
-        db.refresh(analysis)
+        write_queue.add_all([analysis])
+        count_cache.invalidate(("analyses", resume_id))
         
-        return {
+        response = {
             "analysis_id": analysis.id,
+            "run_id": run_id,
+            "detail": request.detail,
             "resume_id": resume_id,
             "filename": resume.filename,
             
@@ -113,9 +142,7 @@ async def analyze_resume_against_job(request: AnalyzeResumeJobRequest, db: Sessi
                 "score": match_result["education_profile_fit"]["score"]
             },
             "keyword_similarity": match_result.get("keyword_similarity", {}),
-            "matched_skills": match_result["matched_skills"],
-            "missing_skills": match_result["missing_skills"],
-            "explanation": match_result["explanation"],
+            "explanation": match_result.get("explanation"),
             "detailed_breakdown": {
                 "skill_match": match_result["skill_match"],
                 "project_relevance": match_result["project_relevance"],
@@ -123,6 +150,7 @@ async def analyze_resume_against_job(request: AnalyzeResumeJobRequest, db: Sessi
                 "education_fit": match_result["education_profile_fit"]
             }
         }
+        return select_fields(response, resolve_fields(fields, ANALYSIS_COMPACT_FIELDS))
     except HTTPException:
         raise
     except Exception as e:
@@ -130,11 +158,19 @@ async def analyze_resume_against_job(request: AnalyzeResumeJobRequest, db: Sessi
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/bulk-analyze")
-async def bulk_analyze(request: BulkAnalysisRequest, db: Session = Depends(get_db)):
+@router.post("/bulk-analyze", response_class=FastJSONResponse)
+def bulk_analyze(
+    request: BulkAnalysisRequest,
+    fields: Optional[str] = Query(default=None),
+    db: Session = Depends(get_db)
+):
     """Analyze multiple resumes at once using advanced matching"""
+    if request.detail not in AdvancedResumeMatcher.DETAIL_LEVELS:
+        raise HTTPException(status_code=400, detail="detail must be 'score', 'summary' or 'full'")
     try:
         results = []
+        analyses = []
+        run_id = uuid.uuid4().hex
         
         # Get job description
         job_description = ""
@@ -150,9 +186,13 @@ async def bulk_analyze(request: BulkAnalysisRequest, db: Session = Depends(get_d
         if not job_description:
             raise HTTPException(status_code=400, detail="Job description is required")
         
-        # Analyze all resumes
+        # Analyze all resumes, loaded with their text in one go
+        resumes = {
+            resume.id: resume
+            for resume in db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id.in_(request.resume_ids))
+        }
         for resume_id in request.resume_ids:
-            resume = db.query(Resume).filter(Resume.id == resume_id).first()
+            resume = resumes.get(resume_id)
             if not resume:
                 continue
             
@@ -162,10 +202,27 @@ async def bulk_analyze(request: BulkAnalysisRequest, db: Session = Depends(get_d
                 match_result = advanced_matcher.match_resume_to_job(
                     resume_data=resume_data,
                     resume_text=resume.raw_text or "",
-                    job_description=job_description
+                    job_description=job_description,
+                    detail=request.detail
                 )
                 
-                results.append({
+                # Component scores are kept so /{run_id}/{resume_id}/explain can rebuild the narrative
+                analyses.append(AnalysisResult(
+                    user_id=resume.user_id,
+                    resume_id=resume_id,
+                    job_id=job_id,
+                    run_id=run_id,
+                    overall_score=match_result["overall_score"],
+                    skills_matched=match_result["matched_skills"],
+                    skills_missing=match_result["missing_skills"],
+                    matched_count=len(match_result["matched_skills"]),
+                    missing_count=len(match_result["missing_skills"]),
+                    extra_skills=[],
+                    recommendations=match_result.get("explanation"),
+                    components=match_result["components"]
+                ))
+                
+                row = {
                     "resume_id": resume_id,
                     "filename": resume.filename,
                     "overall_score": match_result["overall_score"],
@@ -175,21 +232,28 @@ async def bulk_analyze(request: BulkAnalysisRequest, db: Session = Depends(get_d
                     "project_relevance_score": match_result["project_relevance"]["score"],
                     "experience_score": match_result["experience_alignment"]["score"],
                     "education_score": match_result["education_profile_fit"]["score"],
-                    "matched_skills": match_result["matched_skills"],
-                    "missing_skills": match_result["missing_skills"],
-                    "missing_skills_list": match_result.get("missing_skills_list", []),
-                    "improvements": match_result.get("improvements", []),
-                    "matching_details": match_result.get("matching_details", {}),
-                    "experience_match_status": match_result.get("experience_match_status", "Fair"),
-                    "resume_strength_10": match_result.get("resume_strength_10", 0),
-                    "explanation": match_result["explanation"],
-                    "detailed_breakdown": {
-                        "skill_match": match_result["skill_match"],
-                        "project_relevance": match_result["project_relevance"],
-                        "experience_alignment": match_result["experience_alignment"],
-                        "education_fit": match_result["education_profile_fit"]
-                    }
-                })
+                    "matched_count": len(match_result["matched_skills"]),
+                    "missing_count": len(match_result["missing_skills"])
+                }
+                if request.detail != "score":
+                    row.update({
+                        "matched_skills": match_result["matched_skills"],
+                        "missing_skills": match_result["missing_skills"],
+                        "missing_skills_list": match_result.get("missing_skills_list", []),
+                        "matching_details": match_result.get("matching_details", {}),
+                        "experience_match_status": match_result.get("experience_match_status", "Fair"),
+                        "resume_strength_10": match_result.get("resume_strength_10", 0),
+                        "explanation": match_result["explanation"],
+                        "detailed_breakdown": {
+                            "skill_match": match_result["skill_match"],
+                            "project_relevance": match_result["project_relevance"],
+                            "experience_alignment": match_result["experience_alignment"],
+                            "education_fit": match_result["education_profile_fit"]
+                        }
+                    })
+                if request.detail == "full":
+                    row["improvements"] = match_result["improvements"]
+                results.append(row)
             except Exception as e:
                 # Continue with other resumes if one fails
                 print(f"Error analyzing resume {resume_id}: {e}")
@@ -201,6 +265,9 @@ async def bulk_analyze(request: BulkAnalysisRequest, db: Session = Depends(get_d
                     "error": str(e)
                 })
         
+        write_queue.add_all(analyses)
+        count_cache.invalidate(*(("analyses", a.resume_id) for a in analyses))
+        
         # Sort by score (highest to lowest)
         results.sort(key=lambda x: x["overall_score"], reverse=True)
         
@@ -211,7 +278,13 @@ async def bulk_analyze(request: BulkAnalysisRequest, db: Session = Depends(get_d
         weak_matches = sum(1 for r in results if r.get("category") == "Weak Match")
         not_suitable = sum(1 for r in results if r.get("category") == "Not Suitable")
         
-        return {
+        paths = resolve_fields(fields, BULK_ANALYSIS_COMPACT_FIELDS)
+        # A field selection (the compact default included) comes back as one table; fields=full
+        # keeps the list of complete result objects
+        table = to_columns(results, paths) if paths is not None else {"results": results}
+        return FastJSONResponse({
+            "run_id": run_id,
+            "detail": request.detail,
             "total_resumes": len(request.resume_ids),
             "analyzed": len(results),
             "average_score": round(average_score, 1),
@@ -221,15 +294,84 @@ async def bulk_analyze(request: BulkAnalysisRequest, db: Session = Depends(get_d
                 "weak_match": weak_matches,
                 "not_suitable": not_suitable
             },
-            "results": results
+            **table
+        })
+    except HTTPException:
+        raise
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/matrix")
+def score_matrix(request: MatrixAnalysisRequest, db: Session = Depends(get_db)):
+    """Score every requested resume against every requested job in one pass"""
+    if request.format not in ("npz", "json"):
+        raise HTTPException(status_code=400, detail="format must be 'npz' or 'json'")
+    if not request.resume_ids or not request.job_ids:
+        raise HTTPException(status_code=400, detail="resume_ids and job_ids are required")
+    
+    try:
+        resume_ids = list(dict.fromkeys(request.resume_ids))
+        job_ids = list(dict.fromkeys(request.job_ids))
+        
+        resume_rows = {}
+        for start in range(0, len(resume_ids), ID_CHUNK_SIZE):
+            chunk = resume_ids[start:start + ID_CHUNK_SIZE]
+            rows = (
+                db.query(Resume.id, Resume.parsed_data, ResumeText.codec, ResumeText.data)
+                .outerjoin(ResumeText, ResumeText.resume_id == Resume.id)
+                .filter(Resume.id.in_(chunk))
+            )
+            for row in rows:
+                resume_rows[row.id] = {"parsed_data": row.parsed_data, "raw_text": decompress_text(row.codec, row.data)}
+        job_rows = {}
+        for start in range(0, len(job_ids), ID_CHUNK_SIZE):
+            chunk = job_ids[start:start + ID_CHUNK_SIZE]
+            for row in db.query(JobPosting.id, JobPosting.description).filter(JobPosting.id.in_(chunk)):
+                job_rows[row.id] = row.description or ""
+        
+        # Preserve request order; unknown ids are dropped and reported back via the id arrays
+        found_resume_ids = [rid for rid in resume_ids if rid in resume_rows]
+        found_job_ids = [jid for jid in job_ids if jid in job_rows]
+        if not found_resume_ids or not found_job_ids:
+            raise HTTPException(status_code=404, detail="No matching resumes or jobs found")
+        
+        matrices = matrix_scorer.score_matrix(
+            [resume_rows[rid] for rid in found_resume_ids],
+            [job_rows[jid] for jid in found_job_ids]
+        )
+        arrays = {
+            "resume_ids": np.array(found_resume_ids, dtype=np.int64),
+            "job_ids": np.array(found_job_ids, dtype=np.int64),
+            "overall": matrices["overall"]
         }
+        if request.include_components:
+            for name in MatchMatrixScorer.COMPONENTS:
+                arrays[name] = matrices[name]
+        
+        if request.format == "json":
+            return {
+                name: (values if values.dtype.kind == "i" else np.round(values.astype(np.float64), 2)).tolist()
+                for name, values in arrays.items()
+            }
+        
+        buffer = io.BytesIO()
+        np.savez_compressed(buffer, **arrays)
+        return Response(
+            content=buffer.getvalue(),
+            media_type="application/octet-stream",
+            headers={"Content-Disposition": 'attachment; filename="score_matrix.npz"'}
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/calculate-ats-score")
-async def calculate_ats_score(resume_id: int, db: Session = Depends(get_db)):
+def calculate_ats_score(resume_id: int, db: Session = Depends(get_db)):
     """Calculate ATS score for a resume"""
     try:
         resume = db.query(Resume).filter(Resume.id == resume_id).first()
@@ -254,7 +396,7 @@ async def calculate_ats_score(resume_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/analysis-results/{analysis_id}")
-async def get_analysis_result(analysis_id: int, db: Session = Depends(get_db)):
+def get_analysis_result(analysis_id: int, db: Session = Depends(get_db)):
     """Get detailed analysis result"""
     analysis = db.query(AnalysisResult).filter(AnalysisResult.id == analysis_id).first()
     if not analysis:
@@ -271,17 +413,67 @@ async def get_analysis_result(analysis_id: int, db: Session = Depends(get_db)):
     }
 
 @router.get("/resume/{resume_id}/analyses")
-async def get_resume_analyses(resume_id: int, db: Session = Depends(get_db)):
-    """Get all analysis results for a resume"""
-    analyses = db.query(AnalysisResult).filter(AnalysisResult.resume_id == resume_id).all()
+async def get_resume_analyses(
+    resume_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a resume's analysis results, one keyset page at a time"""
+    # Only columns in ix_analysis_results_resume_listing, so the table itself is never read
+    analyses = (
+        await db.execute(
+            page.apply(
+                select(
+                    AnalysisResult.id,
+                    AnalysisResult.overall_score,
+                    AnalysisResult.created_at,
+                    AnalysisResult.matched_count,
+                    AnalysisResult.missing_count
+                )
+                .where(AnalysisResult.resume_id == resume_id),
+                AnalysisResult.id
+            )
+        )
+    ).all()
+    total = await count_cache.count_async(
+        db, ("analyses", resume_id), AnalysisResult, AnalysisResult.resume_id == resume_id
+    )
+    analyses = page.finish(response, analyses, total)
     
     return [
         {
             "id": a.id,
             "overall_score": a.overall_score,
             "created_at": a.created_at,
-            "matched_skills": len(a.skills_matched),
-            "missing_skills": len(a.skills_missing)
+            "matched_skills": a.matched_count,
+            "missing_skills": a.missing_count
         }
         for a in analyses
     ]
+
+
+@router.get("/{run_id}/{resume_id}/explain")
+def explain_analysis(run_id: str, resume_id: int, db: Session = Depends(get_db)):
+    """Rebuild explanation and improvements for one resume of an analysis run from stored scores"""
+    analysis = (
+        db.query(AnalysisResult)
+        .filter(AnalysisResult.run_id == run_id, AnalysisResult.resume_id == resume_id)
+        .order_by(AnalysisResult.id.desc())
+        .first()
+    )
+    if not analysis or not analysis.components:
+        raise HTTPException(status_code=404, detail="Analysis not found")
+    
+    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume_data = resume.parsed_data if resume and resume.parsed_data else {}
+    
+    narrative = advanced_matcher.build_narrative(analysis.components, resume_data)
+    return {
+        "analysis_id": analysis.id,
+        "run_id": run_id,
+        "resume_id": resume_id,
+        "overall_score": analysis.overall_score,
+        "category": analysis.components.get("category"),
+        **narrative
+    }
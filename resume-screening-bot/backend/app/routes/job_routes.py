@@ -1,13 +1,17 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+from fastapi import APIRouter, HTTPException, Depends, Query, BackgroundTasks, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
 from app.models.models import JobPosting
 from app.schemas.schemas import JobPostingCreate, JobPosting as JobPostingSchema
+from app.services.match_index import match_index
+from app.utils.pagination import PageParams, count_cache
 
 router = APIRouter()
 
 @router.post("/create")
-async def create_job_posting(job_data: dict, db: Session = Depends(get_db)):
+def create_job_posting(job_data: dict, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Create a new job posting"""
     try:
         user_id = job_data.get("user_id")
@@ -26,6 +30,10 @@ async def create_job_posting(job_data: dict, db: Session = Depends(get_db)):
         db.add(db_job)
         db.commit()
         db.refresh(db_job)
+        count_cache.invalidate(("jobs", user_id))
+        
+        # Score the existing resume pool after the response is sent
+        background_tasks.add_task(match_index.refresh_job, db_job.id)
         
         return {
             "id": db_job.id,
@@ -42,9 +50,9 @@ async def create_job_posting(job_data: dict, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/{job_id}")
-async def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get job details"""
-    job = db.query(JobPosting).filter(JobPosting.id == job_id).first()
+    job = (await db.execute(select(JobPosting).where(JobPosting.id == job_id))).scalars().first()
     if not job:
         raise HTTPException(status_code=404, detail="Job posting not found")
     
@@ -59,23 +67,48 @@ async def get_job(job_id: int, db: Session = Depends(get_db)):
         "created_at": job.created_at
     }
 
+@router.get("/{job_id}/top-candidates")
+def get_top_candidates(
+    job_id: int,
+    limit: int = Query(default=20, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """Pre-ranked candidates for a job from the materialized match table"""
+    job = db.query(JobPosting.id).filter(JobPosting.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job posting not found")
+    
+    return {
+        "job_id": job_id,
+        "candidates": match_index.top_candidates(db, job_id, limit=limit, offset=offset)
+    }
+
 @router.get("/user/{user_id}/jobs")
-async def get_user_jobs(user_id: int, db: Session = Depends(get_db)):
-    """Get all job postings from a user"""
-    jobs = db.query(JobPosting).filter(JobPosting.user_id == user_id).all()
+def get_user_jobs(user_id: int, response: Response, page: PageParams = Depends(), db: Session = Depends(get_db)):
+    """Get a user's job postings, one keyset page at a time (full descriptions via GET /{job_id})"""
+    jobs = db.execute(
+        page.apply(
+            select(JobPosting)
+            .options(load_only(JobPosting.id, JobPosting.title, JobPosting.created_at))
+            .where(JobPosting.user_id == user_id),
+            JobPosting.id
+        )
+    ).scalars().all()
+    total = count_cache.count(db, ("jobs", user_id), JobPosting, JobPosting.user_id == user_id)
+    jobs = page.finish(response, jobs, total)
     
     return [
         {
             "id": job.id,
             "title": job.title,
-            "description": job.description,
             "created_at": job.created_at
         }
         for job in jobs
     ]
 
 @router.put("/{job_id}")
-async def update_job(job_id: int, job_update: JobPostingCreate, db: Session = Depends(get_db)):
+def update_job(job_id: int, job_update: JobPostingCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Update a job posting"""
     job = db.query(JobPosting).filter(JobPosting.id == job_id).first()
     if not job:
@@ -91,16 +124,21 @@ async def update_job(job_id: int, job_update: JobPostingCreate, db: Session = De
     db.commit()
     db.refresh(job)
     
+    background_tasks.add_task(match_index.refresh_job, job.id)
+    
     return {"message": "Job posting updated", "job": job}
 
 @router.delete("/{job_id}")
-async def delete_job(job_id: int, db: Session = Depends(get_db)):
+def delete_job(job_id: int, db: Session = Depends(get_db)):
     """Delete a job posting"""
     job = db.query(JobPosting).filter(JobPosting.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job posting not found")
     
+    owner_id = job.user_id
+    match_index.remove_job(db, job_id)
     db.delete(job)
     db.commit()
+    count_cache.invalidate(("jobs", owner_id))
     
     return {"message": "Job posting deleted"}
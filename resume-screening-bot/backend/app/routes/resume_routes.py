@@ -1,23 +1,47 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query
+from fastapi import APIRouter, UploadFile, File, HTTPException, Depends, Query, BackgroundTasks, Response, Request
+from sqlalchemy import select
 from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.models import Resume
-from app.services.resume_parser import ResumeParser
-from app.services.text_processor import TextPreprocessor
-from app.schemas.schemas import Resume as ResumeSchema
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_db, get_async_db
+from app.models.models import Resume, UploadSession, UploadSessionFile
+from app.services.resume_parser import ResumeParser, EXTRACTOR_VERSION, PARSER_VERSION
+from app.services.match_index import match_index
+from app.services.resume_search import resume_search
+from app.services.blob_store import blob_store
+from app.services.quarantine import quarantine
+from app.services.page_parallel import parse_file
+from app.services.archive_reader import ArchiveError, ArchiveReader, archive_format
+from app.services.upload_sessions import ChunkRejected, SessionGone, upload_sessions
+from app.services.resume_writer import resume_writer
+from app.schemas.schemas import Resume as ResumeSchema, UploadSessionCreate
 from app.config import settings
+from app.utils.responses import FastJSONResponse
+from app.utils.fields import resolve_fields, select_fields, BULK_UPLOAD_COMPACT_FIELDS
+from app.utils.executors import run_blocking
+from app.utils.sandbox import ParseAborted
+from app.utils.pagination import PageParams, count_cache
+from app.utils.write_queue import write_queue
+import asyncio
 import os
+from contextlib import ExitStack
 from pathlib import Path
 from typing import Optional
 import traceback
 
 router = APIRouter()
 
+# Files staged, parsed and committed together by the multi-file uploads
+UPLOAD_BATCH_SIZE = 20
+
+def _content_detail(stats: dict) -> str:
+    return f"no text on any of {stats.get('checked_pages')} pages ({stats.get('content_ms')} ms check)"
+
 @router.post("/upload")
 async def upload_resume(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...), 
     user_id: Optional[int] = Query(default=None), 
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(default=None)
 ):
     """Upload and parse a single resume"""
     try:
@@ -32,62 +56,69 @@ async def upload_resume(
         if file_ext not in allowed_extensions:
             raise HTTPException(status_code=400, detail=f"Invalid file type '{file_ext}'. Only PDF, DOCX, DOC, and TXT are supported.")
         
-        # Get absolute path for upload folder
-        upload_folder = settings.UPLOAD_FOLDER
-        if not os.path.isabs(upload_folder):
-            # Make it relative to the backend directory
-            backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            upload_folder = os.path.join(backend_dir, upload_folder)
-        
-        # Create upload directory if it doesn't exist
-        os.makedirs(upload_folder, exist_ok=True)
-        
-        # Generate unique filename to avoid conflicts
-        import uuid
-        file_name = file.filename
-        base_name = Path(file_name).stem
-        extension = Path(file_name).suffix
-        unique_filename = f"{base_name}_{uuid.uuid4().hex[:8]}{extension}"
-        
-        # Save file
-        file_path = os.path.join(upload_folder, unique_filename)
-        with open(file_path, "wb") as f:
-            content = await file.read()
-            f.write(content)
-        
-        # Extract text
-        raw_text = ResumeParser.extract_text_from_file(file_path)
-        
-        if not raw_text:
-            raise HTTPException(status_code=400, detail="Could not extract text from file")
-        
-        # Parse resume structure
-        parsed_data = ResumeParser.parse_resume_structure(raw_text)
-        
-        # Extract skills
-        preprocessor = TextPreprocessor()
-        skills = preprocessor.extract_skills(raw_text)
-        parsed_data["technical_skills"] = skills
+        # Stream the file to disk (it is never held in memory whole) and store it
+        # once per distinct content; the staged copy is removed when we are done
+        with await run_blocking(blob_store.stage, file.file, file_ext) as staged:
+            sha256 = await run_blocking(blob_store.store, staged)
+            reason = (await run_blocking(quarantine.lookup, [sha256])).get(sha256)
+            if reason:
+                raise HTTPException(status_code=422, detail=f"File is quarantined: {quarantine.message(reason)}")
+            
+            # Extract text, parse structure and skills in a sandboxed worker process,
+            # which reads the file from disk: only the path crosses the process boundary
+            try:
+                parsed = await parse_file(staged.path, file_ext)
+            except ParseAborted as e:
+                await run_blocking(quarantine.add, sha256, staged, file.filename, user_id, e.reason, e.detail)
+                raise HTTPException(status_code=422, detail=f"File quarantined: {e}")
+            except Exception:
+                # Error responses skip background tasks, so drop the unreferenced file now
+                await run_blocking(blob_store.purge, sha256)
+                raise
+            raw_text = parsed["raw_text"]
+            
+            if not raw_text and parsed["extraction_stats"].get("content") == "image-only":
+                # Told apart before any extraction work; kept aside for reporting
+                await run_blocking(quarantine.add, sha256, staged, file.filename, user_id, "image-only",
+                                   _content_detail(parsed["extraction_stats"]))
+                raise HTTPException(status_code=422, detail=f"File rejected: {quarantine.message('image-only')}")
+            if not raw_text:
+                await run_blocking(blob_store.purge, sha256)
+                raise HTTPException(status_code=400, detail="Could not extract text from file")
+            
+            parsed_data = parsed["parsed_data"]
+            skills = parsed["skills"]
+            
+            # Save to database
+            resume = Resume(
+                user_id=user_id,
+                filename=file.filename,  # Keep original filename
+                file_path=blob_store.locator(sha256),
+                blob_sha256=sha256,
+                raw_text=raw_text,
+                parsed_data=parsed_data,
+                parser_version=PARSER_VERSION,
+                extractor_version=EXTRACTOR_VERSION,
+                extraction_stats=parsed["extraction_stats"]
+            )
+            try:
+                await resume_writer.insert_async([resume], [staged])
+            except Exception:
+                # The insert rolled back its blob reference too: don't leave the file behind
+                await run_blocking(blob_store.purge, sha256)
+                raise
+        count_cache.invalidate(("resumes", user_id))
         
-        # Save to database
-        resume = Resume(
-            user_id=user_id,
-            filename=file.filename,  # Keep original filename
-            file_path=file_path,  # Store unique file path
-            raw_text=raw_text,
-            parsed_data=parsed_data
-        )
-        db.add(resume)
-        db.commit()
-        db.refresh(resume)
+        # Score against open jobs after the response is sent
+        background_tasks.add_task(match_index.refresh_resumes, [resume.id])
         
-        return {
+        return select_fields({
             "id": resume.id,
             "filename": resume.filename,
             "parsed_data": parsed_data,
             "extracted_skills": skills,
             "message": "Resume uploaded and parsed successfully"
-        }
+        }, resolve_fields(fields))
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -95,11 +126,109 @@ async def upload_resume(
         print(f"Upload error: {error_trace}")
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
 
-@router.post("/bulk-upload")
+async def _store_batch(saved: list, user_id: Optional[int], background_tasks: BackgroundTasks,
+                       results: list, errors: list):
+    """Store, parse and insert a batch of staged uploads, (filename, extension, staged file) each,
+    adding an entry to results or errors for every file"""
+    stored = []
+    for filename, file_ext, staged in saved:
+        try:
+            # Identical files share one blob
+            await run_blocking(blob_store.store, staged)
+            stored.append((filename, file_ext, staged))
+        except Exception as e:
+            print(f"Error storing {filename}: {e}")
+            errors.append({"filename": filename, "error": str(e)})
+    
+    # Skip files that already took down a worker once
+    quarantined = await run_blocking(quarantine.lookup, [staged.sha256 for _, _, staged in stored])
+    for filename, _, staged in stored:
+        if staged.sha256 in quarantined:
+            errors.append({"filename": filename,
+                           "error": f"File is quarantined: {quarantine.message(quarantined[staged.sha256])}"})
+    stored = [item for item in stored if item[2].sha256 not in quarantined]
+    
+    # Extract and parse the whole batch concurrently in sandboxed worker processes
+    # (they get paths, not bytes); a file that times out or runs out of memory only fails itself
+    parsed_batch = await asyncio.gather(
+        *(parse_file(staged.path, ext) for _, ext, staged in stored),
+        return_exceptions=True
+    )
+    
+    batch_resumes = []  # Resumes for one batch commit
+    for (filename, _, staged), parsed in zip(stored, parsed_batch):
+        sha256 = staged.sha256
+        if isinstance(parsed, ParseAborted):
+            await run_blocking(quarantine.add, sha256, staged, filename, user_id, parsed.reason, parsed.detail)
+            errors.append({"filename": filename, "error": f"File quarantined: {parsed}"})
+            continue
+        if isinstance(parsed, Exception):
+            print(f"Error processing {filename}: {parsed}")
+            errors.append({"filename": filename, "error": str(parsed)})
+            background_tasks.add_task(blob_store.purge, sha256)
+            continue
+        
+        if not parsed["raw_text"] and parsed["extraction_stats"].get("content") == "image-only":
+            await run_blocking(quarantine.add, sha256, staged, filename, user_id, "image-only",
+                               _content_detail(parsed["extraction_stats"]))
+            errors.append({"filename": filename, "error": f"File rejected: {quarantine.message('image-only')}"})
+            continue
+        if not parsed["raw_text"]:
+            errors.append({"filename": filename, "error": "Could not extract text from file"})
+            background_tasks.add_task(blob_store.purge, sha256)
+            continue
+        
+        # Create resume object (don't commit yet)
+        resume = Resume(
+            user_id=user_id,
+            filename=filename,  # Keep original filename
+            file_path=blob_store.locator(sha256),
+            blob_sha256=sha256,
+            raw_text=parsed["raw_text"],
+            parsed_data=parsed["parsed_data"],
+            parser_version=PARSER_VERSION,
+            extractor_version=EXTRACTOR_VERSION,
+            extraction_stats=parsed["extraction_stats"]
+        )
+        batch_resumes.append({
+            "resume": resume,
+            "staged": staged,
+            "filename": filename,
+            "parsed_data": parsed["parsed_data"],
+            "extracted_skills": parsed["skills"]
+        })
+    
+    # Commit batch to database through the single-writer queue, in as few statements as
+    # possible (ids come back from the INSERT); large batches are split into chunks
+    failure = None
+    try:
+        await resume_writer.insert_async(
+            [item["resume"] for item in batch_resumes], [item["staged"] for item in batch_resumes]
+        )
+    except Exception as e:
+        print(f"Error committing batch: {e}")
+        failure = e
+    count_cache.invalidate(("resumes", user_id))
+    for item in batch_resumes:
+        if item["resume"].id is None:
+            # Its chunk failed to commit
+            errors.append({"filename": item["filename"], "error": f"Database commit failed: {str(failure)}"})
+            background_tasks.add_task(blob_store.purge, item["resume"].blob_sha256)
+            continue
+        results.append({
+            "id": item["resume"].id,
+            "filename": item["filename"],
+            "status": "success",
+            "parsed_data": item["parsed_data"],
+            "extracted_skills": item["extracted_skills"]
+        })
+
+@router.post("/bulk-upload", response_class=FastJSONResponse)
 async def bulk_upload_resumes(
+    background_tasks: BackgroundTasks,
     files: list[UploadFile] = File(...), 
     user_id: Optional[int] = Query(default=None), 
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(default=None)
 ):
     """Upload and parse multiple resumes (optimized for large batches)"""
     results = []
@@ -111,18 +240,8 @@ async def bulk_upload_resumes(
     total_files = len(files)
     print(f"Processing {total_files} files in bulk upload...")
     
-    # Get absolute path for upload folder
-    upload_folder = settings.UPLOAD_FOLDER
-    if not os.path.isabs(upload_folder):
-        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        upload_folder = os.path.join(backend_dir, upload_folder)
-    
-    # Create upload directory
-    os.makedirs(upload_folder, exist_ok=True)
-    
     # Process files in batches to avoid memory issues
-    batch_size = 20  # Process 20 files at a time
-    batch_resumes = []  # Store resumes for batch commit
+    batch_size = UPLOAD_BATCH_SIZE
     
     for batch_start in range(0, total_files, batch_size):
         batch_end = min(batch_start + batch_size, total_files)
@@ -130,115 +249,295 @@ async def bulk_upload_resumes(
         
         print(f"Processing batch {batch_start//batch_size + 1}: files {batch_start+1}-{batch_end} of {total_files}")
         
-        batch_resumes.clear()  # Clear for new batch
+        # Staged copies of this batch's files, removed once the batch is stored
+        with ExitStack() as staging:
+            saved = []  # (filename, extension, staged file)
         
-        for idx, file in enumerate(batch_files):
-            try:
-                # Validate file by extension
-                if not file.filename:
-                    errors.append({"filename": "unknown", "error": "No filename provided"})
-                    continue
+            for idx, file in enumerate(batch_files):
+                try:
+                    # Validate file by extension
+                    if not file.filename:
+                        errors.append({"filename": "unknown", "error": "No filename provided"})
+                        continue
                     
-                file_ext = Path(file.filename).suffix.lower()
-                allowed_extensions = {'.pdf', '.docx', '.doc', '.txt'}
+                    file_ext = Path(file.filename).suffix.lower()
+                    allowed_extensions = {'.pdf', '.docx', '.doc', '.txt'}
                 
-                if file_ext not in allowed_extensions:
-                    errors.append({"filename": file.filename, "error": f"Invalid file type '{file_ext}'"})
-                    continue
+                    if file_ext not in allowed_extensions:
+                        errors.append({"filename": file.filename, "error": f"Invalid file type '{file_ext}'"})
+                        continue
                 
-                # Generate unique filename
-                import uuid
-                base_name = Path(file.filename).stem
-                extension = Path(file.filename).suffix
-                unique_filename = f"{base_name}_{uuid.uuid4().hex[:8]}{extension}"
-                
-                # Save file
-                file_path = os.path.join(upload_folder, unique_filename)
-                with open(file_path, "wb") as f:
-                    content = await file.read()
-                    f.write(content)
-                
-                # Extract and parse
-                raw_text = ResumeParser.extract_text_from_file(file_path)
-                
-                if not raw_text:
-                    errors.append({"filename": file.filename, "error": "Could not extract text from file"})
-                    continue
-                
-                parsed_data = ResumeParser.parse_resume_structure(raw_text)
-                
-                preprocessor = TextPreprocessor()
-                skills = preprocessor.extract_skills(raw_text)
-                parsed_data["technical_skills"] = skills
-                
-                # Create resume object (don't commit yet)
-                resume = Resume(
-                    user_id=user_id,
-                    filename=file.filename,  # Keep original filename
-                    file_path=file_path,  # Store unique file path
-                    raw_text=raw_text,
-                    parsed_data=parsed_data
-                )
-                db.add(resume)
-                batch_resumes.append({
-                    "resume": resume,
-                    "filename": file.filename,
-                    "parsed_data": parsed_data,
-                    "extracted_skills": skills
-                })
-            except Exception as e:
-                error_msg = str(e)
-                print(f"Error processing {file.filename}: {error_msg}")
-                print(traceback.format_exc())
-                errors.append({"filename": file.filename, "error": error_msg})
+                    # Stream the file to disk
+                    staged = staging.enter_context(await run_blocking(blob_store.stage, file.file, file_ext))
+                    saved.append((file.filename, file_ext, staged))
+                except Exception as e:
+                    error_msg = str(e)
+                    print(f"Error processing {file.filename}: {error_msg}")
+                    print(traceback.format_exc())
+                    errors.append({"filename": file.filename, "error": error_msg})
         
-        # Commit batch to database
+            await _store_batch(saved, user_id, background_tasks, results, errors)
+    
+    # Score the whole upload against open jobs in one background pass
+    background_tasks.add_task(match_index.refresh_resumes, [r["id"] for r in results])
+    
+    paths = resolve_fields(fields, BULK_UPLOAD_COMPACT_FIELDS)
+    return FastJSONResponse({
+        "total_files": total_files,
+        "successful": len(results),
+        "failed": len(errors),
+        "results": [select_fields(r, paths) for r in results],
+        "errors": errors
+    })
+
+@router.post("/archive-upload", response_class=FastJSONResponse)
+async def archive_upload_resumes(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    user_id: Optional[int] = Query(default=None),
+    fields: Optional[str] = Query(default=None)
+):
+    """Upload a ZIP or TAR archive of resumes and parse its members as they are read"""
+    if not file.filename or not archive_format(file.filename):
+        raise HTTPException(status_code=400, detail="Upload a .zip, .tar, .tar.gz, .tgz, .tar.bz2 or .tar.xz archive")
+    
+    results = []
+    errors = []
+    archive = ArchiveReader(file.file, file.filename)
+    members = iter(archive)
+    total_files = 0
+    stopped = None
+    batch = []  # (filename, extension, staged file) not handed to a batch yet
+    in_flight = set()  # Batches being stored and parsed while the next members are read
+    
+    async def store(saved: list):
         try:
-            db.commit()
-            # Refresh all resumes in this batch to get IDs
-            for item in batch_resumes:
-                db.refresh(item["resume"])
-                results.append({
-                    "id": item["resume"].id,
-                    "filename": item["filename"],
-                    "status": "success",
-                    "parsed_data": item["parsed_data"],
-                    "extracted_skills": item["extracted_skills"]
-                })
-        except Exception as e:
-            db.rollback()
-            print(f"Error committing batch: {e}")
-            # Mark all resumes in batch as failed
-            for item in batch_resumes:
-                errors.append({"filename": item["filename"], "error": f"Database commit failed: {str(e)}"})
+            await _store_batch(saved, user_id, background_tasks, results, errors)
+        finally:
+            for _, _, staged in saved:
+                staged.close()
     
-    return {
+    try:
+        while True:
+            try:
+                # One member decompressed to a staged file at a time, off the event loop
+                member = await run_blocking(next, members, None)
+            except ArchiveError as e:
+                stopped = str(e)
+                break
+            if member is None:
+                break
+            total_files += 1
+            if member.error:
+                errors.append({"filename": member.filename, "error": member.error})
+                continue
+            batch.append((member.filename, member.extension, member.staged))
+            if len(batch) == UPLOAD_BATCH_SIZE:
+                in_flight.add(asyncio.create_task(store(batch)))
+                batch = []
+                if len(in_flight) > 1:
+                    # Keep reading ahead by at most one batch
+                    done, in_flight = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        task.result()
+        if batch:
+            in_flight.add(asyncio.create_task(store(batch)))
+            batch = []
+        if in_flight:
+            await asyncio.gather(*in_flight)
+    finally:
+        for _, _, staged in batch:
+            staged.close()
+        members.close()
+    
+    if stopped and total_files == 0:
+        raise HTTPException(status_code=400, detail=stopped)
+    if stopped:
+        print(f"Archive {file.filename} cut off after {archive.members} entries: {stopped}")
+    
+    background_tasks.add_task(match_index.refresh_resumes, [r["id"] for r in results])
+    
+    paths = resolve_fields(fields, BULK_UPLOAD_COMPACT_FIELDS)
+    return FastJSONResponse({
         "total_files": total_files,
         "successful": len(results),
         "failed": len(errors),
+        "results": [select_fields(r, paths) for r in results],
+        "errors": errors,
+        "archive": {
+            "members": archive.members,
+            "extracted_bytes": archive.extracted,
+            "stopped": stopped
+        }
+    })
+
+async def _parse_session_file(user_id: Optional[int], file: UploadSessionFile):
+    """Parse a completed session file through the bulk pipeline and record the outcome"""
+    await run_blocking(upload_sessions.set_status, file.id, "parsing")
+    results, errors = [], []
+    cleanup = BackgroundTasks()  # Blob purges; the request that completed the file has long returned
+    try:
+        staged = await run_blocking(blob_store.describe, upload_sessions.part_path(file))
+        await _store_batch([(file.filename, Path(file.filename).suffix.lower(), staged)],
+                           user_id, cleanup, results, errors)
+    except Exception as e:
+        print(f"Error processing {file.filename}: {e}")
+        errors.append({"filename": file.filename, "error": str(e)})
+    await cleanup()
+    await run_blocking(upload_sessions.finish, file, results[0]["id"] if results else None,
+                       errors[0]["error"] if errors else None)
+
+def _open_session(session_id: str, allow_expired: bool = False) -> UploadSession:
+    session = upload_sessions.get(session_id)
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    if not allow_expired and upload_sessions.expired(session):
+        # Gone from expires_at on, even before a sweep removes it
+        raise HTTPException(status_code=410, detail="Upload session has expired")
+    return session
+
+@router.post("/upload-sessions")
+async def open_upload_session(request: UploadSessionCreate, user_id: Optional[int] = Query(default=None)):
+    """Declare the files of a resumable upload; each is then sent in chunks"""
+    if not request.files:
+        raise HTTPException(status_code=400, detail="No files provided")
+    if len(request.files) > settings.UPLOAD_SESSION_MAX_FILES:
+        raise HTTPException(status_code=400,
+                            detail=f"At most {settings.UPLOAD_SESSION_MAX_FILES} files per upload session")
+    # On the event loop, which owns the chunk locks and parse tasks of the sessions it removes
+    await upload_sessions.sweep()
+    session = await run_blocking(upload_sessions.open, user_id, [(f.filename, f.size) for f in request.files])
+    return upload_sessions.describe(session)
+
+@router.get("/upload-sessions/{session_id}")
+async def get_upload_session(session_id: str):
+    """How many bytes of each file the server has, and how far parsing got"""
+    session = await run_blocking(_open_session, session_id)
+    return await run_blocking(upload_sessions.describe, session)
+
+@router.put("/upload-sessions/{session_id}/files/{file_id}")
+async def upload_session_chunk(session_id: str, file_id: int, request: Request, offset: int = Query(..., ge=0)):
+    """Append the request body to a file, starting at offset (bytes the server already has are skipped)"""
+    session = await run_blocking(_open_session, session_id)
+    file = next((f for f in session.files if f.id == file_id), None)
+    if not file:
+        raise HTTPException(status_code=404, detail="File not found in this upload session")
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail="Upload session is already committed")
+    if file.status == "rejected":
+        raise HTTPException(status_code=409, detail=f"File was rejected: {file.error}")
+    
+    if file.status == "receiving":
+        try:
+            received = await upload_sessions.write(file, offset, request.stream(),
+                                                   lambda: _parse_session_file(session.user_id, file))
+        except ChunkRejected as e:
+            # Upload-Offset tells the client where to resume
+            raise HTTPException(status_code=409, detail=str(e), headers={"Upload-Offset": str(e.received)})
+        except SessionGone:
+            raise HTTPException(status_code=410, detail="Upload session was removed")
+    else:
+        received = file.size  # A resent last chunk: the file is already being parsed
+    return {
+        "id": file.id,
+        "filename": file.filename,
+        "size": file.size,
+        "received": received,
+        "status": "parsing" if received == file.size else "receiving"
+    }
+
+@router.post("/upload-sessions/{session_id}/commit", response_class=FastJSONResponse)
+async def commit_upload_session(session_id: str, background_tasks: BackgroundTasks):
+    """Wait for the session's files to finish parsing and close it; files still incomplete are given up"""
+    session = await run_blocking(_open_session, session_id)
+    if session.status == "open":
+        # Complete files whose parse never started here (e.g. the server restarted)
+        for file in upload_sessions.pending(session):
+            upload_sessions.start(file, lambda file=file: _parse_session_file(session.user_id, file))
+        await upload_sessions.commit(session)
+        session = await run_blocking(_open_session, session_id, True)
+        count_cache.invalidate(("resumes", session.user_id))
+        background_tasks.add_task(match_index.refresh_resumes,
+                                  [f.resume_id for f in session.files if f.resume_id is not None])
+    
+    # Committing again just repeats the summary
+    results = [{"id": f.resume_id, "filename": f.filename, "status": "success"}
+               for f in session.files if f.status == "done"]
+    errors = [{"filename": f.filename, "error": f.error} for f in session.files if f.status != "done"]
+    return FastJSONResponse({
+        "session_id": session.id,
+        "total_files": len(session.files),
+        "successful": len(results),
+        "failed": len(errors),
         "results": results,
         "errors": errors
+    })
+
+@router.delete("/upload-sessions/{session_id}")
+async def delete_upload_session(session_id: str):
+    """Abandon a session and its received bytes; resumes already parsed from it are kept"""
+    # Expired sessions can still be deleted by their client
+    session = await run_blocking(_open_session, session_id, True)
+    await upload_sessions.remove(session)
+    return {"message": "Upload session deleted"}
+
+@router.get("/search/text")
+async def search_resumes(
+    q: str = Query(..., min_length=1, max_length=500),
+    match: str = Query(default="all", pattern="^(all|any)$"),
+    user_id: Optional[int] = Query(default=None),
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Keyword search over resume text, best matches first, with highlighted snippets"""
+    if resume_search.dialect is None:
+        raise HTTPException(status_code=503, detail="Full-text search is not available on this database")
+    
+    found = await resume_search.search(db, q, match_all=match == "all", user_id=user_id, limit=limit, offset=offset)
+    return {
+        "query": q,
+        "total": found["total"],
+        "limit": limit,
+        "offset": offset,
+        "results": found["results"]
     }
 
 @router.get("/{resume_id}")
-async def get_resume(resume_id: int, db: Session = Depends(get_db)):
+async def get_resume(resume_id: int, fields: Optional[str] = Query(default=None), db: AsyncSession = Depends(get_async_db)):
     """Get resume details"""
-    resume = db.query(Resume).filter(Resume.id == resume_id).first()
+    resume = (await db.execute(select(Resume).where(Resume.id == resume_id))).scalars().first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    return {
+    return select_fields({
         "id": resume.id,
         "filename": resume.filename,
         "ats_score": resume.ats_score,
         "uploaded_at": resume.uploaded_at,
         "parsed_data": resume.parsed_data
-    }
+    }, resolve_fields(fields))
 
 @router.get("/user/{user_id}/resumes")
-async def get_user_resumes(user_id: int, db: Session = Depends(get_db)):
-    """Get all resumes for a user"""
-    resumes = db.query(Resume).filter(Resume.user_id == user_id).all()
+async def get_user_resumes(
+    user_id: int,
+    response: Response,
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a user's resumes, one keyset page at a time"""
+    # Covered by ix_resumes_user_listing: raw_text and parsed_data are never loaded
+    resumes = (
+        await db.execute(
+            page.apply(
+                select(Resume.id, Resume.filename, Resume.ats_score, Resume.uploaded_at)
+                .where(Resume.user_id == user_id),
+                Resume.id
+            )
+        )
+    ).all()
+    total = await count_cache.count_async(db, ("resumes", user_id), Resume, Resume.user_id == user_id)
+    resumes = page.finish(response, resumes, total)
     
     return [
         {
@@ -251,18 +550,35 @@ async def get_user_resumes(user_id: int, db: Session = Depends(get_db)):
     ]
 
 @router.delete("/{resume_id}")
-async def delete_resume(resume_id: int, db: Session = Depends(get_db)):
+def delete_resume(resume_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Delete a resume"""
     resume = db.query(Resume).filter(Resume.id == resume_id).first()
     if not resume:
         raise HTTPException(status_code=404, detail="Resume not found")
     
-    # Delete file
-    if os.path.exists(resume.file_path):
+    sha256 = resume.blob_sha256
+    if sha256 is None and resume.file_path and os.path.exists(resume.file_path):
+        # Uploaded before the blob store: the file is not shared
         os.remove(resume.file_path)
     
-    # Delete from database
-    db.delete(resume)
-    db.commit()
+    # Delete from database; the reference is dropped on the write queue, like every other
+    # refcount change, so it cannot interleave with a concurrent add_ref or purge
+    owner_id = resume.user_id
+    db.commit()  # End the read transaction before the writer runs
+
+    def remove(writer: Session) -> bool:
+        row = writer.get(Resume, resume_id)
+        if row is None:
+            return False  # Deleted by a concurrent request
+        match_index.remove_resume(writer, resume_id)
+        writer.delete(row)
+        return sha256 is not None and blob_store.release(writer, sha256)
+
+    unreferenced = write_queue.run(remove)
+    count_cache.invalidate(("resumes", owner_id), ("analyses", resume_id))
+    
+    # The last resume using the file is gone: remove it after the response
+    if unreferenced:
+        background_tasks.add_task(blob_store.purge, sha256)
     
     return {"message": "Resume deleted successfully"}
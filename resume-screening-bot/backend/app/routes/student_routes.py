@@ -1,11 +1,12 @@
 from fastapi import APIRouter, HTTPException, Depends, Body
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 from app.database import get_db
 from app.models.models import Resume, StudentCareerProfile
 from app.services.text_processor import TextPreprocessor
 from app.utils.scoring import ATSScorer, ResumeRecommender
 from app.utils.career_recommender import CareerRecommender
 from app.services.nlp_analyzer import NLPAnalyzer
+from app.utils.responses import FastJSONResponse
 from pydantic import BaseModel
 from typing import Optional
 
@@ -31,7 +32,7 @@ class CareerPathRequest(BaseModel):
     user_id: int
 
 @router.post("/evaluate-resume")
-async def evaluate_resume(request: EvaluateResumeRequest, db: Session = Depends(get_db)):
+def evaluate_resume(request: EvaluateResumeRequest, db: Session = Depends(get_db)):
     """Evaluate resume for student improvement"""
     try:
         resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
@@ -62,10 +63,10 @@ async def evaluate_resume(request: EvaluateResumeRequest, db: Session = Depends(
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/career-fit")
-async def get_career_fit(request: CareerFitRequest, db: Session = Depends(get_db)):
+def get_career_fit(request: CareerFitRequest, db: Session = Depends(get_db)):
     """Get career fit recommendations based on resume"""
     try:
-        resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
+        resume = db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id == request.resume_id).first()
         if not resume:
             raise HTTPException(status_code=404, detail="Resume not found")
         
@@ -93,7 +94,7 @@ async def get_career_fit(request: CareerFitRequest, db: Session = Depends(get_db
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/skill-gap-analysis")
-async def analyze_skill_gaps(request: SkillGapRequest, db: Session = Depends(get_db)):
+def analyze_skill_gaps(request: SkillGapRequest, db: Session = Depends(get_db)):
     """Analyze skill gaps for a target role"""
     try:
         resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
@@ -108,11 +109,11 @@ async def analyze_skill_gaps(request: SkillGapRequest, db: Session = Depends(get
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/career-path")
-async def generate_career_path(request: CareerPathRequest, db: Session = Depends(get_db)):
+@router.post("/career-path", response_class=FastJSONResponse)
+def generate_career_path(request: CareerPathRequest, db: Session = Depends(get_db)):
     """Generate personalized career development path"""
     try:
-        resume = db.query(Resume).filter(Resume.id == request.resume_id).first()
+        resume = db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id == request.resume_id).first()
         if not resume:
             raise HTTPException(status_code=404, detail="Resume not found")
         
@@ -149,12 +150,12 @@ async def generate_career_path(request: CareerPathRequest, db: Session = Depends
         
         db.commit()
         
-        return career_path
+        return FastJSONResponse(career_path)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/improve-resume")
-async def get_resume_improvement_tips(request: dict = Body(...), db: Session = Depends(get_db)):
+def get_resume_improvement_tips(request: dict = Body(...), db: Session = Depends(get_db)):
     """Get specific tips to improve resume"""
     try:
         resume_id = request.get("resume_id")
@@ -221,7 +222,7 @@ async def get_resume_improvement_tips(request: dict = Body(...), db: Session = D
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.get("/student-profile/{user_id}")
-async def get_student_profile(user_id: int, db: Session = Depends(get_db)):
+def get_student_profile(user_id: int, db: Session = Depends(get_db)):
     """Get student career profile"""
     profile = db.query(StudentCareerProfile).filter(StudentCareerProfile.user_id == user_id).first()
     if not profile:
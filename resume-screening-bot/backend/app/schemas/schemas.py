@@ -80,11 +80,26 @@ class AnalysisResult(BaseModel):
 class AnalyzeResumeJobRequest(BaseModel):
     resume_id: int
     job_id: int
+    detail: str = "full"  # "score", "summary" or "full"
 
 class BulkAnalysisRequest(BaseModel):
     resume_ids: List[int]
     job_id: Optional[int] = None
     job_description: Optional[str] = None
+    detail: str = "full"  # "score", "summary" or "full"
+
+class MatrixAnalysisRequest(BaseModel):
+    resume_ids: List[int]
+    job_ids: List[int]
+    format: str = "npz"  # "npz" (binary, one .npy per array) or "json" (columnar)
+    include_components: bool = False
+
+class UploadSessionFileSpec(BaseModel):
+    filename: str
+    size: int  # Bytes
+
+class UploadSessionCreate(BaseModel):
+    files: List[UploadSessionFileSpec]
 
 class BulkAnalysisResponse(BaseModel):
     total_resumes: int
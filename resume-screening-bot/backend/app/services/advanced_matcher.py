@@ -11,6 +11,8 @@ class AdvancedResumeMatcher:
     across 4 major areas: Skill Match, Project Relevance, Experience Alignment, Education/Profile Fit
     """
     
+    DETAIL_LEVELS = ("score", "summary", "full")
+    
     def __init__(self):
         self.job_analyzer = JobDescriptionAnalyzer()
         self.text_processor = TextPreprocessor()
@@ -21,11 +23,15 @@ class AdvancedResumeMatcher:
         self,
         resume_data: Dict,
         resume_text: str,
-        job_description: str
+        job_description: str,
+        detail: str = "full"
     ) -> Dict:
         """
         Comprehensive matching between resume and job description
         
+        detail: "score" returns scores only, "summary" adds resume strength and the
+        explanation, "full" (default) also adds improvement recommendations.
+        
         Returns:
         {
             overall_score: float (0-100),
@@ -146,42 +152,10 @@ class AdvancedResumeMatcher:
         # Categorize
         category = self._categorize_match(overall_score)
         
-        # Generate improvement recommendations
-        improvements = self._generate_improvements(
-            ats_score,
-            skill_match,
-            experience_alignment,
-            project_relevance,
-            education_fit,
-            resume_data,
-            job_profile
-        )
-        
-        # Generate explanation
-        explanation = self._generate_explanation(
-            overall_score,
-            category,
-            skill_match,
-            project_relevance,
-            experience_alignment,
-            education_fit,
-            job_profile,
-            ats_score
-        )
-        
-        # Calculate resume strength (0-10 scale)
-        resume_strength = self._calculate_resume_strength(
-            skill_match,
-            experience_alignment,
-            keyword_similarity,
-            education_fit,
-            ats_score
-        )
-        
         # Determine experience match status
         experience_match_status = self._get_experience_match_status(experience_alignment)
         
-        return {
+        result = {
             # ATS Score (First Priority)
             "ats_score": round(ats_score, 1),
             "ats_section_scores": ats_section_scores,
@@ -234,10 +208,6 @@ class AdvancedResumeMatcher:
             "experience_score": experience_alignment["score"],
             "education_score": education_fit["score"],
             "experience_match_status": experience_match_status,
-            "resume_strength": resume_strength,
-            
-            # Improvements
-            "improvements": improvements,
             
             # Job Profile
             "job_profile": {
@@ -248,9 +218,80 @@ class AdvancedResumeMatcher:
             # Clean output format
             "result": category,
             "match_score": round(overall_score, 1),
+            
+            # Everything build_narrative needs, so explanations can be regenerated later
+            "components": {
+                "overall_score": round(overall_score, 1),
+                "category": category,
+                "ats_score": round(ats_score, 1),
+                "skill_match": skill_match,
+                "project_relevance": project_relevance,
+                "experience_alignment": experience_alignment,
+                "education_fit": education_fit,
+                "keyword_similarity": keyword_similarity
+            }
+        }
+        
+        # Ranking-only callers skip all narrative string building
+        if detail != "score":
+            result.update(self.build_narrative(result["components"], resume_data, job_profile, detail))
+        
+        return result
+    
+    def build_narrative(self, components: Dict, resume_data: Dict, job_profile: Dict = None, detail: str = "full") -> Dict:
+        """
+        Build the human-readable parts of a match from its component scores.
+        
+        "summary" returns resume strength and the explanation line, "full" also adds
+        improvement recommendations.
+        """
+        job_profile = job_profile or {}
+        ats_score = components.get("ats_score", 0)
+        skill_match = components["skill_match"]
+        project_relevance = components["project_relevance"]
+        experience_alignment = components["experience_alignment"]
+        education_fit = components["education_fit"]
+        
+        # Calculate resume strength (0-10 scale)
+        resume_strength = self._calculate_resume_strength(
+            skill_match,
+            experience_alignment,
+            components.get("keyword_similarity", {}),
+            education_fit,
+            ats_score
+        )
+        
+        # Generate explanation
+        explanation = self._generate_explanation(
+            components["overall_score"],
+            components["category"],
+            skill_match,
+            project_relevance,
+            experience_alignment,
+            education_fit,
+            job_profile,
+            ats_score
+        )
+        
+        narrative = {
+            "resume_strength": resume_strength,
             "resume_strength_10": resume_strength,
             "explanation": explanation
         }
+        
+        if detail == "full":
+            # Generate improvement recommendations
+            narrative["improvements"] = self._generate_improvements(
+                ats_score,
+                skill_match,
+                experience_alignment,
+                project_relevance,
+                education_fit,
+                resume_data,
+                job_profile
+            )
+        
+        return narrative
     
     def _analyze_skill_match(
         self,
@@ -0,0 +1,184 @@
+"""
+Streaming reads of resume archives (ZIP and TAR).
+
+Agencies send hundreds of resumes as one archive. ArchiveReader walks its
+members in archive order and streams each resume file into a staged upload
+(blob_store.stage, 1 MB at a time), so nothing is extracted up front and at most
+one member is being decompressed at any moment. TAR archives, compressed or
+not, are read as a stream; ZIP needs its central directory, which the spooled
+upload already allows.
+
+Members get the same checks as single uploads (ALLOWED_EXTENSIONS,
+MAX_UPLOAD_SIZE), and each failure only affects that member. Zip-bomb guards
+are enforced on the bytes actually decompressed, not on what headers claim, and
+stop the whole archive with ArchiveError:
+
+- more than ARCHIVE_MAX_MEMBERS entries;
+- more than ARCHIVE_MAX_TOTAL_MB decompressed in total;
+- a ZIP member (or a compressed TAR stream so far) expanding more than
+  ARCHIVE_MAX_RATIO times.
+"""
+
+import tarfile
+import zipfile
+from pathlib import PurePosixPath
+from typing import BinaryIO, Callable, Iterator, NamedTuple, Optional
+from app.config import settings
+from app.services.blob_store import LocalFile, blob_store
+
+ZIP_SUFFIXES = (".zip",)
+TAR_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+# Small members legitimately compress very well; the ratio is only checked past this
+RATIO_MIN_BYTES = 1024 * 1024
+
+class ArchiveError(ValueError):
+    """The archive is unreadable or hit a zip-bomb limit; no further members are read"""
+
+class MemberTooLarge(Exception):
+    pass
+
+class ArchiveMember(NamedTuple):
+    filename: str  # Base name, which is what the resume records
+    extension: str
+    staged: Optional[LocalFile] = None  # Set for members that were read
+    error: Optional[str] = None
+
+def archive_format(filename: str) -> Optional[str]:
+    """"zip", "tar" or None, by file name"""
+    name = filename.lower()
+    if name.endswith(ZIP_SUFFIXES):
+        return "zip"
+    if name.endswith(TAR_SUFFIXES):
+        return "tar"
+    return None
+
+class _MeteredReader:
+    """One member's data stream, counting what is decompressed against the limits"""
+
+    def __init__(self, archive: "ArchiveReader", stream: BinaryIO, compressed: Callable[[], int]):
+        self.archive = archive
+        self.stream = stream
+        self.compressed = compressed  # Compressed bytes behind what has been read
+        self.size = 0
+
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.stream.read(size)
+        self.size += len(chunk)
+        self.archive.extracted += len(chunk)
+        if self.size > settings.MAX_UPLOAD_SIZE:
+            raise MemberTooLarge()
+        if self.archive.extracted > settings.ARCHIVE_MAX_TOTAL_MB * 1024 * 1024:
+            raise ArchiveError(f"Archive expands to more than {settings.ARCHIVE_MAX_TOTAL_MB} MB")
+        expanded = self.archive.extracted if self.archive.streamed else self.size
+        if expanded > RATIO_MIN_BYTES and expanded > self.compressed() * settings.ARCHIVE_MAX_RATIO:
+            raise ArchiveError(f"Archive expands more than {settings.ARCHIVE_MAX_RATIO}x (possible zip bomb)")
+        return chunk
+
+class ArchiveReader:
+    def __init__(self, fileobj: BinaryIO, filename: str):
+        self.fileobj = fileobj
+        self.format = archive_format(filename)
+        self.members = 0  # Entries seen, directories included
+        self.extracted = 0  # Bytes decompressed so far
+        # Compression spans the whole stream (tar.gz), so the ratio is the archive's
+        self.streamed = False
+
+    def __iter__(self) -> Iterator[ArchiveMember]:
+        if self.format == "zip":
+            return self._zip_members()
+        if self.format == "tar":
+            return self._tar_members()
+        raise ArchiveError("Unsupported archive type")
+
+    def _count(self):
+        self.members += 1
+        if self.members > settings.ARCHIVE_MAX_MEMBERS:
+            raise ArchiveError(f"Archive has more than {settings.ARCHIVE_MAX_MEMBERS} members")
+
+    @staticmethod
+    def _failed(name: str, error: str) -> ArchiveMember:
+        path = PurePosixPath(name)
+        return ArchiveMember(path.name, path.suffix.lower(), error=error)
+
+    def _check(self, name: str, declared_size: int) -> Optional[ArchiveMember]:
+        """The member to report without reading it, if any"""
+        extension = PurePosixPath(name).suffix.lower()
+        if extension.lstrip(".") not in settings.ALLOWED_EXTENSIONS:
+            return self._failed(name, f"Invalid file type '{extension}'")
+        if declared_size > settings.MAX_UPLOAD_SIZE:
+            return self._failed(name, self._too_large())
+        return None
+
+    @staticmethod
+    def _skipped(name: str) -> bool:
+        """macOS resource forks and other hidden files that archivers add"""
+        path = PurePosixPath(name)
+        return path.parts[0] == "__MACOSX" or path.name.startswith(".")
+
+    @staticmethod
+    def _too_large() -> str:
+        return f"File exceeds {settings.MAX_UPLOAD_SIZE // (1024 * 1024)} MB"
+
+    def _stage(self, name: str, stream: BinaryIO, compressed: Callable[[], int]) -> ArchiveMember:
+        path = PurePosixPath(name)
+        extension = path.suffix.lower()
+        try:
+            staged = blob_store.stage(_MeteredReader(self, stream, compressed), extension)
+        except MemberTooLarge:
+            return self._failed(name, self._too_large())
+        except (zipfile.BadZipFile, tarfile.TarError, EOFError, OSError) as e:
+            return self._failed(name, f"Could not read archive member: {e}")
+        return ArchiveMember(path.name, extension, staged)
+
+    def _zip_members(self) -> Iterator[ArchiveMember]:
+        try:
+            archive = zipfile.ZipFile(self.fileobj)
+        except (zipfile.BadZipFile, OSError) as e:
+            raise ArchiveError(f"Not a readable ZIP archive: {e}")
+        with archive:
+            entries = archive.infolist()
+            if len(entries) > settings.ARCHIVE_MAX_MEMBERS:
+                # The central directory tells us up front
+                raise ArchiveError(f"Archive has more than {settings.ARCHIVE_MAX_MEMBERS} members")
+            for info in entries:
+                self._count()
+                if info.is_dir() or self._skipped(info.filename):
+                    continue
+                rejected = self._check(info.filename, info.file_size)
+                if rejected:
+                    yield rejected
+                    continue
+                if info.flag_bits & 0x1:
+                    yield self._failed(info.filename, "File is encrypted")
+                    continue
+                try:
+                    stream = archive.open(info)
+                except (zipfile.BadZipFile, NotImplementedError, OSError) as e:
+                    yield self._failed(info.filename, f"Could not read archive member: {e}")
+                    continue
+                with stream:
+                    member = self._stage(info.filename, stream, lambda: info.compress_size)
+                yield member
+
+    def _tar_members(self) -> Iterator[ArchiveMember]:
+        try:
+            # "r|*": a forward-only stream, any (or no) compression
+            archive = tarfile.open(fileobj=self.fileobj, mode="r|*")
+        except tarfile.TarError as e:
+            raise ArchiveError(f"Not a readable TAR archive: {e}")
+        self.streamed = archive.fileobj.comptype != "tar"
+        with archive:
+            try:
+                for info in archive:
+                    self._count()
+                    # Links, devices and directories carry no resume
+                    if not info.isreg() or self._skipped(info.name):
+                        continue
+                    rejected = self._check(info.name, info.size)
+                    if rejected:
+                        yield rejected
+                        continue
+                    # The next member can only be read once this one is consumed
+                    yield self._stage(info.name, archive.extractfile(info), self.fileobj.tell)
+            except (tarfile.TarError, EOFError, OSError) as e:
+                raise ArchiveError(f"Archive is truncated or corrupt: {e}")
@@ -0,0 +1,329 @@
+"""
+Content-addressed storage for uploaded resume files.
+
+Files are stored once per distinct content under their SHA-256, sharded as
+ab/cd/<sha256>. The stored_blobs table counts how many resumes reference each
+blob; a blob is deleted in the background when its count drops to zero.
+
+All refcount changes and deletions run on the database write queue, so they are
+serialized with each other: a purge can never remove a file that a concurrent
+upload has just started referencing (add_ref re-writes the file if it is gone).
+
+Uploads are never held in memory as a whole: stage() streams them to a local
+file in 1 MB chunks, hashing on the way, and the filesystem backend hard-links
+that file into the store. Parse workers get the path, not the bytes.
+
+Move pre-existing flat uploads into the store with:
+    python -m app.services.blob_store
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+from collections import Counter, defaultdict
+from typing import BinaryIO, List, Optional
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.orm import Session
+from app.config import settings, resolve_upload_folder
+from app.models.models import StoredBlob
+from app.utils.write_queue import write_queue
+
+CHUNK_SIZE = 1024 * 1024
+
+class BlobBackend:
+    """Where blob bytes live. Keys look like "ab/cd/<sha256>"."""
+
+    def exists(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def put_file(self, key: str, source_path: str):
+        """Store the bytes of a local file under key"""
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def local_path(self, key: str) -> Optional[str]:
+        """A filesystem path the parsers can open directly, or None for remote backends"""
+        return None
+
+    def staging_dir(self) -> Optional[str]:
+        """Where uploads are streamed to before they are stored (None: the system temp dir)"""
+        return None
+
+    def locator(self, key: str) -> str:
+        """What Resume.file_path records for the blob"""
+        raise NotImplementedError
+
+class FileSystemBackend(BlobBackend):
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, *key.split("/"))
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self._path(key))
+
+    def put_file(self, key: str, source_path: str):
+        path = self._path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        try:
+            # Staged uploads live on the same filesystem: no copy, and the name only
+            # ever points at a complete file
+            os.link(source_path, path)
+            return
+        except FileExistsError:
+            return
+        except OSError:
+            pass  # No hard links here, or the source is on another filesystem
+        # Copy-then-rename so readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+        os.close(fd)
+        try:
+            shutil.copyfile(source_path, tmp_path)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def delete(self, key: str):
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+    def staging_dir(self) -> Optional[str]:
+        return os.path.join(self.root, ".staging")
+
+    def locator(self, key: str) -> str:
+        return self._path(key)
+
+class S3Backend(BlobBackend):
+    """
+    S3-compatible object storage (AWS S3, or MinIO/LocalStack as a local stand-in via
+    BLOB_S3_ENDPOINT_URL). Credentials come from the usual AWS environment variables.
+    """
+
+    def __init__(self, bucket: str, prefix: str = "", endpoint_url: Optional[str] = None):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("BLOB_STORE_BACKEND=s3 requires the boto3 package")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url or None)
+        self.bucket = bucket
+        self.prefix = prefix.strip("/")
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def exists(self, key: str) -> bool:
+        from botocore.exceptions import ClientError
+        try:
+            self.client.head_object(Bucket=self.bucket, Key=self._object_key(key))
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
+    def put_file(self, key: str, source_path: str):
+        # Multipart upload straight from disk for large files
+        self.client.upload_file(source_path, self.bucket, self._object_key(key))
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object_key(key))
+
+    def locator(self, key: str) -> str:
+        return f"s3://{self.bucket}/{self._object_key(key)}"
+
+class LocalFile:
+    """A file on local disk with its SHA-256; temporary ones are deleted on close()"""
+
+    def __init__(self, path: str, sha256: str, size: int, temporary: bool = False):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.temporary = temporary
+
+    def close(self):
+        if self.temporary and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self) -> "LocalFile":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def _copy_hashing(source: BinaryIO, target: Optional[BinaryIO]):
+    """(sha256, size) of a stream, copying it to target on the way"""
+    digest = hashlib.sha256()
+    size = 0
+    while True:
+        chunk = source.read(CHUNK_SIZE)
+        if not chunk:
+            return digest.hexdigest(), size
+        digest.update(chunk)
+        size += len(chunk)
+        if target is not None:
+            target.write(chunk)
+
+class BlobStore:
+    def __init__(self, backend: BlobBackend):
+        self.backend = backend
+
+    def stage(self, fileobj: BinaryIO, suffix: str = "") -> LocalFile:
+        """Stream an upload to a temporary local file (keeping the extension for the parsers)"""
+        directory = self.backend.staging_dir()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        fd, path = tempfile.mkstemp(suffix=suffix, prefix=".upload-", dir=directory)
+        try:
+            with os.fdopen(fd, "wb") as target:
+                sha256, size = _copy_hashing(fileobj, target)
+        except BaseException:
+            os.remove(path)
+            raise
+        return LocalFile(path, sha256, size, temporary=True)
+
+    @staticmethod
+    def describe(path: str) -> LocalFile:
+        """Hash an existing file in place"""
+        with open(path, "rb") as f:
+            sha256, size = _copy_hashing(f, None)
+        return LocalFile(path, sha256, size)
+
+    @staticmethod
+    def key(sha256: str) -> str:
+        return f"{sha256[:2]}/{sha256[2:4]}/{sha256}"
+
+    def store(self, source: LocalFile) -> str:
+        """Store the file if its content is not stored yet; returns its SHA-256 (no reference taken)"""
+        key = self.key(source.sha256)
+        if not self.backend.exists(key):
+            self.backend.put_file(key, source.path)
+        return source.sha256
+
+    def locator(self, sha256: str) -> str:
+        return self.backend.locator(self.key(sha256))
+
+    def add_ref(self, db: Session, sha256: str, source: Optional[LocalFile]):
+        """Count one more reference (write-queue job, same transaction as the referencing row).
+        source may be None when the blob is known to be stored already."""
+        refcount = db.execute(select(StoredBlob.refcount).where(StoredBlob.sha256 == sha256)).scalar()
+        if (refcount is None or refcount <= 0) and source is not None:
+            # New, or waiting to be purged: make sure the bytes are (still) there
+            key = self.key(sha256)
+            if not self.backend.exists(key):
+                self.backend.put_file(key, source.path)
+        if refcount is None:
+            db.add(StoredBlob(sha256=sha256, size=source.size if source is not None else None, refcount=1))
+            db.flush()
+        else:
+            db.execute(
+                update(StoredBlob).where(StoredBlob.sha256 == sha256).values(refcount=StoredBlob.refcount + 1)
+            )
+
+    def add_refs(self, db: Session, sources: List[LocalFile]):
+        """add_ref for a batch of files in a few statements: one lookup, one insert of the
+        new blobs and one update per distinct reference count"""
+        counts = Counter(source.sha256 for source in sources)
+        by_sha = {source.sha256: source for source in sources}
+        existing = dict(db.execute(
+            select(StoredBlob.sha256, StoredBlob.refcount).where(StoredBlob.sha256.in_(list(counts)))
+        ).all())
+        for sha256, source in by_sha.items():
+            refcount = existing.get(sha256)
+            if (refcount is None or refcount <= 0) and not self.backend.exists(self.key(sha256)):
+                self.backend.put_file(self.key(sha256), source.path)
+        new = [{"sha256": sha256, "size": by_sha[sha256].size, "refcount": count}
+               for sha256, count in counts.items() if sha256 not in existing]
+        if new:
+            db.execute(insert(StoredBlob), new)
+        increments = defaultdict(list)
+        for sha256, count in counts.items():
+            if sha256 in existing:
+                increments[count].append(sha256)
+        for count, sha256s in increments.items():
+            db.execute(
+                update(StoredBlob).where(StoredBlob.sha256.in_(sha256s)).values(refcount=StoredBlob.refcount + count)
+            )
+
+    @staticmethod
+    def release(db: Session, sha256: str) -> bool:
+        """Drop one reference (caller commits); True when nothing references the blob anymore"""
+        db.execute(
+            update(StoredBlob).where(StoredBlob.sha256 == sha256).values(refcount=StoredBlob.refcount - 1)
+        )
+        refcount = db.execute(select(StoredBlob.refcount).where(StoredBlob.sha256 == sha256)).scalar()
+        return refcount is None or refcount <= 0
+
+    def purge(self, sha256: str):
+        """Delete an unreferenced blob (background task); no-op if it was referenced again"""
+        def job(db: Session) -> bool:
+            refcount = db.execute(select(StoredBlob.refcount).where(StoredBlob.sha256 == sha256)).scalar()
+            if refcount is not None and refcount > 0:
+                return False
+            db.execute(delete(StoredBlob).where(StoredBlob.sha256 == sha256, StoredBlob.refcount <= 0))
+            self.backend.delete(self.key(sha256))
+            return True
+        try:
+            if write_queue.run(job):
+                print(f"Blob store: deleted {sha256}")
+        except Exception as e:
+            print(f"Blob store: could not delete {sha256}: {e}")
+
+def create_backend() -> BlobBackend:
+    if settings.BLOB_STORE_BACKEND == "s3":
+        return S3Backend(settings.BLOB_S3_BUCKET, settings.BLOB_S3_PREFIX, settings.BLOB_S3_ENDPOINT_URL)
+    return FileSystemBackend(settings.BLOB_STORE_PATH or os.path.join(resolve_upload_folder(), "blobs"))
+
+blob_store = BlobStore(create_backend())
+
+def migrate_legacy_uploads():
+    """Move resumes whose files sit directly in UPLOAD_FOLDER into the blob store"""
+    from app.database import SessionLocal
+    from app.models.models import Resume
+
+    db = SessionLocal()
+    moved = missing = 0
+    try:
+        legacy = db.query(Resume.id, Resume.file_path).filter(Resume.blob_sha256.is_(None)).all()
+        for resume_id, file_path in legacy:
+            if not file_path or not os.path.exists(file_path):
+                missing += 1
+                continue
+            source = blob_store.describe(file_path)
+            sha256 = blob_store.store(source)
+
+            def job(writer: Session, resume_id=resume_id, sha256=sha256, source=source):
+                blob_store.add_ref(writer, sha256, source)
+                writer.execute(
+                    update(Resume).where(Resume.id == resume_id)
+                    .values(blob_sha256=sha256, file_path=blob_store.locator(sha256))
+                )
+            write_queue.run(job)
+            moved += 1
+
+        # Remove the flat copies nobody points at anymore
+        still_used = {path for (path,) in db.query(Resume.file_path)}
+        removed = 0
+        for _, file_path in legacy:
+            if file_path and file_path not in still_used and os.path.exists(file_path):
+                os.remove(file_path)
+                removed += 1
+        print(f"Moved {moved} resumes into the blob store, removed {removed} flat files ({missing} files were missing)")
+    finally:
+        db.close()
+        write_queue.stop()
+
+if __name__ == "__main__":
+    migrate_legacy_uploads()
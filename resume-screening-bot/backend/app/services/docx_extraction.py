@@ -0,0 +1,111 @@
+"""
+Streaming DOCX text extraction.
+
+python-docx builds an object tree for the whole document before the first
+paragraph can be read, which for a CV with large tables costs far more time and
+memory than the text itself. iter_docx_lines() iterparses word/document.xml
+straight from the zip instead, dropping every paragraph and table row once it
+has been read, and yields lines in document order:
+
+- a body paragraph is one line (empty paragraphs included), its text mapped the
+  way python-docx does it: w:t, tabs, line breaks and non-breaking hyphens;
+- a table row whose cells hold one line each becomes "cell | cell | cell", which
+  the section parser splits like any other delimited skills line;
+- rows with multi-line cells (two-column layout tables) yield each cell's lines
+  in turn, so their sections read like body text.
+
+Unlike python-docx it also reads text in hyperlinks, tracked insertions, content
+controls, text boxes and nested tables, and it emits a horizontally merged cell
+once instead of once per spanned column.
+"""
+
+import zipfile
+from typing import Iterator, List
+from lxml import etree
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_P, _R, _TR, _TC = _W + "p", _W + "r", _W + "tr", _W + "tc"
+_BODY = _W + "body"
+_TEXT = _W + "t"
+_TABS = (_W + "tab", _W + "ptab")
+_BREAKS = (_W + "br", _W + "cr")
+_HYPHEN = _W + "noBreakHyphen"
+# Deleted revisions, and the legacy duplicate of every modern drawing/text box
+_SKIPPED = (_W + "del", _W + "moveFrom", "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback")
+
+def _row_lines(cells: List[List[str]]) -> List[str]:
+    cells = [[line.strip() for line in cell if line.strip()] for cell in cells]
+    cells = [cell for cell in cells if cell]
+    if all(len(cell) == 1 for cell in cells):
+        return [" | ".join(cell[0] for cell in cells)] if cells else []
+    return [line for cell in cells for line in cell]
+
+def iter_docx_lines(file_path: str) -> Iterator[str]:
+    """Lines of a .docx file's main document, in document order"""
+    with zipfile.ZipFile(file_path) as archive, archive.open("word/document.xml") as xml:
+        paragraphs: List[List[str]] = []  # Text-box paragraphs nest inside paragraphs
+        cells: List[List[str]] = []  # Lines of each open table cell, innermost last
+        rows: List[List[List[str]]] = []  # Cells of each open table row
+        skipped = runs = 0
+        pending: List[str] = []
+
+        def deliver(lines: List[str]):
+            if cells:
+                cells[-1].extend(lines)
+            else:
+                pending.extend(lines)
+
+        events = etree.iterparse(xml, events=("start", "end"), resolve_entities=False, no_network=True)
+        for event, element in events:
+            tag = element.tag
+            if event == "start":
+                if tag in _SKIPPED:
+                    skipped += 1
+                elif skipped:
+                    continue
+                elif tag == _P:
+                    paragraphs.append([])
+                elif tag == _R:
+                    runs += 1
+                elif tag == _TR:
+                    rows.append([])
+                elif tag == _TC:
+                    cells.append([])
+                continue
+
+            if tag in _SKIPPED:
+                skipped -= 1
+            elif skipped:
+                continue
+            elif tag == _R:
+                runs -= 1
+            elif tag == _P:
+                text = "".join(paragraphs.pop())
+                deliver(text.split("\n") if cells else [text])
+            elif tag == _TC:
+                rows[-1].append(cells.pop())
+            elif tag == _TR:
+                deliver(_row_lines(rows.pop()))
+            elif runs and paragraphs:
+                if tag == _TEXT:
+                    paragraphs[-1].append(element.text or "")
+                elif tag in _TABS:
+                    paragraphs[-1].append("\t")
+                elif tag in _BREAKS:
+                    # Page and column breaks are not text
+                    if element.get(_W + "type", "textWrapping") == "textWrapping":
+                        paragraphs[-1].append("\n")
+                elif tag == _HYPHEN:
+                    paragraphs[-1].append("-")
+                continue
+
+            parent = element.getparent()
+            if tag in (_P, _TR) or (parent is not None and parent.tag == _BODY):
+                # Read: drop this element and the siblings before it, so memory stays
+                # flat however long the document or a single table gets
+                element.clear()
+                while element.getprevious() is not None:
+                    del parent[0]
+            if pending:
+                yield from pending
+                pending.clear()
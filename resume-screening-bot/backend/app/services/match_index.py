@@ -0,0 +1,175 @@
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from app.database import SessionLocal
+from app.models.models import Resume, ResumeText, JobPosting, JobMatch
+from app.services.match_matrix import MatchMatrixScorer
+from app.utils.write_queue import write_queue
+from app.utils.text_codec import decompress_text
+
+class MatchIndex:
+    """
+    Keeps the job_matches table in sync with resumes and job postings.
+
+    New resumes are scored against every open job, and new or edited jobs against
+    the whole resume pool, so "top candidates for job X" is a single indexed read.
+    Every posting counts as open: job postings have no closed state yet.
+    """
+
+    def __init__(self, scorer: Optional[MatchMatrixScorer] = None, chunk_size: int = 2000):
+        self.scorer = scorer or MatchMatrixScorer()
+        # Bounds the (resumes x jobs) matrices held in memory during a refresh
+        self.chunk_size = chunk_size
+
+    def refresh_resumes(self, resume_ids: List[int]):
+        """Score the given resumes against all open jobs (run as a background task)"""
+        if not resume_ids:
+            return
+        db = SessionLocal()
+        try:
+            jobs = db.query(JobPosting.id, JobPosting.description).order_by(JobPosting.id).all()
+            if not jobs:
+                return
+            job_ids = [job.id for job in jobs]
+            descriptions = [job.description or "" for job in jobs]
+            profiles = self.scorer.analyze_jobs(descriptions)
+
+            for start in range(0, len(resume_ids), self.chunk_size):
+                chunk = resume_ids[start:start + self.chunk_size]
+                resumes = self._resume_rows(db).filter(Resume.id.in_(chunk)).all()
+                self._store(db, resumes, job_ids, descriptions, profiles)
+            print(f"Match index: scored {len(resume_ids)} resumes against {len(job_ids)} jobs")
+        except Exception as e:
+            db.rollback()
+            print(f"Match index refresh failed for resumes {resume_ids[:5]}...: {e}")
+        finally:
+            db.close()
+
+    def refresh_job(self, job_id: int):
+        """Re-score one job against the whole resume pool (run as a background task)"""
+        db = SessionLocal()
+        try:
+            job = db.query(JobPosting.id, JobPosting.description).filter(JobPosting.id == job_id).first()
+            if not job:
+                return
+            descriptions = [job.description or ""]
+            profiles = self.scorer.analyze_jobs(descriptions)
+
+            # Each chunk swaps the job's rows for its id range in one write, so readers see
+            # old or new scores, never none, and a failure leaves the old ones in place
+            scored = 0
+            last_id = 0
+            while True:
+                resumes = (
+                    self._resume_rows(db)
+                    .filter(Resume.id > last_id)
+                    .order_by(Resume.id)
+                    .limit(self.chunk_size)
+                    .all()
+                )
+                if not resumes:
+                    break
+                self._store(db, resumes, [job_id], descriptions, profiles, replace_range=(last_id, resumes[-1].id))
+                scored += len(resumes)
+                last_id = resumes[-1].id
+            # Past the last chunk, only rows of deleted resumes go (new uploads score themselves)
+            write_queue.run(lambda writer: writer.execute(
+                delete(JobMatch).where(
+                    JobMatch.job_id == job_id, JobMatch.resume_id > last_id, JobMatch.resume_id.not_in(select(Resume.id))
+                )
+            ))
+            print(f"Match index: scored job {job_id} against {scored} resumes")
+        except Exception as e:
+            db.rollback()
+            print(f"Match index refresh failed for job {job_id}: {e}")
+        finally:
+            db.close()
+
+    @staticmethod
+    def _resume_rows(db: Session):
+        """Resume id, parsed data and compressed text, without loading ORM objects"""
+        return (
+            db.query(Resume.id, Resume.parsed_data, ResumeText.codec, ResumeText.data)
+            .outerjoin(ResumeText, ResumeText.resume_id == Resume.id)
+        )
+
+    def _store(self, db: Session, resumes, job_ids: List[int], descriptions: List[str], profiles: List[Dict],
+               replace_range: Optional[Tuple[int, int]] = None):
+        """
+        Score one chunk and replace its rows in job_matches (written by the write queue).
+
+        With replace_range=(after_id, last_id), every row of these jobs in that resume id
+        range is replaced, including rows of resumes that no longer exist.
+        """
+        if not resumes:
+            return
+        resume_ids = [r.id for r in resumes]
+        matrices = self.scorer.score_matrix(
+            [{"parsed_data": r.parsed_data, "raw_text": decompress_text(r.codec, r.data)} for r in resumes],
+            descriptions,
+            profiles
+        )
+        now = datetime.utcnow()
+        rows = []
+        for i, resume_id in enumerate(resume_ids):
+            for k, job_id in enumerate(job_ids):
+                rows.append({
+                    "job_id": job_id,
+                    "resume_id": resume_id,
+                    "score": round(float(matrices["overall"][i, k]), 1),
+                    "components": {
+                        name: round(float(matrices[name][i, k]), 1)
+                        for name in MatchMatrixScorer.COMPONENTS
+                    },
+                    "updated_at": now
+                })
+
+        # End the read transaction so this session holds no snapshot while the writer runs
+        db.commit()
+
+        if replace_range:
+            in_chunk = JobMatch.resume_id > replace_range[0], JobMatch.resume_id <= replace_range[1]
+        else:
+            in_chunk = (JobMatch.resume_id.in_(resume_ids),)
+
+        def replace_rows(writer: Session):
+            writer.execute(delete(JobMatch).where(JobMatch.job_id.in_(job_ids), *in_chunk))
+            writer.execute(insert(JobMatch), rows)
+
+        write_queue.run(replace_rows)
+
+    @staticmethod
+    def remove_resume(db: Session, resume_id: int):
+        """Drop a resume's rows (caller commits)"""
+        db.execute(delete(JobMatch).where(JobMatch.resume_id == resume_id))
+
+    @staticmethod
+    def remove_job(db: Session, job_id: int):
+        """Drop a job's rows (caller commits)"""
+        db.execute(delete(JobMatch).where(JobMatch.job_id == job_id))
+
+    def top_candidates(self, db: Session, job_id: int, limit: int = 20, offset: int = 0) -> List[Dict]:
+        """Pre-ranked candidates for a job, served from the (job_id, score) index"""
+        rows = (
+            db.query(JobMatch.resume_id, JobMatch.score, JobMatch.components, JobMatch.updated_at, Resume.filename)
+            .join(Resume, Resume.id == JobMatch.resume_id)
+            .filter(JobMatch.job_id == job_id)
+            .order_by(JobMatch.score.desc(), JobMatch.resume_id)
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+        return [
+            {
+                "resume_id": row.resume_id,
+                "filename": row.filename,
+                "score": row.score,
+                "category": self.scorer.matcher._categorize_match(row.score or 0),
+                "components": row.components,
+                "scored_at": row.updated_at
+            }
+            for row in rows
+        ]
+
+match_index = MatchIndex()
@@ -0,0 +1,330 @@
+from typing import Dict, List, Optional
+import re
+import numpy as np
+from scipy import sparse
+from sklearn.feature_extraction.text import CountVectorizer
+from app.services.advanced_matcher import AdvancedResumeMatcher
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9+#]+")
+# Smoothed IDF of a term found in one of two documents: ln((1 + 2) / (1 + 1)) + 1
+PAIR_IDF = np.log(1.5) + 1
+
+def _prefix_analyzer(text: str) -> List[str]:
+    """Emit every prefix of every token so a keyword matches words it starts ("develop" -> "developed")"""
+    prefixes = []
+    for token in TOKEN_PATTERN.findall(text.lower()):
+        prefixes.extend(token[:i] for i in range(1, len(token) + 1))
+    return prefixes
+
+class MatchMatrixScorer:
+    """
+    Many-to-many resume x job scoring.
+
+    Uses the same component weights as AdvancedResumeMatcher.match_resume_to_job, but
+    computes every component for all pairs at once:
+      - skill overlap: sparse boolean (resume x skill) @ (skill x job) matmul
+      - keyword similarity: the single-pair TF-IDF cosine (IDF over just that resume and
+        job), for all pairs at once from term counts via sparse matmuls
+      - responsibility hits (experience/projects): sparse keyword incidence matmuls
+      - years of experience and education: per-resume / per-job vectors broadcast to (R, J)
+
+    Every component depends on one resume and one job only, so a pair scores the same
+    whichever batch it is computed in. Responsibility keywords are matched against word
+    prefixes instead of arbitrary substrings, so scores can differ slightly from the
+    single-pair endpoint. The matrix is meant for ranking large pools, not for the
+    detailed per-candidate report.
+    """
+
+    COMPONENTS = ("skill", "keyword", "experience", "project", "education", "ats")
+
+    def __init__(self, matcher: Optional[AdvancedResumeMatcher] = None):
+        self.matcher = matcher or AdvancedResumeMatcher()
+        self.job_analyzer = self.matcher.job_analyzer
+        self.ats_scorer = self.matcher.ats_scorer
+
+    def analyze_jobs(self, job_descriptions: List[str]) -> List[Dict]:
+        """Build job profiles, falling back to an empty profile for blank descriptions"""
+        profiles = []
+        for description in job_descriptions:
+            if not description or len(description.strip()) < 10:
+                profiles.append({
+                    "required_skills": [],
+                    "preferred_skills": [],
+                    "key_responsibilities": [],
+                    "experience_level": "Mid",
+                    "years_experience": None,
+                    "technical_focus": [],
+                    "domain_knowledge": []
+                })
+            else:
+                profiles.append(self.job_analyzer.analyze_job_description(description))
+        return profiles
+
+    def score_matrix(
+        self,
+        resumes: List[Dict],
+        job_descriptions: List[str],
+        job_profiles: Optional[List[Dict]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Score every resume against every job description.
+
+        resumes: [{"parsed_data": dict, "raw_text": str}, ...]
+        Returns float32 arrays of shape (len(resumes), len(job_descriptions)) keyed by
+        "overall" and each name in COMPONENTS.
+        """
+        n_resumes, n_jobs = len(resumes), len(job_descriptions)
+        if n_resumes == 0 or n_jobs == 0:
+            empty = np.zeros((n_resumes, n_jobs), dtype=np.float32)
+            return {name: empty.copy() for name in ("overall",) + self.COMPONENTS}
+
+        if job_profiles is None:
+            job_profiles = self.analyze_jobs(job_descriptions)
+
+        parsed = [r.get("parsed_data") or {} for r in resumes]
+        texts = [r.get("raw_text") or "" for r in resumes]
+        texts_lower = [t.lower() for t in texts]
+
+        skill_score, jd_skill_counts = self._skill_scores(parsed, job_profiles)
+        keyword = self._keyword_similarity(texts, job_descriptions)
+        experience = self._experience_scores(parsed, texts, job_profiles)
+        project = self._project_scores(parsed, job_profiles)
+        education = self._education_scores(parsed, texts_lower, job_profiles)
+        ats = np.array(
+            [self.ats_scorer.calculate_ats_score(p) for p in parsed], dtype=np.float64
+        )
+
+        # Same weighting as AdvancedResumeMatcher.match_resume_to_job
+        with_skills = (
+            skill_score * 0.45
+            + experience * 0.25
+            + keyword * 100 * 0.20
+            + project * 0.10
+            + ((ats / 100) * 5 * 0.5)[:, None]
+        )
+        with_skills = np.minimum(100, with_skills)
+        without_skills = keyword * 100 * 0.50 + experience * 0.30 + project * 0.20
+        overall = np.where((jd_skill_counts > 0)[None, :], with_skills, without_skills)
+
+        return {
+            "overall": np.round(overall, 1).astype(np.float32),
+            "skill": skill_score.astype(np.float32),
+            "keyword": np.round(keyword * 100, 1).astype(np.float32),
+            "experience": experience.astype(np.float32),
+            "project": project.astype(np.float32),
+            "education": education.astype(np.float32),
+            "ats": np.broadcast_to(np.round(ats, 1)[:, None], (n_resumes, n_jobs)).astype(np.float32),
+        }
+
+    def _skill_scores(self, parsed: List[Dict], job_profiles: List[Dict]):
+        """Required-skill match percentage via a sparse boolean matmul"""
+        job_skills = [
+            sorted({s.lower().strip() for s in p.get("required_skills", []) if s and s.strip()})
+            for p in job_profiles
+        ]
+        vocab = sorted({s for skills in job_skills for s in skills})
+        jd_counts = np.array([len(skills) for skills in job_skills], dtype=np.float64)
+        if not vocab:
+            return np.zeros((len(parsed), len(job_profiles))), jd_counts
+
+        index = {skill: i for i, skill in enumerate(vocab)}
+        job_matrix = self._incidence(
+            [[index[s] for s in skills] for skills in job_skills], len(vocab)
+        )
+
+        # Partial matching (either string contains the other) is resolved once per
+        # distinct resume skill instead of once per resume x job pair
+        resolved: Dict[str, List[int]] = {}
+        resume_rows = []
+        for data in parsed:
+            hits = set()
+            for raw_skill in data.get("technical_skills", []) or []:
+                skill = raw_skill.lower().strip()
+                if skill not in resolved:
+                    resolved[skill] = [
+                        i for i, req in enumerate(vocab)
+                        if req == skill or req in skill or skill in req
+                    ]
+                hits.update(resolved[skill])
+            resume_rows.append(sorted(hits))
+        resume_matrix = self._incidence(resume_rows, len(vocab))
+
+        matched = (resume_matrix @ job_matrix.T).toarray()
+        scores = np.divide(
+            matched * 100.0, jd_counts[None, :],
+            out=np.zeros_like(matched, dtype=np.float64), where=jd_counts[None, :] > 0
+        )
+        return np.minimum(100, scores), jd_counts
+
+    def _keyword_similarity(self, resume_texts: List[str], job_descriptions: List[str]) -> np.ndarray:
+        """
+        Combined keyword score (0-1): TF-IDF cosine with the IDF of each pair on its own.
+
+        NLPAnalyzer fits TF-IDF on [resume, job]: with two documents a term in both gets
+        idf 1 and a term in one gets PAIR_IDF, so only shared terms add to the dot
+        product and each norm is PAIR_IDF^2 * sum(tf^2) minus a correction for the terms
+        it shares with the other document.
+        """
+        vectorizer = CountVectorizer(stop_words="english")
+        try:
+            counts = vectorizer.fit_transform(list(resume_texts) + list(job_descriptions)).astype(np.float64)
+        except ValueError:
+            # Empty vocabulary (all texts blank or stop words)
+            return np.zeros((len(resume_texts), len(job_descriptions)))
+        resumes, jobs = counts[:len(resume_texts)], counts[len(resume_texts):]
+        resumes_sq, jobs_sq = resumes.multiply(resumes), jobs.multiply(jobs)
+        resumes_seen, jobs_seen = (resumes > 0).astype(np.float64), (jobs > 0).astype(np.float64)
+
+        dot = (resumes @ jobs.T).toarray()
+        extra = PAIR_IDF ** 2 - 1
+        resume_norm = PAIR_IDF ** 2 * np.asarray(resumes_sq.sum(axis=1)) - extra * (resumes_sq @ jobs_seen.T).toarray()
+        job_norm = PAIR_IDF ** 2 * np.asarray(jobs_sq.sum(axis=1)).T - extra * (resumes_seen @ jobs_sq.T).toarray()
+        norms = np.sqrt(resume_norm * job_norm)
+        cosine = np.divide(dot, norms, out=np.zeros_like(dot), where=norms > 0)
+        # NLPAnalyzer.compute_relevance_score: 0.4 * semantic + 0.3 * tfidf, both TF-IDF cosine
+        return 0.7 * np.clip(cosine, 0, 1)
+
+    def _responsibility_hits(self, docs: List[str], job_profiles: List[Dict]):
+        """
+        Return (doc x responsibility) boolean hits and (responsibility x job) membership.
+
+        A responsibility hits a document when any of its first five words starts a word
+        in the document, mirroring the keyword check in AdvancedResumeMatcher.
+        """
+        keyword_index: Dict[str, int] = {}
+        resp_rows = []
+        resp_owner = []
+        for job_idx, profile in enumerate(job_profiles):
+            for resp in profile.get("key_responsibilities", []):
+                row = set()
+                for word in resp.lower().split()[:5]:
+                    keyword = "".join(TOKEN_PATTERN.findall(word))
+                    if keyword:
+                        row.add(keyword_index.setdefault(keyword, len(keyword_index)))
+                resp_rows.append(sorted(row))
+                resp_owner.append(job_idx)
+
+        n_resp = len(resp_rows)
+        membership = sparse.csr_matrix(
+            (np.ones(n_resp, dtype=np.int32), (np.arange(n_resp), resp_owner)),
+            shape=(n_resp, len(job_profiles))
+        )
+        if not keyword_index:
+            return sparse.csr_matrix((len(docs), n_resp), dtype=np.int32), membership
+
+        vectorizer = CountVectorizer(
+            analyzer=_prefix_analyzer, vocabulary=keyword_index, binary=True, dtype=np.int32
+        )
+        doc_keywords = vectorizer.transform(docs)
+        resp_keywords = self._incidence(resp_rows, len(keyword_index))
+        hits = (doc_keywords @ resp_keywords.T)
+        hits.data = np.minimum(hits.data, 1)
+        return hits.tocsr(), membership
+
+    def _experience_scores(self, parsed: List[Dict], texts: List[str], job_profiles: List[Dict]) -> np.ndarray:
+        """Responsibility alignment plus years-of-experience fit, broadcast over all pairs"""
+        experiences = [data.get("experience", []) or [] for data in parsed]
+        has_experience = np.array([bool(e) for e in experiences])
+        years_estimated = np.array([
+            self.matcher._estimate_years_from_resume(text, exp) if exp else 0.0
+            for text, exp in zip(texts, experiences)
+        ], dtype=np.float64)[:, None]
+
+        hits, membership = self._responsibility_hits(
+            [" ".join(e) for e in experiences], job_profiles
+        )
+        resp_counts = np.array(
+            [len(p.get("key_responsibilities", [])) for p in job_profiles], dtype=np.float64
+        )
+        matches = (hits @ membership).toarray()
+        responsibility_score = np.minimum(60, matches / np.maximum(resp_counts, 1)[None, :] * 60)
+
+        years_required = np.array(
+            [p.get("years_experience") or 0 for p in job_profiles], dtype=np.float64
+        )[None, :]
+        diff = np.abs(years_estimated - years_required)
+        by_years = np.select(
+            [diff == 0, diff <= 1, diff <= 2],
+            [40, 30, 20],
+            np.maximum(0, 20 - (diff - 2) * 5)
+        )
+        levels = np.array([p.get("experience_level") for p in job_profiles], dtype=object)[None, :]
+        level_fit = (
+            ((levels == "Entry") & (years_estimated <= 2))
+            | ((levels == "Mid") & (years_estimated > 2) & (years_estimated <= 5))
+            | ((levels == "Senior") & (years_estimated > 5))
+        )
+        by_level = np.where(level_fit, 40, 20)
+        years_score = np.where(years_required > 0, by_years, by_level)
+
+        score = np.minimum(100, responsibility_score + years_score)
+        return np.where(has_experience[:, None], score, 0.0)
+
+    def _project_scores(self, parsed: List[Dict], job_profiles: List[Dict]) -> np.ndarray:
+        """Project relevance: per-project responsibility hits summed per resume, plus technical focus"""
+        projects = [data.get("projects", []) or [] for data in parsed]
+        has_projects = np.array([bool(p) for p in projects])
+
+        flat_projects = [project for resume_projects in projects for project in resume_projects]
+        owners = [i for i, resume_projects in enumerate(projects) for _ in resume_projects]
+        hits, membership = self._responsibility_hits(flat_projects, job_profiles)
+        project_owner = sparse.csr_matrix(
+            (np.ones(len(owners), dtype=np.int32), (owners, np.arange(len(owners)))),
+            shape=(len(parsed), len(flat_projects))
+        )
+        matches = (project_owner @ hits @ membership).toarray()
+        resp_counts = np.array(
+            [len(p.get("key_responsibilities", [])) for p in job_profiles], dtype=np.float64
+        )
+        responsibility_score = np.minimum(60, matches / np.maximum(resp_counts, 1)[None, :] * 60)
+
+        projects_text = [" ".join(p).lower() for p in projects]
+        focus_hits, focus_counts = self._term_hits(
+            projects_text, [p.get("technical_focus", []) for p in job_profiles]
+        )
+        technical_score = np.minimum(40, focus_hits / np.maximum(focus_counts, 1)[None, :] * 40)
+
+        score = np.minimum(100, responsibility_score + technical_score)
+        return np.where(has_projects[:, None], score, 0.0)
+
+    def _education_scores(self, parsed: List[Dict], texts_lower: List[str], job_profiles: List[Dict]) -> np.ndarray:
+        """Technical degree (per resume) plus domain and focus exposure (per pair)"""
+        technical_keywords = ["computer", "engineering", "science", "technology", "software", "it", "cs"]
+        has_technical = np.array([
+            any(k in " ".join(data.get("education", []) or []).lower() for k in technical_keywords)
+            for data in parsed
+        ])
+        education_score = np.where(has_technical, 50, 20)[:, None]
+
+        domain_hits, domain_counts = self._term_hits(
+            texts_lower, [p.get("domain_knowledge", []) for p in job_profiles]
+        )
+        domain_score = np.minimum(30, domain_hits / np.maximum(domain_counts, 1)[None, :] * 30)
+        focus_hits, _ = self._term_hits(
+            texts_lower, [p.get("technical_focus", []) for p in job_profiles]
+        )
+        exposure_score = np.minimum(20, focus_hits * 5)
+
+        return np.minimum(100, education_score + domain_score + exposure_score)
+
+    def _term_hits(self, docs_lower: List[str], job_terms: List[List[str]]):
+        """Count, for every pair, how many of the job's terms occur as substrings of the document"""
+        vocab = sorted({t for terms in job_terms for t in terms})
+        counts = np.array([len(terms) for terms in job_terms], dtype=np.float64)
+        if not vocab:
+            return np.zeros((len(docs_lower), len(job_terms))), counts
+        index = {term: i for i, term in enumerate(vocab)}
+        doc_matrix = self._incidence(
+            [[i for term, i in index.items() if term in doc] for doc in docs_lower], len(vocab)
+        )
+        job_matrix = self._incidence([[index[t] for t in terms] for terms in job_terms], len(vocab))
+        return (doc_matrix @ job_matrix.T).toarray().astype(np.float64), counts
+
+    @staticmethod
+    def _incidence(rows: List[List[int]], n_cols: int) -> sparse.csr_matrix:
+        """Build a 0/1 CSR matrix from per-row column indices"""
+        indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(r) for r in rows])
+        indices = np.fromiter((c for r in rows for c in r), dtype=np.int32, count=int(indptr[-1]))
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(rows), n_cols))
@@ -0,0 +1,53 @@
+"""
+Page-parallel parsing for long PDFs.
+
+A 20-30 page academic CV takes one worker several seconds to extract, page after
+page, while the others sit idle. parse_file() asks a worker to parse the file as
+usual, unless it is a PDF with more than PDF_PARALLEL_MIN_PAGES pages: then the
+pages are split into consecutive ranges, one per parse worker, extracted
+concurrently, and joined in page order before structure and skills are parsed.
+The text is exactly what serial extraction produces.
+
+Every step runs in the sandboxed worker pool, so a range that times out or runs
+out of memory raises ParseAborted like a whole-file parse does.
+"""
+
+import asyncio
+import time
+from typing import List, Tuple
+from app.config import settings
+from app.services.pdf_extraction import PdfTextExtractor
+from app.services.resume_parser import extract_pdf_pages, parse_extracted_text, parse_resume_file
+from app.utils.executors import run_in_process
+from app.utils.sandbox import ParseAborted
+
+# Opening a PDF costs a worker some time too; ranges shorter than this are not worth it
+MIN_PAGES_PER_RANGE = 3
+
+def page_ranges(pages: int, workers: int) -> List[Tuple[int, int]]:
+    """Consecutive [first, last) ranges of about equal size"""
+    parts = max(1, min(workers, pages // MIN_PAGES_PER_RANGE))
+    bounds = [pages * i // parts for i in range(parts + 1)]
+    return list(zip(bounds, bounds[1:]))
+
+async def parse_file(file_path: str, file_extension: str) -> dict:
+    """parse_resume_file in the worker pool, splitting long PDFs across workers"""
+    split_pages = settings.PDF_PARALLEL_MIN_PAGES if settings.PARSE_WORKERS > 1 else 0
+    parsed = await run_in_process(parse_resume_file, file_path, file_extension, split_pages)
+    if "split" not in parsed:
+        return parsed
+
+    started = time.perf_counter()
+    try:
+        parts = await asyncio.gather(*(
+            run_in_process(extract_pdf_pages, file_path, first, last)
+            for first, last in page_ranges(parsed["split"], settings.PARSE_WORKERS)
+        ))
+    except ParseAborted:
+        raise
+    except Exception as e:
+        # Let the serial path produce its usual error handling and result
+        print(f"Page-parallel extraction failed, extracting serially: {e}")
+        return await run_in_process(parse_resume_file, file_path, file_extension)
+    raw_text, stats = PdfTextExtractor.merge(parts, (time.perf_counter() - started) * 1000)
+    return await run_in_process(parse_extracted_text, raw_text, {**stats, **parsed["inspection"]})
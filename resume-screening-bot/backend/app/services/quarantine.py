@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional
+from sqlalchemy import delete, or_, true
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import SessionLocal
+from app.models.models import QuarantinedFile
+from app.services.blob_store import LocalFile, blob_store
+from app.utils.write_queue import write_queue
+
+class Quarantine:
+    """
+    Files that are not parsed: they made a parse worker time out, run out of memory
+    or crash, or they are scanned PDFs without a text layer ("image-only").
+
+    Each entry keeps a blob store reference, so the file stays available for
+    debugging (or a later OCR pass over the image-only ones), and re-uploads of the
+    same bytes are rejected up front instead of tying up a worker again.
+
+    A timeout can also mean the host was busy, so those entries (and memory or crash
+    ones) expire after QUARANTINE_TTL_HOURS; image-only entries are kept. Operators
+    clear entries with release(), also available from the command line.
+    """
+
+    # What a re-upload is told, by reason (default: the parse failure)
+    MESSAGES = {
+        "image-only": "it is a scanned PDF without a text layer; OCR is not supported",
+    }
+    # Reasons that depend only on the file, so retrying can never help
+    PERMANENT = ("image-only",)
+
+    @classmethod
+    def message(cls, reason: str) -> str:
+        return cls.MESSAGES.get(reason, f"parsing it failed before ({reason})")
+
+    @classmethod
+    def _active(cls):
+        """Filter for the entries still in force"""
+        if settings.QUARANTINE_TTL_HOURS <= 0:
+            return true()
+        cutoff = datetime.utcnow() - timedelta(hours=settings.QUARANTINE_TTL_HOURS)
+        return or_(QuarantinedFile.reason.in_(cls.PERMANENT), QuarantinedFile.created_at >= cutoff)
+
+    @classmethod
+    def lookup(cls, sha256s: Iterable[str]) -> Dict[str, str]:
+        """Quarantine reasons for whichever of these blobs are quarantined (expired entries don't count)"""
+        sha256s = list(set(sha256s))
+        if not sha256s:
+            return {}
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(QuarantinedFile.sha256, QuarantinedFile.reason)
+                .filter(QuarantinedFile.sha256.in_(sha256s), cls._active())
+                .all()
+            )
+            return {row.sha256: row.reason for row in rows}
+        finally:
+            db.close()
+
+    @staticmethod
+    def add(sha256: str, source: Optional[LocalFile], filename: str, user_id: Optional[int], reason: str, detail: str):
+        def job(db: Session):
+            blob_store.add_ref(db, sha256, source)
+            db.add(QuarantinedFile(sha256=sha256, filename=filename, user_id=user_id, reason=reason, detail=detail))
+        write_queue.run(job)
+        print(f"Quarantined {filename} ({sha256[:12]}): {reason}: {detail}")
+
+    @staticmethod
+    def _remove(*criteria) -> int:
+        """Delete the matching entries and drop their blob references; returns how many went"""
+        def job(db: Session):
+            rows = db.query(QuarantinedFile.id, QuarantinedFile.sha256).filter(*criteria).all()
+            if not rows:
+                return 0, set()
+            db.execute(delete(QuarantinedFile).where(QuarantinedFile.id.in_([row.id for row in rows])))
+            unreferenced = {row.sha256 for row in rows if row.sha256 and blob_store.release(db, row.sha256)}
+            return len(rows), unreferenced
+
+        removed, unreferenced = write_queue.run(job)
+        for sha256 in unreferenced:
+            blob_store.purge(sha256)
+        return removed
+
+    def release(self, sha256: str) -> int:
+        """Clear every entry for a file, so its next upload is parsed again"""
+        removed = self._remove(QuarantinedFile.sha256 == sha256)
+        if removed:
+            print(f"Released {sha256[:12]} from quarantine ({removed} entries)")
+        return removed
+
+    def sweep(self) -> int:
+        """Remove entries past QUARANTINE_TTL_HOURS (run at startup)"""
+        if settings.QUARANTINE_TTL_HOURS <= 0:
+            return 0
+        cutoff = datetime.utcnow() - timedelta(hours=settings.QUARANTINE_TTL_HOURS)
+        removed = self._remove(
+            QuarantinedFile.reason.not_in(self.PERMANENT), QuarantinedFile.created_at < cutoff
+        )
+        if removed:
+            print(f"Removed {removed} expired quarantine entries")
+        return removed
+
+quarantine = Quarantine()
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect or clear quarantined uploads")
+    parser.add_argument("--list", action="store_true", help="show the entries")
+    parser.add_argument("--release", nargs="+", metavar="SHA256", default=[],
+                        help="clear the entries for these files so they are parsed again")
+    parser.add_argument("--sweep", action="store_true", help="remove expired entries")
+    args = parser.parse_args()
+
+    try:
+        for sha256 in args.release:
+            if not quarantine.release(sha256):
+                print(f"{sha256} is not quarantined")
+        if args.sweep:
+            quarantine.sweep()
+        if args.list:
+            db = SessionLocal()
+            try:
+                active = {row.id for row in db.query(QuarantinedFile.id).filter(Quarantine._active())}
+                for entry in db.query(QuarantinedFile).order_by(QuarantinedFile.id):
+                    state = "active" if entry.id in active else "expired"
+                    print(f"{entry.sha256}  {entry.created_at:%Y-%m-%d %H:%M}  {state:7}  {entry.reason:10}  "
+                          f"{entry.filename}")
+            finally:
+                db.close()
+    finally:
+        write_queue.stop()
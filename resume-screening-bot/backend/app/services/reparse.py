@@ -0,0 +1,261 @@
+"""
+Incremental re-parse of resumes produced by an older PARSER_VERSION or EXTRACTOR_VERSION.
+
+Outdated resumes are walked in id order, a chunk at a time, and parsed again in
+the worker process pool. By default that covers resumes behind PARSER_VERSION,
+parsed again from their stored text. With --from-files it also covers resumes
+whose text came from an older EXTRACTOR_VERSION, and extracts the text from the
+uploaded file again. Only what actually changed is written back - parsed_data,
+the text (which updates the search index), an already-computed ATS score - and
+only resumes whose data changed are re-scored in the match index. Every resume
+gets the current parser_version either way, but extractor_version only when its
+file was actually read again: a text-only pass never marks text as re-extracted.
+
+Progress is checkpointed in maintenance_checkpoints in the same transaction as
+each chunk's updates, so an interrupted run picks up where it stopped.
+
+Runs in the background on startup (REPARSE_ON_STARTUP), or by hand:
+    python -m app.services.reparse [--from-files] [--rate 50]
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+from sqlalchemy import or_, update
+from sqlalchemy.orm import Session, selectinload
+from app.config import settings
+from app.database import SessionLocal
+from app.models.models import Resume, ResumeText, MaintenanceCheckpoint
+from app.services.blob_store import blob_store
+from app.services.match_index import match_index
+from app.services.quarantine import quarantine
+from app.services.resume_parser import EXTRACTOR_VERSION, PARSER_VERSION, parse_resume_file, parse_resume_text
+from app.utils.executors import get_process_pool
+from app.utils.sandbox import ParseAborted
+from app.utils.scoring import ATSScorer
+from app.utils.text_codec import decompress_text
+from app.utils.write_queue import write_queue
+
+class ResumeReparser:
+    CHECKPOINT = "reparse"
+
+    def __init__(self, chunk_size: int = 100, rate_limit: float = 0):
+        self.chunk_size = chunk_size
+        self.rate_limit = rate_limit  # Resumes per second, 0 = unlimited
+        self.ats_scorer = ATSScorer()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, from_files: bool = False):
+        """Run in a daemon thread (from app startup)"""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self.run, args=(from_files,), name="reparse", daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout: float = 10.0):
+        """Finish the current chunk, then stop"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @staticmethod
+    def _outdated(from_files: bool):
+        if from_files:
+            return or_(Resume.parser_version < PARSER_VERSION, Resume.extractor_version < EXTRACTOR_VERSION)
+        return Resume.parser_version < PARSER_VERSION
+
+    @staticmethod
+    def _target(from_files: bool) -> int:
+        """Checkpoint version: a pass of the other kind, or a version bump, starts over"""
+        return EXTRACTOR_VERSION * 1000 + PARSER_VERSION if from_files else PARSER_VERSION
+
+    def outdated_count(self, db: Session, from_files: bool = False) -> int:
+        return db.query(Resume.id).filter(self._outdated(from_files)).count()
+
+    def run(self, from_files: bool = False) -> Dict:
+        """Re-parse every outdated resume; returns counts"""
+        stats = {"checked": 0, "changed": 0, "failed": 0}
+        db = SessionLocal()
+        try:
+            if not from_files:
+                stale = db.query(Resume.id).filter(Resume.extractor_version < EXTRACTOR_VERSION).count()
+                if stale:
+                    print(f"Re-parse: {stale} resumes have text from an older extractor; "
+                          "run with --from-files (REPARSE_FROM_FILES=true) to extract it again")
+            if not self.outdated_count(db, from_files):
+                return stats
+            cursor = self._load_cursor(db, from_files)
+            print(f"Re-parse: bringing resumes up to parser version {PARSER_VERSION}"
+                  f"{f' and extractor version {EXTRACTOR_VERSION}' if from_files else ''} (from id {cursor + 1})")
+            started = time.monotonic()
+            while not self._stop.is_set():
+                rows = self._chunk(db, cursor, from_files)
+                db.commit()  # End the read snapshot while the workers run
+                if not rows:
+                    break
+                results = self._parse(rows, from_files)
+                changed = self._apply(rows, results, stats, from_files)
+                cursor = rows[-1].id
+                if changed:
+                    match_index.refresh_resumes(changed)
+
+                if self.rate_limit > 0:
+                    # Pace the whole run, so a burst of cheap chunks is followed by a pause
+                    ahead = stats["checked"] / self.rate_limit - (time.monotonic() - started)
+                    if ahead > 0:
+                        self._stop.wait(ahead)
+            if self._stop.is_set():
+                print(f"Re-parse: paused after id {cursor}: {stats}")
+                return stats
+
+            # Pass complete: restart from the beginning next time to retry failures
+            write_queue.run(lambda writer: self._save_cursor(writer, 0, from_files))
+            print(f"Re-parse: done in {time.monotonic() - started:.1f} s: {stats}")
+            return stats
+        except Exception as e:
+            db.rollback()
+            print(f"Re-parse failed: {e}")
+            return stats
+        finally:
+            db.close()
+
+    def _chunk(self, db: Session, after_id: int, from_files: bool):
+        return (
+            db.query(
+                Resume.id, Resume.filename, Resume.file_path, Resume.blob_sha256,
+                Resume.parsed_data, Resume.ats_score, ResumeText.codec, ResumeText.data
+            )
+            .outerjoin(ResumeText, ResumeText.resume_id == Resume.id)
+            .filter(self._outdated(from_files), Resume.id > after_id)
+            .order_by(Resume.id)
+            .limit(self.chunk_size)
+            .all()
+        )
+
+    @staticmethod
+    def _source_path(row) -> Optional[str]:
+        """Local copy of the uploaded file, if there is one"""
+        if row.blob_sha256:
+            path = blob_store.backend.local_path(blob_store.key(row.blob_sha256))
+        else:
+            path = row.file_path
+        return path if path and os.path.exists(path) else None
+
+    def _parse(self, rows, from_files: bool) -> List:
+        pool = get_process_pool()
+        # Quarantined files go back to their stored text instead of tying up a worker again
+        quarantined = quarantine.lookup(row.blob_sha256 for row in rows if row.blob_sha256) if from_files else {}
+        futures = []
+        for row in rows:
+            path = self._source_path(row) if from_files and row.blob_sha256 not in quarantined else None
+            if path:
+                futures.append(pool.submit(parse_resume_file, path, Path(row.filename or "").suffix))
+            else:
+                futures.append(pool.submit(parse_resume_text, decompress_text(row.codec, row.data)))
+        results = []
+        for row, future in zip(rows, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                print(f"Re-parse: resume {row.id} failed: {e}")
+                if isinstance(e, ParseAborted) and row.blob_sha256:
+                    quarantine.add(row.blob_sha256, None, row.filename, None, e.reason, e.detail)
+                results.append(None)
+        return results
+
+    def _apply(self, rows, results, stats: Dict, from_files: bool) -> List[int]:
+        """Write back what changed for one chunk; returns the ids whose match scores are stale"""
+        updates = []  # (resume_id, column values, new text or None, data changed)
+        unchanged = []
+        for row, result in zip(rows, results):
+            stats["checked"] += 1
+            if result is None:
+                stats["failed"] += 1
+                continue
+            # Only results of parse_resume_file carry extraction_stats
+            extraction_stats = result.get("extraction_stats")
+            if not result["raw_text"]:
+                # Nothing extracted from the file this time: keep the stored text
+                result = parse_resume_text(decompress_text(row.codec, row.data))
+
+            values = {}
+            # Compare as stored JSON, so tuples vs lists never count as a change
+            parsed_data = json.loads(json.dumps(result["parsed_data"]))
+            if parsed_data != row.parsed_data:
+                values["parsed_data"] = parsed_data
+                if row.ats_score:
+                    # Only refresh scores that were computed before (0 means never scored)
+                    ats_score = self.ats_scorer.calculate_ats_score(parsed_data)
+                    if ats_score != row.ats_score:
+                        values["ats_score"] = ats_score
+            text = result["raw_text"]
+            if text == decompress_text(row.codec, row.data):
+                text = None
+
+            changed = bool(values) or text is not None
+            if extraction_stats is not None:
+                # Re-read from the file: record how, without counting it as a change
+                values["extraction_stats"] = extraction_stats
+                values["extractor_version"] = EXTRACTOR_VERSION
+            if values or text is not None:
+                updates.append((row.id, values, text, changed))
+            else:
+                unchanged.append(row.id)
+
+        cursor = rows[-1].id
+
+        def job(writer: Session):
+            if unchanged:
+                writer.execute(
+                    update(Resume).where(Resume.id.in_(unchanged)).values(parser_version=PARSER_VERSION)
+                )
+            for resume_id, values, text, _ in updates:
+                writer.execute(
+                    update(Resume).where(Resume.id == resume_id).values(parser_version=PARSER_VERSION, **values)
+                )
+                if text is not None:
+                    # Through the ORM so the search index hooks see the new text
+                    resume = writer.get(Resume, resume_id, options=[selectinload(Resume.text_record)])
+                    resume.raw_text = text
+            self._save_cursor(writer, cursor, from_files)
+
+        write_queue.run(job)
+        changed_ids = [resume_id for resume_id, _, _, changed in updates if changed]
+        stats["changed"] += len(changed_ids)
+        return changed_ids
+
+    def _load_cursor(self, db: Session, from_files: bool) -> int:
+        checkpoint = db.get(MaintenanceCheckpoint, self.CHECKPOINT)
+        if checkpoint is None or checkpoint.version != self._target(from_files):
+            return 0
+        return checkpoint.cursor or 0
+
+    def _save_cursor(self, db: Session, cursor: int, from_files: bool):
+        checkpoint = db.get(MaintenanceCheckpoint, self.CHECKPOINT)
+        if checkpoint is None:
+            db.add(MaintenanceCheckpoint(name=self.CHECKPOINT, version=self._target(from_files), cursor=cursor))
+        else:
+            checkpoint.version, checkpoint.cursor = self._target(from_files), cursor
+
+reparser = ResumeReparser(chunk_size=settings.REPARSE_CHUNK_SIZE, rate_limit=settings.REPARSE_RATE_LIMIT)
+
+if __name__ == "__main__":
+    import argparse
+    from app.utils.executors import shutdown_executors
+
+    parser = argparse.ArgumentParser(description="Re-parse resumes written by an older parser version")
+    parser.add_argument("--from-files", action="store_true", help="extract text from the uploaded files again")
+    parser.add_argument("--chunk", type=int, default=settings.REPARSE_CHUNK_SIZE)
+    parser.add_argument("--rate", type=float, default=0, help="resumes per second (default: unlimited)")
+    args = parser.parse_args()
+
+    try:
+        ResumeReparser(chunk_size=args.chunk, rate_limit=args.rate).run(from_files=args.from_files)
+    finally:
+        shutdown_executors()
+        write_queue.stop()
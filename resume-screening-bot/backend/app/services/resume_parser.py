@@ -1,8 +1,10 @@
-import PyPDF2
-import pdfplumber
-from docx import Document
 from pathlib import Path
+from typing import Optional, Tuple
 import re
+import time
+from app.services.text_processor import TextPreprocessor
+from app.services.pdf_extraction import pdf_extractor
+from app.services.docx_extraction import iter_docx_lines
 
 class ResumeParser:
     """Parse resumes from PDF, DOCX, and text files"""
@@ -10,45 +12,49 @@ class ResumeParser:
     @staticmethod
     def extract_text_from_pdf(file_path: str) -> str:
         """Extract text from PDF file"""
-        text = ""
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    text += page.extract_text() or ""
-        except Exception as e:
-            print(f"Error extracting PDF: {e}")
-        return text
+        return ResumeParser.extract_text_with_stats(file_path, ".pdf")[0]
     
     @staticmethod
     def extract_text_from_docx(file_path: str) -> str:
-        """Extract text from DOCX file"""
-        text = ""
+        """Extract text from DOCX file (streamed, in document order; see app.services.docx_extraction)"""
+        parts = []
         try:
-            doc = Document(file_path)
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-            for table in doc.tables:
-                for row in table.rows:
-                    for cell in row.cells:
-                        text += cell.text + " "
+            for line in iter_docx_lines(file_path):
+                parts.append(line + "\n")
+        except MemoryError:
+            raise  # Let the parse sandbox quarantine the file
         except Exception as e:
             print(f"Error extracting DOCX: {e}")
-        return text
+        return "".join(parts)
+    
+    @staticmethod
+    def extract_text_from_file(file_path: str, file_extension: Optional[str] = None) -> str:
+        """Extract text from various file formats (blob store paths have no suffix, so pass the extension)"""
+        return ResumeParser.extract_text_with_stats(file_path, file_extension)[0]
     
     @staticmethod
-    def extract_text_from_file(file_path: str) -> str:
-        """Extract text from various file formats"""
-        file_extension = Path(file_path).suffix.lower()
+    def extract_text_with_stats(file_path: str, file_extension: Optional[str] = None) -> Tuple[str, dict]:
+        """Extract text plus how it was extracted (strategy, quality scores, timings)"""
+        file_extension = (file_extension or Path(file_path).suffix).lower()
         
         if file_extension == ".pdf":
-            return ResumeParser.extract_text_from_pdf(file_path)
-        elif file_extension in [".docx", ".doc"]:
-            return ResumeParser.extract_text_from_docx(file_path)
+            try:
+                return pdf_extractor.extract(file_path)
+            except MemoryError:
+                raise  # Let the parse sandbox quarantine the file
+            except Exception as e:
+                print(f"Error extracting PDF: {e}")
+                return "", {"format": "pdf", "error": str(e)}
+        
+        started = time.perf_counter()
+        if file_extension in [".docx", ".doc"]:
+            text = ResumeParser.extract_text_from_docx(file_path)
         elif file_extension == ".txt":
             with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+                text = f.read()
         else:
             raise ValueError(f"Unsupported file format: {file_extension}")
+        return text, {"format": file_extension.lstrip("."), "ms": round((time.perf_counter() - started) * 1000, 1)}
     
     @staticmethod
     def parse_resume_structure(text: str) -> dict:
@@ -135,10 +141,72 @@ class ResumeParser:
             parsed[current_section].extend(section_content)
         
         # Post-process sections
-        parsed["technical_skills"] = list(set([s for s in parsed["technical_skills"] if len(s) > 1]))[:50]
+        parsed["technical_skills"] = list(dict.fromkeys(s for s in parsed["technical_skills"] if len(s) > 1))[:50]
         
         # Clean up experience and projects (remove very short entries)
         parsed["experience"] = [e for e in parsed["experience"] if len(e) > 10]
         parsed["projects"] = [p for p in parsed["projects"] if len(p) > 10]
         
         return parsed
+
+
+# Bump whenever parse_resume_structure or skill extraction changes what they make
+# of a resume's text; resumes parsed by an older version are re-parsed from their
+# stored text in the background (see app.services.reparse).
+PARSER_VERSION = 3
+# Bump whenever text extraction from files changes (2: PyPDF2 fast path, 3: DOCX
+# iterparse); only a re-parse --from-files brings resumes up to it.
+EXTRACTOR_VERSION = 3
+
+_preprocessor = None
+
+def parse_resume_file(file_path: str, file_extension: Optional[str] = None, split_pages: int = 0) -> dict:
+    """
+    Extract text, structure and skills from one resume file.
+    
+    Top-level (picklable) so upload routes can run it in a worker process.
+    Returns {"raw_text": "", ...} when no text could be extracted; for a scanned
+    or blank PDF that is decided up front, and extraction_stats["content"] says
+    "image-only" or "empty". With split_pages, a PDF with more pages than that is
+    left alone and {"split": page_count, "inspection": {...}} comes back instead,
+    for the caller to extract page ranges in parallel (see app.services.page_parallel).
+    """
+    file_extension = (file_extension or Path(file_path).suffix).lower()
+    inspection = {}
+    if file_extension == ".pdf":
+        try:
+            inspection = pdf_extractor.inspect(file_path)
+        except MemoryError:
+            raise
+        except Exception:
+            pass  # Let the regular path report the error
+        if inspection.get("content") in ("image-only", "empty"):
+            # No text layer: skip the extraction work
+            return parse_extracted_text("", {"format": "pdf", **inspection})
+        if split_pages and inspection.get("pages", 0) > split_pages:
+            return {"split": inspection["pages"], "inspection": inspection}
+    raw_text, extraction_stats = ResumeParser.extract_text_with_stats(file_path, file_extension)
+    return parse_extracted_text(raw_text, {**extraction_stats, **inspection})
+
+def extract_pdf_pages(file_path: str, first_page: int, last_page: int) -> Tuple[str, dict]:
+    """Text and extraction stats for one page range of a PDF (worker task)"""
+    return pdf_extractor.extract(file_path, first_page, last_page)
+
+def parse_extracted_text(raw_text: str, extraction_stats: dict) -> dict:
+    """parse_resume_file's result for text that was extracted separately"""
+    if not raw_text:
+        return {"raw_text": "", "parsed_data": None, "skills": [], "extraction_stats": extraction_stats}
+    return {**parse_resume_text(raw_text), "extraction_stats": extraction_stats}
+
+def parse_resume_text(raw_text: str) -> dict:
+    """Structure and skills for already-extracted resume text (same result shape as parse_resume_file)"""
+    global _preprocessor
+    parsed_data = ResumeParser.parse_resume_structure(raw_text)
+    
+    # One preprocessor per worker process instead of one per file
+    if _preprocessor is None:
+        _preprocessor = TextPreprocessor()
+    skills = _preprocessor.extract_skills(raw_text)
+    parsed_data["technical_skills"] = skills
+    
+    return {"raw_text": raw_text, "parsed_data": parsed_data, "skills": skills}
@@ -0,0 +1,288 @@
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from nltk.stem.porter import PorterStemmer
+from sqlalchemy import DateTime, bindparam, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.models import ResumeText
+from app.utils.text_codec import decompress_text
+
+# Keeps skills like c++, c#, node.js and ci/cd as single search terms
+TERM_PATTERN = re.compile(r"[\w][\w+#./-]*")
+# Tokens as FTS5's unicode61 tokenizer sees them, for building snippets
+WORD_PATTERN = re.compile(r"[^\W_]+")
+# Tokens per snippet, as in FTS5's snippet()
+SNIPPET_TOKENS = 24
+
+# A contentless FTS5 index: it holds terms only (the text stays compressed in
+# resume_texts) and the application writes it with text decompressed in Python, so
+# nothing in the schema calls back into application code and any SQLite client can
+# write resume_texts. Rows written behind the application's back are picked up by
+# ensure_index() at the next startup.
+SQLITE_SCHEMA = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS resumes_fts USING fts5(
+        raw_text, content='', tokenize='porter unicode61'
+    )
+    """,
+]
+
+# Earlier versions indexed resumes.raw_text, then a decompressing view, through triggers
+SQLITE_LEGACY = [
+    "DROP TRIGGER IF EXISTS resumes_fts_insert",
+    "DROP TRIGGER IF EXISTS resumes_fts_delete",
+    "DROP TRIGGER IF EXISTS resumes_fts_update",
+    "DROP TABLE IF EXISTS resumes_fts",
+    "DROP VIEW IF EXISTS resumes_fts_content",
+]
+
+# Postgres cannot decompress the text itself either: the application writes search_vector
+POSTGRES_SCHEMA = [
+    "ALTER TABLE resumes DROP COLUMN IF EXISTS search_vector",
+    "ALTER TABLE resume_texts ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    "CREATE INDEX IF NOT EXISTS ix_resume_texts_search_vector ON resume_texts USING GIN (search_vector)",
+]
+
+_stemmer = PorterStemmer(mode=PorterStemmer.ORIGINAL_ALGORITHM)
+
+@lru_cache(maxsize=65536)
+def _stem(word: str) -> str:
+    return _stemmer.stem(word.lower())
+
+class ResumeSearch:
+    """
+    Keyword search over resume text.
+
+    SQLite uses a contentless FTS5 index ranked by bm25 (FTS5's rank column); Postgres
+    a GIN-indexed tsvector column on resume_texts, ranked with ts_rank_cd(). Either way
+    the application writes the index: ORM hooks on ResumeText cover single-row writes,
+    and bulk writers that insert resume_texts directly call index() themselves.
+    """
+
+    SNIPPET_OPEN = "<mark>"
+    SNIPPET_CLOSE = "</mark>"
+
+    def __init__(self):
+        self.dialect = None  # Set by ensure_index(); None means search is unavailable
+
+    def ensure_index(self, engine: Engine):
+        """Create the index, and bring it up to date with resume_texts"""
+        name = engine.dialect.name
+        if name not in ("sqlite", "postgresql"):
+            print(f"Resume search: full-text search not supported on {name}")
+            return
+        try:
+            with engine.begin() as conn:
+                if name == "sqlite":
+                    existing = conn.execute(
+                        text("SELECT sql FROM sqlite_master WHERE name = 'resumes_fts'")
+                    ).scalar()
+                    if existing and "content=''" not in existing:
+                        for statement in SQLITE_LEGACY:
+                            conn.execute(text(statement))
+                    for statement in SQLITE_SCHEMA:
+                        conn.execute(text(statement))
+                else:
+                    for statement in POSTGRES_SCHEMA:
+                        conn.execute(text(statement))
+                self.dialect = name
+                if name == "sqlite":
+                    self._reconcile_sqlite(conn)
+                else:
+                    self._backfill_postgres(conn)
+            for hook_name, hook in (("after_insert", self._after_write), ("after_update", self._after_write),
+                                    ("before_update", self._before_change), ("before_delete", self._before_change)):
+                if not event.contains(ResumeText, hook_name, hook):
+                    event.listen(ResumeText, hook_name, hook)
+        except Exception as e:
+            self.dialect = None
+            print(f"Resume search: could not create full-text index: {e}")
+
+    def index(self, connection, rows: Iterable[Tuple[int, str]]):
+        """Index (resume_id, text) pairs of new resume_texts rows written without the ORM"""
+        rows = [{"id": resume_id, "doc": doc} for resume_id, doc in rows]
+        if not rows or self.dialect is None:
+            return
+        if self.dialect == "sqlite":
+            connection.execute(text("INSERT INTO resumes_fts(rowid, raw_text) VALUES (:id, :doc)"), rows)
+        else:
+            connection.execute(
+                text("UPDATE resume_texts SET search_vector = to_tsvector('english', :doc) WHERE resume_id = :id"),
+                rows
+            )
+
+    def _after_write(self, mapper, connection, target):
+        self.index(connection, [(target.resume_id, decompress_text(target.codec, target.data))])
+
+    def _before_change(self, mapper, connection, target):
+        # Postgres vectors live on the row itself; FTS5 needs the indexed text to drop an entry
+        if self.dialect == "sqlite":
+            self._unindex_sqlite(connection, [target.resume_id])
+
+    @staticmethod
+    def _unindex_sqlite(connection, resume_ids: List[int]):
+        """Drop index entries, using the stored text (a contentless index cannot look it up)"""
+        rows = connection.execute(text("""
+            SELECT resume_id, codec, data FROM resume_texts
+            WHERE resume_id IN :ids AND resume_id IN (SELECT rowid FROM resumes_fts WHERE rowid IN :ids)
+        """).bindparams(bindparam("ids", expanding=True)), {"ids": resume_ids}).all()
+        if rows:
+            connection.execute(
+                text("INSERT INTO resumes_fts(resumes_fts, rowid, raw_text) VALUES ('delete', :id, :doc)"),
+                [{"id": r.resume_id, "doc": decompress_text(r.codec, r.data)} for r in rows]
+            )
+
+    def _reconcile_sqlite(self, conn, batch_size: int = 500):
+        """Index resume_texts rows that are missing from the index; rebuild if it has entries
+        for deleted rows (their text is gone, so they cannot be dropped one by one)"""
+        indexed = {rowid for (rowid,) in conn.execute(text("SELECT rowid FROM resumes_fts"))}
+        stored = [resume_id for (resume_id,) in conn.execute(text("SELECT resume_id FROM resume_texts ORDER BY resume_id"))]
+        if indexed - set(stored):
+            conn.execute(text("INSERT INTO resumes_fts(resumes_fts) VALUES ('delete-all')"))
+            indexed = set()
+        missing = [resume_id for resume_id in stored if resume_id not in indexed]
+        for start in range(0, len(missing), batch_size):
+            rows = conn.execute(
+                text("SELECT resume_id, codec, data FROM resume_texts WHERE resume_id IN :ids").bindparams(
+                    bindparam("ids", expanding=True)
+                ), {"ids": missing[start:start + batch_size]}
+            ).all()
+            self.index(conn, [(r.resume_id, decompress_text(r.codec, r.data)) for r in rows])
+        if missing:
+            print(f"Resume search: indexed {len(missing)} resume texts")
+
+    def _backfill_postgres(self, conn, batch_size: int = 500):
+        """Vectorize rows written without the application (e.g. by move_inline_resume_text)"""
+        while True:
+            rows = conn.execute(text(
+                "SELECT resume_id, codec, data FROM resume_texts WHERE search_vector IS NULL LIMIT :n"
+            ), {"n": batch_size}).all()
+            if not rows:
+                return
+            self.index(conn, [(r.resume_id, decompress_text(r.codec, r.data)) for r in rows])
+
+    @staticmethod
+    def terms(query: str) -> List[str]:
+        return TERM_PATTERN.findall(query.lower())
+
+    async def search(
+        self,
+        db: AsyncSession,
+        query: str,
+        match_all: bool = True,
+        user_id: Optional[int] = None,
+        limit: int = 20,
+        offset: int = 0
+    ) -> Dict:
+        """Ranked matches with highlighted snippets, plus the total number of matches"""
+        terms = self.terms(query)
+        if not terms:
+            return {"total": 0, "results": []}
+        if self.dialect == "sqlite":
+            return await self._search_sqlite(db, terms, match_all, user_id, limit, offset)
+        return await self._search_postgres(db, terms, match_all, user_id, limit, offset)
+
+    async def _search_sqlite(self, db, terms, match_all, user_id, limit, offset) -> Dict:
+        # Quote every term so user input is never parsed as FTS5 query syntax
+        match = (" AND " if match_all else " OR ").join('"' + t.replace('"', '""') + '"' for t in terms)
+        params = {"match": match, "user_id": user_id, "limit": limit, "offset": offset}
+        if user_id is None:
+            # Without an owner filter the count never leaves the FTS index
+            hits = "SELECT rowid AS id, rank FROM resumes_fts WHERE resumes_fts MATCH :match"
+        else:
+            hits = """
+                SELECT resumes_fts.rowid AS id, resumes_fts.rank FROM resumes_fts
+                JOIN resumes r ON r.id = resumes_fts.rowid
+                WHERE resumes_fts MATCH :match AND r.user_id = :user_id
+            """
+
+        total = (await db.execute(text(f"SELECT count(*) FROM ({hits})"), params)).scalar_one()
+        # Rank with FTS5's built-in bm25 "rank" column, then build snippets for the page only
+        rows = (await db.execute(self._typed(f"""
+            SELECT r.id, r.filename, r.uploaded_at, r.ats_score, -page.rank AS score, t.codec, t.data
+            FROM ({hits} ORDER BY rank, id LIMIT :limit OFFSET :offset) page
+            JOIN resumes r ON r.id = page.id
+            LEFT JOIN resume_texts t ON t.resume_id = page.id
+            ORDER BY page.rank, page.id
+        """), params)).all()
+        # The index holds no text: snippets come from the page's decompressed text only
+        return {
+            "total": total,
+            "results": [{**self._row(r), "snippet": self.snippet(decompress_text(r.codec, r.data), terms)} for r in rows]
+        }
+
+    async def _search_postgres(self, db, terms, match_all, user_id, limit, offset) -> Dict:
+        tsquery = (" && " if match_all else " || ").join(f"plainto_tsquery('english', :t{i})" for i in range(len(terms)))
+        owner = "AND r.user_id = :user_id" if user_id is not None else ""
+        params = {f"t{i}": t for i, t in enumerate(terms)}
+        params.update({"user_id": user_id, "limit": limit, "offset": offset})
+
+        total = (await db.execute(text(f"""
+            SELECT count(*) FROM resume_texts t JOIN resumes r ON r.id = t.resume_id
+            WHERE t.search_vector @@ ({tsquery}) {owner}
+        """), params)).scalar_one()
+        rows = (await db.execute(self._typed(f"""
+            SELECT r.id, r.filename, r.uploaded_at, r.ats_score, t.codec, t.data,
+                   ts_rank_cd(t.search_vector, {tsquery}) AS score
+            FROM resume_texts t JOIN resumes r ON r.id = t.resume_id
+            WHERE t.search_vector @@ ({tsquery}) {owner}
+            ORDER BY score DESC, r.id
+            LIMIT :limit OFFSET :offset
+        """), params)).all()
+
+        # Headlines need the plain text, which only the application can decompress
+        options = f"StartSel={self.SNIPPET_OPEN}, StopSel={self.SNIPPET_CLOSE}, MaxWords=35, MinWords=15"
+        results = []
+        for row in rows:
+            snippet = (await db.execute(
+                text(f"SELECT ts_headline('english', :doc, {tsquery}, :options)"),
+                {**params, "doc": decompress_text(row.codec, row.data), "options": options}
+            )).scalar()
+            results.append({**self._row(row), "snippet": snippet})
+        return {"total": total, "results": results}
+
+    def snippet(self, doc: str, terms: List[str]) -> str:
+        """Like FTS5's snippet(): the SNIPPET_TOKENS tokens around the most matches, matches marked"""
+        stems = {_stem(word) for term in terms for word in WORD_PATTERN.findall(term)}
+        tokens = list(WORD_PATTERN.finditer(doc))
+        if not tokens:
+            return ""
+        hits = [i for i, token in enumerate(tokens) if _stem(token.group()) in stems]
+        start, best = 0, 0
+        for hit in hits:
+            # A little context before the first match of the window
+            candidate = max(0, min(hit - 2, len(tokens) - SNIPPET_TOKENS))
+            found = sum(1 for h in hits if candidate <= h < candidate + SNIPPET_TOKENS)
+            if found > best:
+                start, best = candidate, found
+        end = min(len(tokens), start + SNIPPET_TOKENS)
+        marked = set(hits)
+        parts = ["…"] if start > 0 else []
+        position = tokens[start].start()
+        for i in range(start, end):
+            token = tokens[i]
+            parts.append(doc[position:token.start()])
+            parts.append(f"{self.SNIPPET_OPEN}{token.group()}{self.SNIPPET_CLOSE}" if i in marked else token.group())
+            position = token.end()
+        if end < len(tokens):
+            parts.append("…")
+        return "".join(parts)
+
+    @staticmethod
+    def _typed(sql: str):
+        """Raw SQL whose uploaded_at comes back as a datetime on every driver"""
+        return text(sql).columns(uploaded_at=DateTime)
+
+    @staticmethod
+    def _row(row) -> Dict:
+        return {
+            "resume_id": row.id,
+            "filename": row.filename,
+            "uploaded_at": row.uploaded_at,
+            "ats_score": row.ats_score,
+            "score": round(float(row.score), 4),
+            "snippet": getattr(row, "snippet", None)
+        }
+
+resume_search = ResumeSearch()
@@ -0,0 +1,140 @@
+"""
+Batched inserts of new resumes.
+
+Letting the ORM flush a batch of resumes costs a round trip per row: SQLite has
+no way to match rows of a multi-row INSERT ... RETURNING to their parameters, so
+SQLAlchemy inserts them one at a time, and blob references took a lookup and a
+write per file on top. insert_resumes() writes a batch in a handful of
+statements instead:
+
+- blob references through blob_store.add_refs();
+- one INSERT ... VALUES (...), (...) RETURNING id per chunk of resumes. SQLite
+  hands out the rowids of one statement in VALUES order, so the returned ids,
+  sorted, line up with the rows. Other databases use SQLAlchemy's
+  sort_by_parameter_order, and ones without RETURNING fall back to the ORM;
+- one executemany INSERT of the compressed texts, and one of their search
+  index entries (resume_search.index()).
+
+ResumeWriter also sizes transactions: it measures how long each row takes to
+write and splits large batches so that one write job holds the single writer
+for about INSERT_BATCH_TARGET_MS.
+"""
+
+import time
+from typing import List, Optional
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.models import Resume, ResumeText
+from app.services.blob_store import LocalFile, blob_store
+from app.services.resume_search import resume_search
+from app.utils.write_queue import write_queue
+
+# Rows per INSERT statement, well under SQLite's bound-parameter limit
+ROWS_PER_STATEMENT = 500
+
+def _row(resume: Resume) -> dict:
+    """Column values of a new resume, with column defaults filled in (every row needs the same keys)"""
+    values = {}
+    for column in Resume.__table__.columns:
+        if column.primary_key:
+            continue
+        value = getattr(resume, column.key)
+        if value is None and column.default is not None:
+            value = column.default.arg(None) if column.default.is_callable else column.default.arg
+        values[column.key] = value
+    return values
+
+def _insert_rows(db: Session, rows: List[dict]) -> Optional[List[int]]:
+    table = Resume.__table__
+    dialect = db.get_bind().dialect
+    if dialect.name == "sqlite" and dialect.insert_returning:
+        ids = []
+        for start in range(0, len(rows), ROWS_PER_STATEMENT):
+            chunk = rows[start:start + ROWS_PER_STATEMENT]
+            ids.extend(sorted(db.execute(insert(table).values(chunk).returning(table.c.id)).scalars()))
+        return ids
+    if dialect.insert_returning:
+        return list(db.execute(insert(table).returning(table.c.id, sort_by_parameter_order=True), rows).scalars())
+    return None
+
+def insert_resumes(db: Session, resumes: List[Resume], sources: List[LocalFile]) -> List[int]:
+    """Write-job body: insert resumes with a blob reference for each of their (staged) files; returns their ids"""
+    if not resumes:
+        return []
+    blob_store.add_refs(db, sources)
+    ids = _insert_rows(db, [_row(resume) for resume in resumes])
+    if ids is None:
+        db.add_all(resumes)
+        db.flush()
+        return [resume.id for resume in resumes]
+    texts = [(resume, resume_id) for resume, resume_id in zip(resumes, ids) if resume.text_record is not None]
+    if texts:
+        db.execute(insert(ResumeText), [
+            {"resume_id": resume_id, "codec": resume.text_record.codec, "data": resume.text_record.data,
+             "size": resume.text_record.size}
+            for resume, resume_id in texts
+        ])
+        # Core inserts skip the ORM hooks that keep the search index in step
+        resume_search.index(db, [(resume_id, resume.raw_text) for resume, resume_id in texts])
+    return ids
+
+class ResumeWriter:
+    MIN_BATCH = 10
+    MAX_BATCH = 2000
+
+    def __init__(self, target_ms: float = 100):
+        self.target = target_ms / 1000
+        self.row_seconds = None  # Moving average of the write time per row
+
+    @property
+    def batch_size(self) -> int:
+        """Rows per write job, so that one job takes about target_ms"""
+        if not self.row_seconds:
+            return self.MIN_BATCH * 10
+        return max(self.MIN_BATCH, min(self.MAX_BATCH, int(self.target / self.row_seconds)))
+
+    def _observe(self, rows: int, seconds: float):
+        per_row = seconds / rows
+        self.row_seconds = per_row if self.row_seconds is None else 0.7 * self.row_seconds + 0.3 * per_row
+
+    def _job(self, resumes: List[Resume], sources: List[LocalFile]):
+        def job(db: Session) -> List[int]:
+            started = time.perf_counter()
+            ids = insert_resumes(db, resumes, sources)
+            self._observe(len(resumes), time.perf_counter() - started)
+            return ids
+        return job
+
+    def _chunks(self, resumes: List[Resume], sources: List[LocalFile]):
+        start = 0
+        while start < len(resumes):
+            # Re-read each time: the first chunk's timing already shapes the second
+            end = start + self.batch_size
+            yield resumes[start:end], sources[start:end]
+            start = end
+
+    @staticmethod
+    def _assign(resumes: List[Resume], ids: List[int]):
+        # Only once committed: a failed commit must not leave ids on the objects
+        for resume, resume_id in zip(resumes, ids):
+            resume.id = resume_id
+
+    def insert(self, resumes: List[Resume], sources: List[LocalFile]) -> List[int]:
+        """Insert through the write queue, one transaction per chunk; sets resume.id on committed rows"""
+        ids = []
+        for chunk, chunk_sources in self._chunks(resumes, sources):
+            chunk_ids = write_queue.run(self._job(chunk, chunk_sources))
+            self._assign(chunk, chunk_ids)
+            ids.extend(chunk_ids)
+        return ids
+
+    async def insert_async(self, resumes: List[Resume], sources: List[LocalFile]) -> List[int]:
+        ids = []
+        for chunk, chunk_sources in self._chunks(resumes, sources):
+            chunk_ids = await write_queue.run_async(self._job(chunk, chunk_sources))
+            self._assign(chunk, chunk_ids)
+            ids.extend(chunk_ids)
+        return ids
+
+resume_writer = ResumeWriter(target_ms=settings.INSERT_BATCH_TARGET_MS)
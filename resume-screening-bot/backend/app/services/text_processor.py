@@ -136,4 +136,4 @@ class TextPreprocessor:
             if skill in text_lower:
                 found_skills.append(skill)
         
-        return list(set(found_skills))  # Remove duplicates
+        return list(dict.fromkeys(found_skills))  # Remove duplicates, keep a stable order
@@ -0,0 +1,308 @@
+"""
+Resumable chunked uploads.
+
+A 200-file bulk upload over a flaky connection fails all-or-nothing. An upload
+session declares its files up front instead; each file is then sent in chunks
+with byte offsets, the client can ask how much of every file the server holds,
+resends from there after a dropped connection, and finally commits.
+
+Chunks are appended to one part file per declared file under
+<staging dir>/sessions/<session id>/, so the bytes received are just the part
+file's size: a request that dies mid-chunk loses nothing already written, and
+no database write happens per chunk. Each file is handed to the parse pipeline
+the moment its last byte arrives, while the rest of the batch is still
+uploading; commit waits for whatever is still parsing and reports the outcome.
+
+Sessions expire UPLOAD_SESSION_TTL_HOURS after they are opened: the routes refuse
+them from then on, and the next session opened sweeps them away. Chunk locks and
+parse tasks live in the server process and are only touched from its event loop,
+so a session's requests are expected to reach the same process; files a restart
+left unparsed are parsed at commit.
+"""
+
+import asyncio
+import os
+import secrets
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from sqlalchemy import delete, update
+from sqlalchemy.orm import Session, selectinload
+from app.config import settings
+from app.database import SessionLocal
+from app.models.models import UploadSession, UploadSessionFile
+from app.services.blob_store import CHUNK_SIZE, blob_store
+from app.utils.executors import run_blocking
+from app.utils.write_queue import write_queue
+
+class ChunkRejected(ValueError):
+    """A chunk that does not continue the file: it starts past the received bytes or runs past its size"""
+
+    def __init__(self, message: str, received: int):
+        super().__init__(message)
+        self.received = received
+
+class SessionGone(Exception):
+    """A chunk for a session that was removed (expired or deleted) or closed while it was sent"""
+
+class UploadSessions:
+    def __init__(self):
+        self._locks: Dict[int, asyncio.Lock] = {}  # One chunk writer per file
+        self._tasks: Dict[int, asyncio.Task] = {}  # Parse task per file, kept until its session is closed
+        self._removing: Set[str] = set()  # Sessions being removed: their chunks are refused
+
+    @staticmethod
+    def directory(session_id: str) -> str:
+        # Next to staged uploads, so completed files are hard-linked into the blob store
+        return os.path.join(blob_store.backend.staging_dir() or tempfile.gettempdir(), "sessions", session_id)
+
+    def part_path(self, file: UploadSessionFile) -> str:
+        return os.path.join(self.directory(file.session_id), f"{file.id}{Path(file.filename).suffix.lower()}")
+
+    def received(self, file: UploadSessionFile) -> int:
+        try:
+            return os.path.getsize(self.part_path(file))
+        except FileNotFoundError:
+            return 0
+
+    @staticmethod
+    def validate(filename: str, size: int) -> Optional[str]:
+        """Why a declared file is refused, if it is: the checks of a single upload"""
+        extension = Path(filename).suffix.lower()
+        if extension.lstrip(".") not in settings.ALLOWED_EXTENSIONS:
+            return f"Invalid file type '{extension}'"
+        if size <= 0:
+            return "File is empty"
+        if size > settings.MAX_UPLOAD_SIZE:
+            return f"File exceeds {settings.MAX_UPLOAD_SIZE // (1024 * 1024)} MB"
+        return None
+
+    def open(self, user_id: Optional[int], specs: List[Tuple[str, int]]) -> UploadSession:
+        """Start a session for these (filename, size) files"""
+        session_id = secrets.token_hex(16)
+        files = []
+        for filename, size in specs:
+            error = self.validate(filename, size)
+            files.append(UploadSessionFile(filename=filename, size=size, error=error,
+                                           status="rejected" if error else "receiving"))
+
+        def job(db: Session):
+            db.add(UploadSession(id=session_id, user_id=user_id, files=files))
+        write_queue.run(job)
+        os.makedirs(self.directory(session_id), exist_ok=True)
+        return self.get(session_id)
+
+    @staticmethod
+    def get(session_id: str) -> Optional[UploadSession]:
+        db = SessionLocal()
+        try:
+            return (
+                db.query(UploadSession)
+                .options(selectinload(UploadSession.files))
+                .filter(UploadSession.id == session_id)
+                .first()
+            )
+        finally:
+            db.close()
+
+    @staticmethod
+    def expires_at(session: UploadSession) -> datetime:
+        return session.created_at + timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+
+    def expired(self, session: UploadSession) -> bool:
+        return datetime.utcnow() >= self.expires_at(session)
+
+    def describe(self, session: UploadSession) -> dict:
+        return {
+            "session_id": session.id,
+            "status": session.status,
+            "expires_at": self.expires_at(session).isoformat(),
+            "files": [
+                {
+                    "id": file.id,
+                    "filename": file.filename,
+                    "size": file.size,
+                    "received": self._received_for(file),
+                    "status": file.status,
+                    "resume_id": file.resume_id,
+                    "error": file.error,
+                }
+                for file in session.files
+            ],
+        }
+
+    def _received_for(self, file: UploadSessionFile) -> int:
+        if file.status == "receiving":
+            return self.received(file)
+        # Part files go once parsed; refused and abandoned files never count
+        return file.size if file.status in ("parsing", "done", "failed") else 0
+
+    async def write(self, file: UploadSessionFile, offset: int, body: AsyncIterator[bytes],
+                    on_complete: Callable[[], Awaitable]) -> int:
+        """
+        Append a chunk that starts at offset; returns the bytes now received.
+
+        Bytes the server already has are skipped, so resending a chunk whose
+        response was lost is harmless. Once the file is complete, on_complete()
+        is started as its parse task.
+        """
+        async with self._locks.setdefault(file.id, asyncio.Lock()):
+            if file.session_id in self._removing:
+                raise SessionGone()
+            received = self.received(file)
+            if offset > received:
+                raise ChunkRejected(f"Chunk starts at {offset} but only {received} bytes were received", received)
+            skip = received - offset
+            buffer = bytearray()
+            try:
+                part = open(self.part_path(file), "ab")
+            except FileNotFoundError:
+                # The session directory is gone: removed after this request looked the session up
+                raise SessionGone()
+            with part:
+                try:
+                    async for chunk in body:
+                        if skip:
+                            dropped = min(skip, len(chunk))
+                            chunk, skip = chunk[dropped:], skip - dropped
+                        if received + len(buffer) + len(chunk) > file.size:
+                            raise ChunkRejected(f"Chunk runs past the declared size of {file.size} bytes",
+                                                received + len(buffer))
+                        buffer += chunk
+                        if len(buffer) >= CHUNK_SIZE:
+                            await run_blocking(part.write, bytes(buffer))
+                            received += len(buffer)
+                            buffer.clear()
+                finally:
+                    # Whatever arrived in order is kept, even if the connection dropped
+                    if buffer:
+                        await run_blocking(part.write, bytes(buffer))
+                        received += len(buffer)
+            if received == file.size and file.id not in self._tasks:
+                self.start(file, on_complete)
+            return received
+
+    def start(self, file: UploadSessionFile, parse: Callable[[], Awaitable]):
+        self._tasks[file.id] = asyncio.create_task(parse())
+
+    def pending(self, session: UploadSession) -> List[UploadSessionFile]:
+        """Complete files without a parse task in this process (a restart dropped it, or it never ran)"""
+        return [
+            file for file in session.files
+            if file.status in ("receiving", "parsing") and file.id not in self._tasks
+            and self.received(file) == file.size
+        ]
+
+    async def wait(self, session: UploadSession):
+        """Until every parse task of the session has finished"""
+        tasks = [self._tasks[file.id] for file in session.files if file.id in self._tasks]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    @staticmethod
+    def set_status(file_id: int, status: str, resume_id: Optional[int] = None, error: Optional[str] = None):
+        def job(db: Session):
+            db.execute(
+                update(UploadSessionFile).where(UploadSessionFile.id == file_id)
+                .values(status=status, resume_id=resume_id, error=error)
+            )
+        write_queue.run(job)
+
+    def finish(self, file: UploadSessionFile, resume_id: Optional[int], error: Optional[str]):
+        """Record a parse outcome and drop the part file (the blob store holds the bytes)"""
+        self.set_status(file.id, "failed" if error else "done", resume_id, error)
+        try:
+            os.remove(self.part_path(file))
+        except FileNotFoundError:
+            pass
+
+    async def commit(self, session: UploadSession):
+        """Close the session once its parse tasks are done: files still incomplete are given up,
+        and the part files go (event loop only)"""
+        await self.wait(session)
+        await run_blocking(self._close, await run_blocking(self.get, session.id))
+        self._forget(session)
+
+    def _close(self, session: UploadSession):
+        incomplete = [file for file in session.files if file.status == "receiving"]
+        for file in incomplete:
+            self.set_status(file.id, "incomplete",
+                            error=f"Upload incomplete: {self.received(file)} of {file.size} bytes received")
+
+        def job(db: Session):
+            db.execute(update(UploadSession).where(UploadSession.id == session.id).values(status="committed"))
+        write_queue.run(job)
+        shutil.rmtree(self.directory(session.id), ignore_errors=True)
+
+    async def remove(self, session: UploadSession):
+        """
+        Delete a session and its part files; resumes it already produced are kept (event loop only).
+
+        New chunks are refused from the start; chunks being written, and then parses
+        still reading part files, are awaited before the files and rows they use go.
+        """
+        self._removing.add(session.id)
+        try:
+            for file in session.files:
+                lock = self._locks.get(file.id)
+                if lock is not None:
+                    async with lock:
+                        pass
+            await self.wait(session)
+            await run_blocking(self._delete, session.id)
+            self._forget(session)
+        finally:
+            self._removing.discard(session.id)
+
+    def _delete(self, session_id: str):
+        def job(db: Session):
+            db.execute(delete(UploadSessionFile).where(UploadSessionFile.session_id == session_id))
+            db.execute(delete(UploadSession).where(UploadSession.id == session_id))
+        write_queue.run(job)
+        shutil.rmtree(self.directory(session_id), ignore_errors=True)
+
+    def _forget(self, session: UploadSession):
+        for file in session.files:
+            self._locks.pop(file.id, None)
+            self._tasks.pop(file.id, None)
+
+    def _busy(self, session: UploadSession) -> bool:
+        """A chunk of the session is being written or one of its files is being parsed"""
+        for file in session.files:
+            lock, task = self._locks.get(file.id), self._tasks.get(file.id)
+            if (lock is not None and lock.locked()) or (task is not None and not task.done()):
+                return True
+        return False
+
+    @staticmethod
+    def _expired_sessions() -> List[UploadSession]:
+        cutoff = datetime.utcnow() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS)
+        db = SessionLocal()
+        try:
+            return (
+                db.query(UploadSession)
+                .options(selectinload(UploadSession.files))
+                .filter(UploadSession.created_at < cutoff)
+                .all()
+            )
+        finally:
+            db.close()
+
+    async def sweep(self) -> int:
+        """
+        Remove sessions past UPLOAD_SESSION_TTL_HOURS (run whenever a session is opened).
+        One with a chunk or parse still in flight is left for a later sweep.
+        """
+        removed = 0
+        for session in await run_blocking(self._expired_sessions):
+            if self._busy(session) or session.id in self._removing:
+                continue
+            await self.remove(session)
+            removed += 1
+        if removed:
+            print(f"Removed {removed} expired upload sessions")
+        return removed
+
+upload_sessions = UploadSessions()
@@ -0,0 +1,54 @@
+"""
+Execution model for route handlers.
+
+- Handlers that only touch the database are plain `def`; FastAPI runs them in its
+  thread pool (sized by THREAD_POOL_SIZE) so they never block the event loop.
+- `async def` handlers (the upload paths, which must await request bodies) send
+  blocking calls through run_blocking and CPU-heavy parsing through run_in_process,
+  a bounded pool of sandboxed worker processes (PARSE_WORKERS) with a per-task
+  timeout and memory cap (see app.utils.sandbox).
+"""
+
+import asyncio
+import threading
+from starlette.concurrency import run_in_threadpool
+from app.config import settings
+from app.utils.sandbox import SandboxPool
+
+_process_pool = None
+_pool_lock = threading.Lock()
+
+def get_process_pool() -> SandboxPool:
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = SandboxPool(
+                settings.PARSE_WORKERS,
+                timeout=settings.PARSE_TIMEOUT_SECONDS,
+                memory_mb=settings.PARSE_WORKER_MEMORY_MB,
+                max_tasks=settings.PARSE_WORKER_MAX_TASKS,
+                preload=["app.services.resume_parser"]
+            )
+        return _process_pool
+
+async def run_in_process(fn, *args, **kwargs):
+    """
+    Run a CPU-bound, picklable top-level function in a sandboxed worker process.
+    Raises app.utils.sandbox.ParseAborted when the task hit the timeout or memory cap.
+    """
+    return await asyncio.wrap_future(get_process_pool().submit(fn, *args, **kwargs))
+
+async def run_blocking(fn, *args, **kwargs):
+    """Run blocking I/O (sync DB sessions, file writes) in the thread pool"""
+    return await run_in_threadpool(fn, *args, **kwargs)
+
+def configure_thread_pool():
+    """Size the thread pool used by plain `def` handlers and run_blocking (call from startup)"""
+    import anyio.to_thread
+    anyio.to_thread.current_default_thread_limiter().total_tokens = settings.THREAD_POOL_SIZE
+
+def shutdown_executors():
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown()
+        _process_pool = None
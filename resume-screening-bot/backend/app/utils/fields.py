@@ -0,0 +1,84 @@
+from typing import Any, Dict, Iterable, List, Optional
+
+# Default ("compact") field sets for the heavy endpoints. They keep everything the
+# frontend reads and drop the duplicated or bulky parts (detailed_breakdown repeats
+# the per-component dicts, missing_skills_list repeats missing_skills, bulk upload
+# echoed the full parsed_data of every file).
+ANALYSIS_COMPACT_FIELDS = [
+    "analysis_id", "run_id", "detail", "resume_id", "filename",
+    "ats_score", "ats_section_scores", "overall_score", "category", "matching_details",
+    "matched_skills", "missing_skills", "improvements", "result", "match_score",
+    "experience_match_status", "resume_strength_10", "skill_match", "project_relevance",
+    "experience_alignment", "education_fit", "explanation"
+]
+
+# Bulk analysis is for ranking: scores, counts and the missing skills, sent as a table
+# (to_columns). The narrative of any row comes from /analysis/{run_id}/{resume_id}/explain.
+BULK_ANALYSIS_COMPACT_FIELDS = [
+    "resume_id", "filename", "overall_score", "category", "ats_score",
+    "skill_match_score", "project_relevance_score", "experience_score", "education_score",
+    "matched_count", "missing_count", "missing_skills", "experience_match_status",
+    "resume_strength_10", "error"
+]
+
+BULK_UPLOAD_COMPACT_FIELDS = ["id", "filename", "status", "extracted_skills"]
+
+def resolve_fields(fields: Optional[str], compact: Optional[Iterable[str]] = None) -> Optional[List[str]]:
+    """
+    Turn a fields= query value into a list of field paths.
+
+    None/"" gives the endpoint's compact profile (or everything when it has none),
+    "full" gives everything, anything else is a comma-separated list of top-level
+    names or dotted paths ("skill_match.score").
+    """
+    if not fields or fields == "compact":
+        return list(compact) if compact is not None else None
+    if fields == "full":
+        return None
+    return [f.strip() for f in fields.split(",") if f.strip()]
+
+def select_fields(payload: Dict, paths: Optional[List[str]]) -> Dict:
+    """Return a copy of payload containing only the requested paths (None keeps everything)"""
+    if paths is None:
+        return payload
+
+    nested: Dict[str, List[str]] = {}
+    whole = set()
+    for path in paths:
+        head, _, rest = path.partition(".")
+        if rest:
+            nested.setdefault(head, []).append(rest)
+        else:
+            whole.add(head)
+
+    selected = {}
+    for key, value in payload.items():
+        if key in whole:
+            selected[key] = value
+        elif key in nested:
+            selected[key] = select_fields(value, nested[key]) if isinstance(value, dict) else value
+    return selected
+
+_MISSING = object()
+
+def _lookup(payload: Dict, path: str) -> Any:
+    value = payload
+    for key in path.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+def to_columns(items: List[Dict], paths: List[str]) -> Dict:
+    """
+    Header-plus-rows form of a list of payloads: {"columns": [...], "rows": [[...], ...]}.
+
+    Field names are sent once instead of once per item; columns that no item has are
+    left out, and a row holds null where its item lacks a column.
+    """
+    values = [[_lookup(item, path) for path in paths] for item in items]
+    keep = [i for i in range(len(paths)) if any(row[i] is not _MISSING for row in values)]
+    return {
+        "columns": [paths[i] for i in keep],
+        "rows": [[None if row[i] is _MISSING else row[i] for i in keep] for row in values]
+    }
@@ -0,0 +1,177 @@
+"""
+Cache of extracted PDF page text, keyed by a hash of what the page draws.
+
+Students re-upload the same CV with a line changed; only the edited page's
+content stream differs, so every other page's text is served from here instead
+of going through pdfplumber's layout analysis again.
+
+The key covers everything text extraction depends on: the decoded content
+streams, the fonts' encodings, widths and ToUnicode maps, form XObjects,
+the page box and rotation, and the extractor configuration (the salt). Font programs and
+images are left out, since they do not change the extracted text.
+
+Entries are kept in a per-process LRU in front of a sharded directory shared by
+all parse workers (PAGE_CACHE_PATH, default <UPLOAD_FOLDER>/page_cache). Hits
+refresh a file's mtime, so old entries can be pruned with:
+    python -m app.utils.page_cache --max-age-days 30
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Optional
+import pdfplumber
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import LIT, PSLiteral
+from app.config import settings, resolve_upload_folder
+from app.utils.text_codec import compress_text, decompress_text
+
+# Keys whose values cannot change the extracted text (or point back up the tree)
+_SKIPPED_KEYS = {"Parent", "FontFile", "FontFile2", "FontFile3", "Length", "Filter", "DecodeParms"}
+_MAX_DEPTH = 12
+_IMAGE = LIT("Image")
+
+def _feed(h, obj, depth: int = 0):
+    """Hash a PDF object tree by value, resolving references"""
+    if depth > _MAX_DEPTH:
+        return
+    if isinstance(obj, PDFObjRef):
+        obj = resolve1(obj)
+    if isinstance(obj, PDFStream):
+        if obj.attrs.get("Subtype") == _IMAGE:
+            # Images carry no text; their size is enough to tell them apart
+            h.update(b"image:" + repr(resolve1(obj.attrs.get("Length"))).encode())
+            return
+        _feed(h, obj.attrs, depth + 1)
+        h.update(obj.get_data())
+    elif isinstance(obj, dict):
+        h.update(b"{")
+        for key in sorted(obj):
+            if key in _SKIPPED_KEYS:
+                continue
+            h.update(str(key).encode() + b":")
+            _feed(h, obj[key], depth + 1)
+        h.update(b"}")
+    elif isinstance(obj, (list, tuple)):
+        h.update(b"[")
+        for item in obj:
+            _feed(h, item, depth + 1)
+        h.update(b"]")
+    elif isinstance(obj, PSLiteral):
+        h.update(b"/" + str(obj.name).encode())
+    else:
+        h.update(repr(obj).encode())
+
+def page_fingerprint(page, salt: str = "") -> str:
+    """Content hash of one pdfplumber page; salt identifies how its text is extracted"""
+    h = hashlib.sha256(f"pdfplumber-{pdfplumber.__version__}:{salt}".encode())
+    page_obj = page.page_obj
+    h.update(repr((page.bbox, page.page_obj.attrs.get("Rotate", 0))).encode())
+    for stream in page_obj.contents or []:
+        stream = resolve1(stream)
+        if isinstance(stream, PDFStream):
+            h.update(stream.get_data())
+    resources = resolve1(page_obj.resources) or {}
+    for name in ("Font", "XObject"):
+        h.update(name.encode())
+        _feed(h, resources.get(name))
+    return h.hexdigest()
+
+class PageTextCache:
+    def __init__(self, root: str, memory_items: int = 2048, enabled: bool = True):
+        self.root = root
+        self.memory_items = memory_items
+        self.enabled = enabled
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key[:2], key)
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                codec, _, data = f.read().partition(b"\n")
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            text = decompress_text(codec.decode(), data)
+            os.utime(path)
+        except Exception as e:
+            # Truncated or corrupt entry (zlib/zstd errors, bad UTF-8): a miss, and the
+            # page is extracted and written again
+            self.misses += 1
+            print(f"Page cache: dropping unreadable entry {key}: {e}")
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        self.hits += 1
+        self._remember(key, text)
+        return text
+
+    def set(self, key: str, text: str):
+        if not self.enabled:
+            return
+        self._remember(key, text)
+        path = self._path(key)
+        codec, data = compress_text(text)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+            with os.fdopen(fd, "wb") as f:
+                f.write(codec.encode() + b"\n" + data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # The cache is an optimization: extraction carries on without it
+            print(f"Page cache: could not write {key}: {e}")
+
+    def _remember(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def prune(self, max_age_days: float) -> int:
+        """Delete entries not read or written for max_age_days; returns how many"""
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for dirpath, _, filenames in os.walk(self.root):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
+
+def _default_root() -> str:
+    return settings.PAGE_CACHE_PATH or os.path.join(resolve_upload_folder(), "page_cache")
+
+page_cache = PageTextCache(
+    _default_root(),
+    memory_items=settings.PAGE_CACHE_MEMORY_ITEMS,
+    enabled=settings.PAGE_CACHE_ENABLED
+)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Prune the PDF page text cache")
+    parser.add_argument("--max-age-days", type=float, default=30)
+    args = parser.parse_args()
+    print(f"Removed {page_cache.prune(args.max_age_days)} entries from {page_cache.root}")
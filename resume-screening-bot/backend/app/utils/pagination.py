@@ -0,0 +1,98 @@
+"""
+Keyset pagination for the list endpoints.
+
+Lists are ordered by id and paged with ?after_id=<last id seen>&limit=N, so every
+page is an index range scan no matter how deep the client goes. ?order=desc walks
+newest first (ids grow with creation), so "the latest one" is a single-row page.
+Bodies stay plain JSON arrays; paging metadata travels in headers:
+
+    X-Total-Count     total rows for the owner (from CountCache)
+    X-Next-After-Id   pass as after_id to get the next page (absent on the last page)
+"""
+
+import threading
+import time
+from typing import Hashable, List, Optional
+from fastapi import Query, Response
+from sqlalchemy import func, select
+from app.config import settings
+
+PAGINATION_HEADERS = ["X-Total-Count", "X-Next-After-Id"]
+
+class PageParams:
+    """Dependency for ?after_id=&limit=&order= query parameters"""
+
+    def __init__(
+        self,
+        after_id: Optional[int] = Query(default=None, ge=0),
+        limit: int = Query(default=settings.LIST_PAGE_SIZE, ge=1, le=settings.LIST_MAX_PAGE_SIZE),
+        order: str = Query(default="asc", pattern="^(asc|desc)$")
+    ):
+        self.after_id = after_id
+        self.limit = limit
+        self.descending = order == "desc"
+
+    def apply(self, stmt, id_column):
+        """Add the keyset filter, ordering and limit (one extra row to detect a next page)"""
+        if self.descending:
+            if self.after_id is not None:
+                stmt = stmt.where(id_column < self.after_id)
+            return stmt.order_by(id_column.desc()).limit(self.limit + 1)
+        if self.after_id is not None:
+            stmt = stmt.where(id_column > self.after_id)
+        return stmt.order_by(id_column).limit(self.limit + 1)
+
+    def finish(self, response: Response, rows: List, total: int) -> List:
+        """Trim the lookahead row and set the pagination headers"""
+        response.headers["X-Total-Count"] = str(total)
+        if len(rows) > self.limit:
+            rows = rows[:self.limit]
+            response.headers["X-Next-After-Id"] = str(rows[-1].id)
+        return rows
+
+class CountCache:
+    """
+    Short-lived cache of per-owner row counts (e.g. ("resumes", user_id)).
+
+    Writers invalidate the keys they touch; the TTL bounds staleness from writes that
+    bypass the routes (background jobs, other processes).
+    """
+
+    def __init__(self, ttl: float = 30.0):
+        self.ttl = ttl
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        with self._lock:
+            entry = self._values.get(key)
+        if entry is None or entry[1] < time.monotonic():
+            return None
+        return entry[0]
+
+    def set(self, key: Hashable, value: int):
+        with self._lock:
+            self._values[key] = (value, time.monotonic() + self.ttl)
+
+    def invalidate(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                self._values.pop(key, None)
+
+    def count(self, db, key: Hashable, model, *criteria) -> int:
+        """Cached SELECT count(*) FROM model WHERE criteria (sync session)"""
+        total = self.get(key)
+        if total is None:
+            total = db.execute(select(func.count()).select_from(model).where(*criteria)).scalar_one()
+            self.set(key, total)
+        return total
+
+    async def count_async(self, db, key: Hashable, model, *criteria) -> int:
+        """Same as count() for an AsyncSession"""
+        total = self.get(key)
+        if total is None:
+            total = (await db.execute(select(func.count()).select_from(model).where(*criteria))).scalar_one()
+            self.set(key, total)
+        return total
+
+count_cache = CountCache(ttl=settings.COUNT_CACHE_TTL)
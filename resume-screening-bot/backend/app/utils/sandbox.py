@@ -0,0 +1,224 @@
+"""
+Sandboxed worker processes for untrusted file parsing.
+
+A malformed PDF can make a parser spin for minutes or allocate gigabytes, and
+ProcessPoolExecutor can neither interrupt a task nor cap its memory. Each
+SandboxPool worker is a separate process that:
+
+- caps its address space with RLIMIT_AS at its size after start-up plus
+  memory_mb, so runaway allocations fail with MemoryError instead of swapping
+  the host;
+- is killed and replaced when a task runs longer than timeout seconds;
+- is retired after max_tasks tasks (or a MemoryError), so fragmentation and
+  leaks in the parsing libraries never accumulate.
+
+Workers are forked from a forkserver that preloads the parsing modules, so a
+replacement starts in milliseconds without inheriting the API process's threads
+or open connections.
+"""
+
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Sequence
+
+try:
+    import resource
+except ImportError:  # Windows: no rlimits
+    resource = None
+
+class ParseAborted(Exception):
+    """A task was stopped by the sandbox; reason is "timeout", "memory" or "crash"."""
+
+    def __init__(self, reason: str, detail: str):
+        super().__init__(f"{reason}: {detail}")
+        self.reason = reason
+        self.detail = detail
+
+def _address_space() -> int:
+    """Current virtual memory size of this process in bytes (Linux), else 0"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+def _worker_main(conn, memory_mb: int):
+    if resource is not None and memory_mb > 0:
+        limit = _address_space() + memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    conn.send(("ready", None))
+    while True:
+        try:
+            task = conn.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        fn, args, kwargs = task
+        try:
+            conn.send(("ok", fn(*args, **kwargs)))
+        except MemoryError:
+            conn.send(("memory", "allocation failed under the worker memory limit"))
+            return  # The heap may be in a bad state: let the pool start a fresh worker
+        except Exception as e:
+            try:
+                conn.send(("error", e))
+            except Exception:
+                # Unpicklable exception: send its description instead
+                conn.send(("error", RuntimeError(f"{type(e).__name__}: {e}")))
+
+class _Worker:
+    # The first worker waits for the forkserver to import the preloaded modules
+    START_TIMEOUT = 120
+
+    def __init__(self, context, memory_mb: int):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_mb), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        # Start-up time must not count against the first task's timeout
+        try:
+            ready = self.conn.poll(self.START_TIMEOUT) and self.conn.recv()[0] == "ready"
+        except (EOFError, OSError):
+            ready = False
+        if not ready:
+            self.kill()
+            raise RuntimeError(f"Parse worker failed to start (exit code {self.process.exitcode})")
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(1)
+        self.conn.close()
+
+    def close(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(1)
+        self.kill()
+
+class SandboxPool:
+    def __init__(self, workers: int, timeout: float = 60, memory_mb: int = 1024,
+                 max_tasks: int = 100, preload: Sequence[str] = ()):
+        self.size = workers
+        self.timeout = timeout
+        self.memory_mb = memory_mb
+        self.max_tasks = max_tasks
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(list(preload))
+        self._idle = queue.LifoQueue()
+        self._all = set()
+        self._starting = 0  # Slots reserved by workers that are still starting
+        self._lock = threading.Lock()
+        # One dispatcher thread per worker process; it blocks while its worker runs a task
+        self._dispatch = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sandbox")
+        self._closed = False
+
+    def submit(self, fn: Callable, *args, **kwargs) -> Future:
+        """Run a picklable top-level function in a worker; the future raises ParseAborted if it was stopped"""
+        return self._dispatch.submit(self.run, fn, *args, **kwargs)
+
+    def run(self, fn: Callable, *args, **kwargs):
+        """Blocking call (from a dispatcher or any other thread)"""
+        worker = self._acquire()
+        started = time.monotonic()
+        try:
+            worker.conn.send((fn, args, kwargs))
+            if not worker.conn.poll(self.timeout):
+                self._discard(worker)
+                raise ParseAborted("timeout", f"no result after {self.timeout:g} s")
+            status, payload = worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(1)
+            exitcode = worker.process.exitcode
+            self._discard(worker)
+            # SIGKILL usually means the kernel OOM killer stepped in
+            reason = "memory" if exitcode == -9 else "crash"
+            raise ParseAborted(reason, f"worker exited with code {exitcode} after {time.monotonic() - started:.1f} s")
+        except ParseAborted:
+            raise
+        except BaseException:
+            self._discard(worker)
+            raise
+
+        worker.tasks += 1
+        if status == "memory":
+            self._discard(worker)
+            raise ParseAborted("memory", payload)
+        self._release(worker)
+        if status == "error":
+            raise payload
+        return payload
+
+    def _acquire(self) -> _Worker:
+        while True:
+            try:
+                return self._idle.get_nowait()
+            except queue.Empty:
+                pass
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError("Sandbox pool is shut down")
+                # Reserve the slot; the worker starts outside the lock, since that can take
+                # up to START_TIMEOUT and would block _release, _discard and shutdown meanwhile
+                reserved = len(self._all) + self._starting < self.size
+                if reserved:
+                    self._starting += 1
+            if reserved:
+                return self._start_worker()
+            # All workers busy; re-check now and then, since a killed worker frees a slot
+            try:
+                return self._idle.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+    def _start_worker(self) -> _Worker:
+        try:
+            worker = _Worker(self._context, self.memory_mb)
+        except BaseException:
+            with self._lock:
+                self._starting -= 1
+            raise
+        with self._lock:
+            self._starting -= 1
+            closed = self._closed
+            if not closed:
+                self._all.add(worker)
+        if closed:
+            worker.close()
+            raise RuntimeError("Sandbox pool is shut down")
+        return worker
+
+    def _release(self, worker: _Worker):
+        if worker.tasks >= self.max_tasks or self._closed:
+            with self._lock:
+                self._all.discard(worker)
+            worker.close()
+        else:
+            self._idle.put(worker)
+
+    def _discard(self, worker: _Worker):
+        with self._lock:
+            self._all.discard(worker)
+        worker.kill()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"workers": len(self._all), "starting": self._starting, "idle": self._idle.qsize(),
+                    "max_workers": self.size}
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self._all)
+            self._all.clear()
+        for worker in workers:
+            worker.close()
+        self._dispatch.shutdown(wait=False, cancel_futures=True)
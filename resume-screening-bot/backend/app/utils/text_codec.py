@@ -0,0 +1,30 @@
+import zlib
+from typing import Optional, Tuple
+from app.config import settings
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+def compress_text(text: str, codec: Optional[str] = None) -> Tuple[str, bytes]:
+    """Compress text with the configured codec; returns (codec, data)"""
+    codec = codec or settings.TEXT_CODEC
+    raw = (text or "").encode("utf-8")
+    if codec == "zstd" and zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=settings.TEXT_COMPRESSION_LEVEL).compress(raw)
+    if codec == "identity":
+        return "identity", raw
+    return "zlib", zlib.compress(raw, 6)
+
+def decompress_text(codec: Optional[str], data: Optional[bytes]) -> str:
+    """Inverse of compress_text; missing rows decode to an empty string"""
+    if data is None:
+        return ""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Resume text is zstd-compressed but the zstandard package is not installed")
+        return zstandard.ZstdDecompressor().decompress(data).decode("utf-8")
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    return bytes(data).decode("utf-8")
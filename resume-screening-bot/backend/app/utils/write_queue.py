@@ -0,0 +1,150 @@
+"""
+Single-writer queue for the database.
+
+SQLite allows one writer at a time, so concurrent commits from bulk uploads,
+analysis runs and match-index refreshes used to fail with "database is locked".
+Write jobs are instead handed to one writer thread, which drains whatever is
+queued (up to WRITE_QUEUE_MAX_BATCH jobs, waiting at most WRITE_QUEUE_MAX_DELAY_MS
+for more) and commits them in a single transaction. Readers are unaffected:
+with WAL they read the last committed snapshot while the writer works.
+
+A write job is a callable taking the writer's Session. When a grouped
+transaction fails, its jobs are retried one transaction each so a bad row only
+fails its own caller.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, List
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import WriterSession
+
+_STOP = object()
+
+class WriteQueue:
+    def __init__(self, session_factory=WriterSession, enabled: bool = True,
+                 max_batch: int = 200, max_delay: float = 0.005):
+        self.session_factory = session_factory
+        self.enabled = enabled
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[[Session], object]) -> Future:
+        """Queue a write job; the future resolves to fn's return value once committed"""
+        future = Future()
+        if not self.enabled:
+            # Direct mode (e.g. Postgres): run in the caller's thread, own transaction
+            self._run_one(fn, future)
+            return future
+        self._ensure_started()
+        self._queue.put((fn, future))
+        return future
+
+    def run(self, fn: Callable[[Session], object]):
+        """Submit and wait (for sync handlers and background tasks)"""
+        return self.submit(fn).result()
+
+    async def run_async(self, fn: Callable[[Session], object]):
+        """Submit and await without blocking the event loop"""
+        if not self.enabled:
+            from app.utils.executors import run_blocking
+            return await run_blocking(self.run, fn)
+        return await asyncio.wrap_future(self.submit(fn))
+
+    def add_all(self, objects: List) -> List:
+        """Insert ORM objects; returns them with primary keys populated"""
+        return self.run(_add_all(objects))
+
+    async def add_all_async(self, objects: List) -> List:
+        return await self.run_async(_add_all(objects))
+
+    def stop(self, timeout: float = 10.0):
+        """Commit whatever is queued, then stop the writer thread"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(_STOP)
+            thread.join(timeout)
+
+    def _ensure_started(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._writer, name="db-writer", daemon=True)
+                self._thread.start()
+
+    def _writer(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            batch = [item]
+            stopping = False
+            deadline = time.monotonic() + self.max_delay
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._run_batch(batch)
+            if stopping:
+                return
+
+    def _run_batch(self, batch):
+        if len(batch) == 1:
+            self._run_one(*batch[0])
+            return
+
+        db = self.session_factory()
+        try:
+            results = [fn(db) for fn, _ in batch]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            db.close()
+            print(f"Write queue: grouped commit of {len(batch)} jobs failed ({e}), retrying individually")
+            for fn, future in batch:
+                self._run_one(fn, future)
+            return
+        db.close()
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+    def _run_one(self, fn, future: Future):
+        db = self.session_factory()
+        try:
+            result = fn(db)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        finally:
+            db.close()
+
+def _add_all(objects: List) -> Callable[[Session], List]:
+    def job(db: Session) -> List:
+        db.add_all(objects)
+        db.flush()
+        return objects
+    return job
+
+write_queue = WriteQueue(
+    enabled=settings.WRITE_QUEUE_ENABLED,
+    max_batch=settings.WRITE_QUEUE_MAX_BATCH,
+    max_delay=settings.WRITE_QUEUE_MAX_DELAY_MS / 1000
+)
@@ -0,0 +1,124 @@
+"""
+DOCX extraction: python-docx object model vs the streaming iterparse extractor.
+
+Generates a resume-sized DOCX (paragraphs, a skills table, a two-column layout
+table with a merged cell) and a large one (--tables tables of --rows x 5
+cells), then for each reports time and peak RSS growth of both extractors, each
+measured in a fresh process, and whether they agree: same words (ignoring the
+"|" cell separators and python-docx's repeats of merged cells) and the same
+skills found by the parser.
+
+Run from the backend directory:
+    python -m benchmarks.bench_docx_extraction [--tables 60 --rows 40]
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+
+def legacy_text(path: str) -> str:
+    """ResumeParser.extract_text_from_docx before the streaming extractor"""
+    from docx import Document
+
+    text = ""
+    doc = Document(path)
+    for para in doc.paragraphs:
+        text += para.text + "\n"
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                text += cell.text + " "
+    return text
+
+def streaming_text(path: str) -> str:
+    from app.services.resume_parser import ResumeParser
+    return ResumeParser.extract_text_from_docx(path)
+
+def build_resume(path: str):
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Jane Doe")
+    doc.add_paragraph("jane.doe@example.com | 555-123-4567")
+    doc.add_paragraph("Summary")
+    doc.add_paragraph("Backend engineer with six years of Python and distributed systems work.")
+    doc.add_paragraph("Technical Skills")
+    skills = doc.add_table(rows=3, cols=3)
+    for row, names in zip(skills.rows, [("Python", "Java", "SQL"), ("Docker", "Kubernetes", "AWS"),
+                                        ("React", "PostgreSQL", "Git")]):
+        for cell, name in zip(row.cells, names):
+            cell.text = name
+    doc.add_paragraph("Experience")
+    layout = doc.add_table(rows=2, cols=2)
+    layout.cell(0, 0).text = "Acme Corp"
+    layout.cell(0, 0).add_paragraph("2019 - 2024")
+    layout.cell(0, 1).text = "Built data pipelines in Python and Spark"
+    layout.cell(0, 1).add_paragraph("Led migration to Kubernetes on AWS")
+    merged = layout.cell(1, 0).merge(layout.cell(1, 1))
+    merged.text = "Awards: engineering excellence award 2022"
+    doc.add_paragraph("Education")
+    doc.add_paragraph("B.Tech Computer Science, 2018")
+    doc.save(path)
+
+def build_large(path: str, tables: int, rows: int):
+    from docx import Document
+
+    doc = Document()
+    doc.add_paragraph("Publications and Projects")
+    for number in range(tables):
+        doc.add_paragraph(f"Project {number}: distributed systems research with Python and Go")
+        table = doc.add_table(rows=rows, cols=5)
+        for r, row in enumerate(table.rows):
+            for c, cell in enumerate(row.cells):
+                cell.text = f"item{number}-{r}-{c} machine learning"
+    doc.save(path)
+
+def _measure(name: str, path: str, queue):
+    from app.services.resume_parser import parse_resume_text  # Imports (nltk, lxml, docx) before the baseline
+    import docx  # noqa: F401
+
+    extract = {"python-docx": legacy_text, "streaming": streaming_text}[name]
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    text = extract(path)
+    elapsed = (time.perf_counter() - start) * 1000
+    growth = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - before
+    queue.put((elapsed, growth, text, sorted(parse_resume_text(text)["skills"])))
+
+def measure(name: str, path: str):
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(name, path, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+def words(text: str) -> set:
+    return {word for word in text.split() if word != "|"}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, default=60)
+    parser.add_argument("--rows", type=int, default=40)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        resume, large = os.path.join(workdir, "resume.docx"), os.path.join(workdir, "large.docx")
+        build_resume(resume)
+        build_large(large, args.tables, args.rows)
+        for path in (resume, large):
+            print(f"{os.path.basename(path)} ({os.path.getsize(path) / 1024:.0f} KB)")
+            results = {name: measure(name, path) for name in ("python-docx", "streaming")}
+            for name, (elapsed, growth, _, _) in results.items():
+                print(f"  {name:>12}: {elapsed:8.1f} ms, peak RSS +{growth / 1024:.1f} MB")
+            old, new = results["python-docx"], results["streaming"]
+            missing = words(old[2]) - words(new[2])
+            print(f"  words only in python-docx output: {len(missing)} {sorted(missing)[:5]}")
+            print(f"  skills: python-docx {len(old[3])}, streaming {len(new[3])}, "
+                  f"lost {sorted(set(old[3]) - set(new[3]))}, gained {sorted(set(new[3]) - set(old[3]))}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Encode time and wire size for a 500-resume bulk-analyze result.
+
+Compares FastAPI's default path (jsonable_encoder + json.dumps) with
+FastJSONResponse (orjson), and the raw body with gzip/brotli as negotiated by
+CompressionMiddleware.
+
+Run from the backend directory:
+    python -m benchmarks.bench_json_response
+"""
+import gzip
+import json
+import random
+import time
+from datetime import datetime
+from pathlib import Path
+from fastapi.encoders import jsonable_encoder
+from app.services.advanced_matcher import AdvancedResumeMatcher
+from app.services.resume_parser import ResumeParser
+from app.services.text_processor import TextPreprocessor
+from app.utils.responses import FastJSONResponse, CompressionMiddleware, brotli
+
+N_RESUMES = 500
+REPEAT = 20
+ROOT = Path(__file__).resolve().parents[2]
+
+def build_payload() -> dict:
+    """A full-detail bulk-analyze response built from the sample resume and JD"""
+    resume_text = (ROOT / "SAMPLE_RESUME.md").read_text(encoding="utf-8")
+    job_description = (ROOT / "SAMPLE_JOB_DESCRIPTION.md").read_text(encoding="utf-8")
+    parsed = ResumeParser.parse_resume_structure(resume_text)
+    parsed["technical_skills"] = TextPreprocessor().extract_skills(resume_text)
+    match = AdvancedResumeMatcher().match_resume_to_job(parsed, resume_text, job_description)
+
+    # Vary scores and skill lists per row so compression ratios stay realistic
+    rng = random.Random(42)
+    results = []
+    for i in range(N_RESUMES):
+        matched = rng.sample(match["matched_skills"], k=rng.randint(0, len(match["matched_skills"])))
+        results.append({
+            "resume_id": i + 1,
+            "filename": f"resume_{rng.getrandbits(32):08x}.pdf",
+            "overall_score": round(rng.uniform(0, 100), 1),
+            "category": match["category"],
+            "ats_score": match["ats_score"],
+            "skill_match_score": match["skill_match"]["score"],
+            "project_relevance_score": match["project_relevance"]["score"],
+            "experience_score": match["experience_alignment"]["score"],
+            "education_score": match["education_profile_fit"]["score"],
+            "matched_skills": matched,
+            "missing_skills": match["missing_skills"],
+            "missing_skills_list": match["missing_skills_list"],
+            "improvements": match["improvements"],
+            "matching_details": match["matching_details"],
+            "experience_match_status": match["experience_match_status"],
+            "resume_strength_10": match["resume_strength_10"],
+            "explanation": match["explanation"],
+            "analyzed_at": datetime(2024, 1, 1, rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59)),
+            "detailed_breakdown": {
+                "skill_match": match["skill_match"],
+                "project_relevance": match["project_relevance"],
+                "experience_alignment": match["experience_alignment"],
+                "education_fit": match["education_profile_fit"]
+            }
+        })
+    return {"total_resumes": N_RESUMES, "analyzed": N_RESUMES, "results": results}
+
+def encode_default(payload: dict) -> bytes:
+    """What FastAPI does for a plain dict returned from a route"""
+    return json.dumps(
+        jsonable_encoder(payload), ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+def timed(fn, payload) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn(payload)
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+def main():
+    payload = build_payload()
+    default_ms = timed(encode_default, payload)
+    fast_ms = timed(lambda p: FastJSONResponse(p).body, payload)
+    body = FastJSONResponse(payload).body
+    middleware = CompressionMiddleware(app=None)
+
+    print(f"Bulk result: {N_RESUMES} resumes, averaged over {REPEAT} runs")
+    print(f"  jsonable_encoder + json.dumps : {default_ms:8.1f} ms  {len(encode_default(payload)):>10,} bytes")
+    print(f"  FastJSONResponse (orjson)     : {fast_ms:8.1f} ms  {len(body):>10,} bytes")
+
+    start = time.perf_counter()
+    gzipped = gzip.compress(body, compresslevel=middleware.gzip_level)
+    gzip_ms = (time.perf_counter() - start) * 1000
+    print(f"  + gzip (level {middleware.gzip_level})              : {gzip_ms:8.1f} ms  {len(gzipped):>10,} bytes")
+    if brotli is not None:
+        start = time.perf_counter()
+        compressed = brotli.compress(body, quality=middleware.brotli_quality)
+        brotli_ms = (time.perf_counter() - start) * 1000
+        print(f"  + brotli (quality {middleware.brotli_quality})          : {brotli_ms:8.1f} ms  {len(compressed):>10,} bytes")
+    else:
+        print("  + brotli: not installed (pip install brotli)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+PDF extraction strategy: speed and fallback rate per quality threshold.
+
+Extracts every distinct PDF in a directory (default uploads/) once with the fast
+path only and once with pdfplumber only, then reports, for each threshold, how
+many pages would take the fast path, the total extraction time, and on how many
+files the parsed contact details or skills would differ from pdfplumber's.
+With --from-db it also summarizes the extraction_stats stored for real uploads,
+their content classification, and the files quarantined by reason (scanned
+PDFs are rejected as "image-only").
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_extraction [--dir uploads] [--from-db]
+"""
+import argparse
+import glob
+import hashlib
+import os
+import statistics
+import time
+from collections import Counter
+
+THRESHOLDS = [0.5, 0.6, 0.7, 0.8, 0.9, 1.1]
+
+def distinct_pdfs(directory: str):
+    seen = set()
+    for path in sorted(glob.glob(os.path.join(directory, "*.pdf"))):
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).digest()
+        if digest not in seen:
+            seen.add(digest)
+            yield path
+
+def measure(directory: str):
+    from PyPDF2 import PdfReader
+    import pdfplumber
+    from app.services.pdf_extraction import normalize_page_text, text_quality
+    from app.services.resume_parser import parse_resume_text
+
+    files = []
+    for path in distinct_pdfs(directory):
+        pages = []
+        reader = PdfReader(path)
+        with pdfplumber.open(path) as pdf:
+            for number, page in enumerate(pdf.pages):
+                start = time.perf_counter()
+                fast = normalize_page_text(reader.pages[number].extract_text() or "")
+                quality = text_quality(fast)["score"]
+                fast_ms = (time.perf_counter() - start) * 1000
+                start = time.perf_counter()
+                layout = page.extract_text() or ""
+                layout_ms = (time.perf_counter() - start) * 1000
+                pages.append((quality, fast, fast_ms, layout, layout_ms))
+        files.append((path, pages))
+
+    def outcome(text):
+        parsed = parse_resume_text(text)
+        return parsed["parsed_data"]["personal_info"], sorted(parsed["skills"])
+
+    print(f"{len(files)} distinct PDFs, {sum(len(p) for _, p in files)} pages")
+    print(f"{'threshold':>9} {'fast pages':>11} {'total ms':>9} {'differs':>8}")
+    for threshold in THRESHOLDS:
+        fast_pages = total_ms = differs = 0
+        for _, pages in files:
+            texts = []
+            for quality, fast, fast_ms, layout, layout_ms in pages:
+                total_ms += fast_ms
+                if quality >= threshold:
+                    fast_pages += 1
+                    texts.append(fast)
+                else:
+                    total_ms += layout_ms
+                    texts.append(layout)
+            if outcome("\n".join(texts)) != outcome("\n".join(p[3] for p in pages)):
+                differs += 1
+        print(f"{threshold:>9} {fast_pages:>11} {total_ms:>9.0f} {differs:>8}")
+
+def from_db():
+    from app.database import SessionLocal
+    from app.models.models import QuarantinedFile, Resume
+    from sqlalchemy import func
+
+    db = SessionLocal()
+    try:
+        rows = [s for (s,) in db.query(Resume.extraction_stats).filter(Resume.extraction_stats.isnot(None))]
+        quarantined = dict(db.query(QuarantinedFile.reason, func.count()).group_by(QuarantinedFile.reason).all())
+    finally:
+        db.close()
+    print(f"Quarantined files by reason: {quarantined}")
+    print(f"Stored PDFs by content: {dict(Counter(s.get('content', 'unchecked') for s in rows if s.get('format') == 'pdf'))}")
+    pdfs = [s for s in rows if s.get("format") == "pdf" and "strategy" in s]
+    if not pdfs:
+        print("No stored PDF extraction stats yet")
+        return
+    qualities = [q for s in pdfs for q in s.get("quality", [])]
+    print(f"Stored stats for {len(pdfs)} PDFs: {dict(Counter(s['strategy'] for s in pdfs))}")
+    print(f"  median extraction {statistics.median(s['ms'] for s in pdfs):.0f} ms")
+    if qualities:
+        buckets = Counter(min(int(q * 10), 9) / 10 for q in qualities)
+        print("  fast-path page quality: " + ", ".join(f"{b:.1f}+: {buckets[b]}" for b in sorted(buckets)))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", default="uploads")
+    parser.add_argument("--from-db", action="store_true")
+    args = parser.parse_args()
+    measure(args.dir)
+    if args.from_db:
+        from_db()
+
+if __name__ == "__main__":
+    main()
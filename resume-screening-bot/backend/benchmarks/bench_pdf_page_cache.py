@@ -0,0 +1,102 @@
+"""
+PDF text extraction with the page cache: cold, identical re-upload, one page edited.
+
+Builds an N-page CV from the sample PDFs in uploads/, plus a copy with one page
+swapped (what a student's "new_resume (8).pdf" looks like to the parser), then
+times ResumeParser.extract_text_from_pdf on each with a throwaway cache
+directory. The per-process memory LRU is cleared before every run, so hits come
+from the shared on-disk cache, as they do across parse workers.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_page_cache --pages 6
+"""
+import argparse
+import glob
+import hashlib
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from PyPDF2 import PdfReader, PdfWriter
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+def build(pages: int, workdir: str):
+    """(original, edited) PDF paths built from the sample uploads"""
+    sources, seen = [], set()
+    for path in sorted(glob.glob(str(BACKEND / "uploads" / "*.pdf"))):
+        for page in PdfReader(path).pages:
+            # uploads/ holds copies of the same CVs; every page must be distinct
+            contents = page.get_contents()
+            digest = hashlib.sha256(contents.get_data() if contents else b"").digest()
+            if digest not in seen:
+                seen.add(digest)
+                sources.append(page)
+        if len(sources) > pages:
+            break
+    if len(sources) <= pages:
+        raise SystemExit(f"Need more than {pages} sample pages in uploads/")
+
+    paths = []
+    for name, chosen in (("original", sources[:pages]), ("edited", sources[:pages - 1] + [sources[pages]])):
+        writer = PdfWriter()
+        for page in chosen:
+            writer.add_page(page)
+        path = os.path.join(workdir, f"{name}.pdf")
+        with open(path, "wb") as f:
+            writer.write(f)
+        paths.append(path)
+    return paths
+
+def timed(extract, cache, path: str, repeat: int, keep: bool):
+    """Median ms; keep=False empties the cache before every run (cold extraction)"""
+    timings = []
+    for _ in range(repeat):
+        if not keep:
+            cache.prune(-1)
+        cache._memory.clear()
+        start = time.perf_counter()
+        text = extract(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), text
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=6)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_page_cache_")
+    os.environ["PAGE_CACHE_PATH"] = os.path.join(workdir, "cache")
+    from app.services.resume_parser import ResumeParser
+    from app.utils.page_cache import page_cache
+
+    original, edited = build(args.pages, workdir)
+    extract = ResumeParser.extract_text_from_pdf
+
+    cold_ms, cold_text = timed(extract, page_cache, original, args.repeat, keep=False)
+    _, edited_cold_text = timed(extract, page_cache, edited, 1, keep=False)
+
+    page_cache.prune(-1)
+    extract(original)  # First upload fills the cache
+    same_ms, same_text = timed(extract, page_cache, original, args.repeat, keep=True)
+    edited_ms = []
+    for _ in range(args.repeat):
+        # Start from a cache holding only the original, so exactly one page misses
+        page_cache.prune(-1)
+        page_cache._memory.clear()
+        extract(original)
+        page_cache._memory.clear()
+        start = time.perf_counter()
+        edited_text = extract(edited)
+        edited_ms.append((time.perf_counter() - start) * 1000)
+
+    assert same_text == cold_text and edited_text == edited_cold_text, "cached text differs from extraction"
+    print(f"{args.pages}-page PDF, median of {args.repeat} runs:")
+    print(f"  cold (no cache)          {cold_ms:8.1f} ms")
+    print(f"  identical re-upload      {same_ms:8.1f} ms  ({same_ms / cold_ms:.0%} of cold)")
+    print(f"  one page edited          {statistics.median(edited_ms):8.1f} ms  ({statistics.median(edited_ms) / cold_ms:.0%} of cold)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Time-to-text for long PDFs: one worker per file vs page ranges across workers.
+
+Builds an N-page CV by repeating the sample pages in uploads/, then parses it
+through app.services.page_parallel.parse_file with page-parallel extraction off
+and on, checking that both produce the same text. The page cache is disabled so
+every run extracts every page. Expect the parallel time to approach
+serial / min(workers, cores); the CPU time of the slowest range shows where it
+would land on a machine with a core per worker.
+
+Run from the backend directory:
+    python -m benchmarks.bench_pdf_page_parallel --pages 24 --workers 4
+"""
+import argparse
+import asyncio
+import glob
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+def build(pages: int, path: str):
+    from PyPDF2 import PdfReader, PdfWriter
+
+    sources = [page for sample in sorted(glob.glob(str(BACKEND / "uploads" / "r*.pdf")))
+               for page in PdfReader(sample).pages]
+    if not sources:
+        raise SystemExit("No sample PDFs in uploads/")
+    writer = PdfWriter()
+    for number in range(pages):
+        writer.add_page(sources[number % len(sources)])
+    with open(path, "wb") as f:
+        writer.write(f)
+
+async def run(path: str, repeat: int):
+    from app.config import settings
+    from app.services.page_parallel import parse_file
+    from app.utils.executors import get_process_pool, shutdown_executors
+
+    # Start every worker before timing anything
+    pool = get_process_pool()
+    await asyncio.gather(*(asyncio.wrap_future(pool.submit(time.sleep, 0.2)) for _ in range(pool.size)))
+
+    threshold = settings.PDF_PARALLEL_MIN_PAGES
+    results = {}
+    for label, min_pages in (("serial", 0), ("page-parallel", threshold)):
+        settings.PDF_PARALLEL_MIN_PAGES = min_pages
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            parsed = await parse_file(path, ".pdf")
+            times.append((time.perf_counter() - start) * 1000)
+        results[label] = parsed
+        stats = parsed["extraction_stats"]
+        print(f"{label:>14}: {statistics.median(times):7.0f} ms median of {repeat}, extraction {stats['ms']:.0f} ms"
+              f" in {stats.get('ranges', 1)} range(s)")
+        if "range_cpu_ms" in stats:
+            # With a core per range, extraction takes about as long as the slowest range
+            print(f"{'':>14}  CPU per range {stats['range_cpu_ms']} ms: slowest {max(stats['range_cpu_ms']):.0f} ms"
+                  f" of {stats['cpu_ms']:.0f} ms total")
+        else:
+            print(f"{'':>14}  CPU {stats['cpu_ms']:.0f} ms")
+    shutdown_executors()
+    same = results["serial"]["raw_text"] == results["page-parallel"]["raw_text"]
+    print(f"Same text: {same}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=24)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # Read by app.config, in this process and in the workers
+    os.environ["PARSE_WORKERS"] = str(args.workers)
+    os.environ["PAGE_CACHE_ENABLED"] = "false"
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, f"cv-{args.pages}p.pdf")
+        build(args.pages, path)
+        print(f"{args.pages}-page PDF, {args.workers} workers, {os.cpu_count()} CPU cores")
+        asyncio.run(run(path, args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Inserting new resumes: rows per second and statements per batch.
+
+Writes --rows resumes (realistic text and parsed_data, one distinct blob each)
+into a fresh SQLite database, with the full-text index in place, four ways:
+
+- per-row commit: add, commit and refresh each resume (the original bulk
+  upload loop);
+- ORM flush: blob references one by one, then add_all() and flush() per
+  batch of --batch rows, which SQLAlchemy turns into one INSERT per row;
+- RETURNING: resume_writer's insert_resumes() per batch of --batch rows: one
+  multi-row INSERT ... RETURNING id, batched blob references;
+- adaptive: resume_writer.insert() over all rows through the write queue,
+  in chunks sized from the measured per-row cost.
+
+Run from the backend directory:
+    python -m benchmarks.bench_resume_inserts [--rows 2000 --batch 20]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+def make_resumes(count: int, offset: int, sources_dir: str):
+    from app.models.models import Resume
+    from app.services.blob_store import blob_store
+
+    resumes, sources = [], []
+    for number in range(offset, offset + count):
+        path = os.path.join(sources_dir, f"{number}.txt")
+        text = (f"Candidate {number}\ncandidate{number}@example.com\nSkills: Python, SQL, Docker, Kubernetes\n"
+                + "Built data pipelines and services for analytics teams. " * 60)
+        with open(path, "w") as f:
+            f.write(text)
+        source = blob_store.describe(path)
+        resumes.append(Resume(
+            user_id=1, filename=f"{number}.txt", file_path=blob_store.locator(source.sha256),
+            blob_sha256=source.sha256, raw_text=text, parser_version=3,
+            parsed_data={"personal_info": {"email": f"candidate{number}@example.com"},
+                         "technical_skills": ["Python", "SQL", "Docker", "Kubernetes"],
+                         "experience": ["Data Engineer, Acme (2019-2024)"] * 3},
+            extraction_stats={"strategy": "text", "ms": 1.2}
+        ))
+        sources.append(source)
+    return resumes, sources
+
+def per_row_commit(resumes, sources, batch):
+    from app.database import WriterSession
+    from app.services.blob_store import blob_store
+
+    db = WriterSession()
+    try:
+        for resume, source in zip(resumes, sources):
+            blob_store.add_ref(db, resume.blob_sha256, source)
+            db.add(resume)
+            db.commit()
+            db.refresh(resume)
+    finally:
+        db.close()
+
+def orm_flush(resumes, sources, batch):
+    from app.database import WriterSession
+    from app.services.blob_store import blob_store
+
+    for start in range(0, len(resumes), batch):
+        db = WriterSession()
+        try:
+            for resume, source in zip(resumes[start:start + batch], sources[start:start + batch]):
+                blob_store.add_ref(db, resume.blob_sha256, source)
+            db.add_all(resumes[start:start + batch])
+            db.flush()
+            db.commit()
+        finally:
+            db.close()
+
+def returning(resumes, sources, batch):
+    from app.database import WriterSession
+    from app.services.resume_writer import insert_resumes
+
+    for start in range(0, len(resumes), batch):
+        db = WriterSession()
+        try:
+            ids = insert_resumes(db, resumes[start:start + batch], sources[start:start + batch])
+            db.commit()
+            for resume, resume_id in zip(resumes[start:start + batch], ids):
+                resume.id = resume_id
+        finally:
+            db.close()
+
+def adaptive(resumes, sources, batch):
+    from app.services.resume_writer import resume_writer
+    resume_writer.insert(resumes, sources)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp()
+    # Read by app.config on import
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ["UPLOAD_FOLDER"] = os.path.join(workdir, "uploads")
+    sources_dir = os.path.join(workdir, "sources")
+    os.makedirs(sources_dir)
+
+    from sqlalchemy import event, func
+    from app.database import Base, SessionLocal, engine
+    from app.models import models
+    from app.services.resume_search import resume_search
+    from app.services.resume_writer import resume_writer
+    from app.utils.write_queue import write_queue
+
+    Base.metadata.create_all(bind=engine)
+    resume_search.ensure_index(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(1))
+
+    offset = 0
+    print(f"{args.rows} rows, batches of {args.batch}, SQLite {engine.dialect.dbapi.sqlite_version}")
+    for name, insert in (("per-row commit", per_row_commit), ("ORM flush", orm_flush),
+                         ("RETURNING", returning), ("adaptive", adaptive)):
+        resumes, sources = make_resumes(args.rows, offset, sources_dir)
+        offset += args.rows
+        statements.clear()
+        start = time.perf_counter()
+        insert(resumes, sources, args.batch)
+        elapsed = time.perf_counter() - start
+        assert all(resume.id for resume in resumes)
+        print(f"{name:>15}: {args.rows / elapsed:8.0f} rows/s, {len(statements) / (args.rows / args.batch):6.1f} "
+              f"statements per {args.batch} rows")
+        if name == "adaptive":
+            print(f"{'':>15}  {resume_writer.row_seconds * 1e6:.0f} us per row -> chunks of {resume_writer.batch_size}")
+    write_queue.stop()
+
+    db = SessionLocal()
+    try:
+        texts = db.query(func.count(models.ResumeText.resume_id)).scalar()
+        refs = db.query(func.sum(models.StoredBlob.refcount)).scalar()
+        print(f"Check: {texts} texts and {refs} blob references for {offset} resumes")
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Full-text resume search latency at scale.
+
+Builds a throwaway SQLite database with N synthetic resumes (indexed in bulk with
+resume_search.index(), as the upload path does), then times the queries behind
+GET /api/resumes/search/text: total count + one ranked, highlighted page.
+
+Run from the backend directory:
+    python -m benchmarks.bench_resume_search --resumes 100000
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import tempfile
+import time
+
+SKILLS = [
+    "python", "java", "kafka", "spark", "react", "node.js", "aws", "docker", "kubernetes",
+    "postgresql", "mongodb", "redis", "terraform", "golang", "rust", "c++", "tensorflow",
+    "pytorch", "airflow", "snowflake", "graphql", "django", "fastapi", "flink", "scala"
+]
+DOMAINS = ["fintech", "healthcare", "e-commerce", "logistics", "edtech", "gaming", "adtech", "insurance"]
+FILLER = (
+    "built designed led improved migrated scaled maintained services pipelines platform team "
+    "customers latency throughput reliability streaming batch realtime analytics dashboards api "
+    "microservices deployment monitoring testing mentoring stakeholders roadmap features"
+).split()
+
+QUERIES = ["kafka streaming fintech", "python django", "react node.js graphql", "rust", "kubernetes terraform aws"]
+
+def synthetic_resume(rng: random.Random) -> str:
+    skills = rng.sample(SKILLS, 8)
+    lines = [f"Skills: {', '.join(skills)}", f"Industry: {rng.choice(DOMAINS)}"]
+    for _ in range(12):
+        words = rng.sample(FILLER, 10) + rng.sample(skills, 2)
+        rng.shuffle(words)
+        lines.append(" ".join(words))
+    return "\n".join(lines)
+
+def build(count: int):
+    from sqlalchemy import insert
+    from app.database import Base, engine
+    from app.models.models import Resume, ResumeText
+    from app.utils.text_codec import compress_text
+    from app.services.resume_search import resume_search
+
+    Base.metadata.create_all(bind=engine)
+    resume_search.ensure_index(engine)
+    rng = random.Random(7)
+    start = time.perf_counter()
+    with engine.begin() as conn:
+        for offset in range(0, count, 5000):
+            ids = range(offset + 1, min(offset + 5000, count) + 1)
+            conn.execute(insert(Resume), [
+                {"id": i, "user_id": i % 50, "filename": f"resume_{i}.pdf", "file_path": "", "parsed_data": {}}
+                for i in ids
+            ])
+            texts, docs = [], []
+            for i in ids:
+                doc = synthetic_resume(rng)
+                codec, data = compress_text(doc)
+                texts.append({"resume_id": i, "codec": codec, "data": data})
+                docs.append((i, doc))
+            conn.execute(insert(ResumeText), texts)
+            resume_search.index(conn, docs)
+    print(f"Inserted and indexed {count:,} resumes in {time.perf_counter() - start:.1f} s")
+
+async def measure(repeat: int):
+    from app.database import AsyncSessionLocal
+    from app.services.resume_search import resume_search
+
+    async with AsyncSessionLocal() as db:
+        for query in QUERIES:
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                found = await resume_search.search(db, query, limit=20)
+                timings.append((time.perf_counter() - start) * 1000)
+            print(f"  {query!r:<30} total={found['total']:>6}  median={statistics.median(timings):6.1f} ms  max={max(timings):6.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_search_")
+    # Point the app at the throwaway database before it is imported
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    build(args.resumes)
+    print(f"Search (first page of 20, count + bm25 + snippets), {args.repeat} runs each:")
+    asyncio.run(measure(args.repeat))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Storage size and list-query latency: inline resume text vs compressed resume_texts.
+
+Builds two throwaway SQLite databases with the same N synthetic resumes:
+  inline  - the old layout, raw_text as a TEXT column of resumes
+  split   - the current layout, text compressed (TEXT_CODEC) in resume_texts
+and reports file sizes plus the latency of list-style queries that read resumes rows
+but not the text.
+
+Run from the backend directory:
+    python -m benchmarks.bench_resume_storage --resumes 100000
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from app.utils.text_codec import compress_text
+
+ROOT = Path(__file__).resolve().parents[2]
+
+RESUME_COLUMNS = "id INTEGER PRIMARY KEY, user_id INTEGER, filename VARCHAR, file_path VARCHAR, parsed_data JSON, ats_score FLOAT, uploaded_at DATETIME"
+
+QUERIES = {
+    # Everything query(Resume) selects, for one owner's first page
+    "owner page (all resume columns)": "SELECT * FROM resumes WHERE user_id = ? ORDER BY id LIMIT 100",
+    # Not covered by any index: walks the whole table
+    "filtered scan (ats_score >= 95)": "SELECT id, filename FROM resumes WHERE ats_score >= 95 ORDER BY uploaded_at DESC LIMIT 50",
+    "count by day (full scan)": "SELECT substr(uploaded_at, 1, 10), count(*) FROM resumes GROUP BY 1",
+}
+
+def synthetic_texts(count: int, rng: random.Random):
+    """Sample resume with a random subset of its words replaced, so every row differs"""
+    words = (ROOT / "SAMPLE_RESUME.md").read_text(encoding="utf-8").split(" ")
+    vocabulary = list({w for w in words if w.isalpha()})
+    for _ in range(count):
+        text = list(words)
+        for i in rng.sample(range(len(text)), len(text) // 5):
+            text[i] = rng.choice(vocabulary)
+        yield " ".join(text)
+
+def build(path: str, count: int, split: bool):
+    rng = random.Random(11)
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    if split:
+        conn.execute(f"CREATE TABLE resumes ({RESUME_COLUMNS})")
+        conn.execute("CREATE TABLE resume_texts (resume_id INTEGER PRIMARY KEY, codec VARCHAR, data BLOB, size INTEGER)")
+    else:
+        conn.execute(f"CREATE TABLE resumes ({RESUME_COLUMNS}, raw_text TEXT)")
+    conn.execute("CREATE INDEX ix_resumes_user_id ON resumes (user_id)")
+
+    rows, texts = [], []
+    for i, raw_text in enumerate(synthetic_texts(count, rng), start=1):
+        row = (i, i % 200, f"resume_{i}.pdf", f"uploads/resume_{i}.pdf", '{"technical_skills": ["python", "sql"]}',
+               round(rng.uniform(20, 100), 1), f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d} 10:00:00")
+        if split:
+            codec, data = compress_text(raw_text)
+            rows.append(row)
+            texts.append((i, codec, data, len(raw_text)))
+        else:
+            rows.append(row + (raw_text,))
+    with conn:
+        if split:
+            conn.executemany("INSERT INTO resumes VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            conn.executemany("INSERT INTO resume_texts VALUES (?, ?, ?, ?)", texts)
+        else:
+            conn.executemany("INSERT INTO resumes VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    conn.execute("VACUUM")
+    return conn
+
+def timed(conn, sql: str, repeat: int) -> float:
+    timings = []
+    for n in range(repeat):
+        start = time.perf_counter()
+        conn.execute(sql, (n % 200,) if "?" in sql else ()).fetchall()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resumes", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench_storage_")
+    layouts = {}
+    for name, split in (("inline", False), ("split", True)):
+        path = os.path.join(workdir, f"{name}.db")
+        start = time.perf_counter()
+        conn = build(path, args.resumes, split)
+        size = os.path.getsize(path)
+        resumes_bytes = conn.execute("SELECT sum(pgsize) FROM dbstat WHERE name = 'resumes'").fetchone()[0] \
+            if _has_dbstat(conn) else None
+        layouts[name] = (conn, size, resumes_bytes)
+        print(f"{name:<6}: {size / 2**20:8.1f} MB on disk"
+              + (f", resumes table {resumes_bytes / 2**20:7.1f} MB" if resumes_bytes else "")
+              + f"  (built in {time.perf_counter() - start:.1f} s)")
+
+    print(f"List queries, median of {args.repeat} runs:")
+    for label, sql in QUERIES.items():
+        inline_ms = timed(layouts["inline"][0], sql, args.repeat)
+        split_ms = timed(layouts["split"][0], sql, args.repeat)
+        print(f"  {label:<34} inline {inline_ms:8.2f} ms   split {split_ms:8.2f} ms")
+
+def _has_dbstat(conn) -> bool:
+    try:
+        conn.execute("SELECT 1 FROM dbstat LIMIT 1")
+        return True
+    except sqlite3.OperationalError:
+        return False
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Bytes copied per uploaded file, from the request body to the parse worker.
+
+For each distinct sample PDF in uploads/ (plus copies padded to --pad-mb, the
+size of scanned or image-heavy CVs), measures with tracemalloc the peak bytes
+each step allocates on the Python heap:
+
+- api: the upload handler storing the file. Before: `await file.read()` into one
+  bytes object, hashed and written out. After: blob_store.stage() streaming the
+  spooled upload to disk in 1 MB chunks, then hard-linking it into the store.
+- pipe: what is pickled to the worker process for the file (bytes vs a path).
+- worker: PDF text extraction. Before: both libraries opened the path, and
+  PyPDF2 read the whole file into a BytesIO. After: one read-only mmap.
+
+Run from the backend directory:
+    python -m benchmarks.bench_upload_copies [--pad-mb 8]
+"""
+import argparse
+import glob
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+
+def samples(workdir: str, pad_mb: int):
+    from PyPDF2 import PdfReader, PdfWriter
+    from PyPDF2.generic import DecodedStreamObject
+
+    seen, paths = set(), []
+    for path in sorted(glob.glob(str(BACKEND / "uploads" / "*.pdf"))):
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).digest()
+        if digest not in seen:
+            seen.add(digest)
+            paths.append(path)
+    padded = []
+    for path in paths[:2] if pad_mb else []:
+        # An unreferenced stream stands in for embedded images: same bytes on disk,
+        # no effect on the text
+        writer = PdfWriter()
+        writer.clone_document_from_reader(PdfReader(path))
+        filler = DecodedStreamObject()
+        filler.set_data(os.urandom(pad_mb * 1024 * 1024))
+        writer._add_object(filler)
+        target = os.path.join(workdir, f"{Path(path).stem}+{pad_mb}MB.pdf")
+        with open(target, "wb") as f:
+            writer.write(f)
+        padded.append(target)
+    return paths + padded
+
+def peak(fn) -> int:
+    """Peak bytes allocated by Python while fn runs"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def spooled(path: str):
+    """The upload as Starlette hands it over: a spooled temp file, on disk above 1 MB"""
+    upload = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    with open(path, "rb") as f:
+        upload.write(f.read())
+    upload.seek(0)
+    return upload
+
+def api_before(path: str, store_dir: str):
+    upload = spooled(path)
+    def run():
+        content = upload.read()
+        sha256 = hashlib.sha256(content).hexdigest()
+        with open(os.path.join(store_dir, sha256), "wb") as f:
+            f.write(content)
+    return peak(run)
+
+def api_after(path: str, store):
+    upload = spooled(path)
+    def run():
+        with store.stage(upload, ".pdf") as staged:
+            store.store(staged)
+    return peak(run)
+
+def worker_before(path: str):
+    import pdfplumber
+    from PyPDF2 import PdfReader
+
+    def run():
+        reader = PdfReader(path)
+        with pdfplumber.open(path) as pdf:
+            for number, page in enumerate(pdf.pages):
+                reader.pages[number].extract_text()
+    return peak(run)
+
+def worker_after(path: str):
+    import mmap
+    import pdfplumber
+    from PyPDF2 import PdfReader
+
+    def run():
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data, \
+                pdfplumber.open(data) as pdf:
+            reader = PdfReader(data)
+            for number, page in enumerate(pdf.pages):
+                reader.pages[number].extract_text()
+    return peak(run)
+
+def kb(n: int) -> str:
+    return f"{n / 1024:,.0f}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pad-mb", type=int, default=8)
+    args = parser.parse_args()
+
+    from app.services.blob_store import BlobStore, FileSystemBackend
+    from app.services.resume_parser import parse_resume_file
+
+    with tempfile.TemporaryDirectory() as workdir:
+        store = BlobStore(FileSystemBackend(os.path.join(workdir, "blobs")))
+        flat = os.path.join(workdir, "flat")
+        os.makedirs(flat)
+        print(f"{'file':<34} {'size KB':>8} | {'api KB before':>13} {'after':>6} | "
+              f"{'pipe B before':>13} {'after':>6} | {'worker KB before':>16} {'after':>6}")
+        for path in samples(workdir, args.pad_mb):
+            size = os.path.getsize(path)
+            with open(path, "rb") as f:
+                pipe_before = len(pickle.dumps((parse_resume_file, (f.read(), ".pdf"), {})))
+            pipe_after = len(pickle.dumps((parse_resume_file, (path, ".pdf"), {})))
+            start = time.perf_counter()
+            row = (api_before(path, flat), api_after(path, store), worker_before(path), worker_after(path))
+            print(f"{Path(path).name[:34]:<34} {kb(size):>8} | {kb(row[0]):>13} {kb(row[1]):>6} | "
+                  f"{pipe_before:>13,} {pipe_after:>6} | {kb(row[2]):>16} {kb(row[3]):>6}"
+                  f"   ({time.perf_counter() - start:.1f} s)")
+
+if __name__ == "__main__":
+    main()
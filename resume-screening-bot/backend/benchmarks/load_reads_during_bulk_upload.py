@@ -0,0 +1,83 @@
+"""
+Read latency while a bulk upload is running.
+
+Measures GET /api/resumes/{id} and /health latency on an idle server, then again
+while a bulk upload of many PDFs is in flight, and prints p50/p95/p99 for both.
+
+Start the API first (uvicorn app.main:app --port 8000), then from the backend directory:
+    python -m benchmarks.load_reads_during_bulk_upload --base-url http://127.0.0.1:8000
+"""
+import argparse
+import glob
+import threading
+import time
+import requests
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return pick(0.50) * 1000, pick(0.95) * 1000, pick(0.99) * 1000
+
+def hammer(base_url, resume_id, stop, latencies):
+    session = requests.Session()
+    while not stop.is_set():
+        for path in (f"/api/resumes/{resume_id}", "/health"):
+            start = time.perf_counter()
+            session.get(base_url + path, timeout=120).raise_for_status()
+            latencies.setdefault(path, []).append(time.perf_counter() - start)
+
+def measure(base_url, resume_id, readers, duration=None, until=None):
+    stop = threading.Event()
+    latencies = {}
+    threads = [threading.Thread(target=hammer, args=(base_url, resume_id, stop, latencies)) for _ in range(readers)]
+    for t in threads:
+        t.start()
+    if until is not None:
+        until.join()
+    else:
+        time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    return latencies
+
+def report(label, latencies):
+    print(label)
+    for path, samples in latencies.items():
+        p50, p95, p99 = percentiles(samples)
+        print(f"  {path:<22} n={len(samples):<5} p50={p50:7.1f} ms  p95={p95:7.1f} ms  p99={p99:7.1f} ms  max={max(samples) * 1000:7.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--files", default="uploads/*.pdf", help="glob of resumes to bulk upload")
+    parser.add_argument("--copies", type=int, default=4, help="upload each matched file this many times")
+    parser.add_argument("--readers", type=int, default=4, help="concurrent reader threads")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(args.files)) * args.copies
+    if not paths:
+        raise SystemExit(f"No files match {args.files}")
+
+    with open(paths[0], "rb") as f:
+        first = requests.post(f"{args.base_url}/api/resumes/upload", files={"file": (paths[0].split("/")[-1], f)})
+    first.raise_for_status()
+    resume_id = first.json()["id"]
+
+    report("Idle server (5 s):", measure(args.base_url, resume_id, args.readers, duration=5))
+
+    def bulk_upload():
+        files = [("files", (p.split("/")[-1], open(p, "rb"), "application/pdf")) for p in paths]
+        start = time.perf_counter()
+        response = requests.post(f"{args.base_url}/api/resumes/bulk-upload", files=files, timeout=1800)
+        for _, (_, handle, _) in files:
+            handle.close()
+        print(f"Bulk upload of {len(paths)} files: HTTP {response.status_code} in {time.perf_counter() - start:.1f} s")
+
+    uploader = threading.Thread(target=bulk_upload)
+    uploader.start()
+    latencies = measure(args.base_url, resume_id, args.readers, until=uploader)
+    report("During bulk upload:", latencies)
+
+if __name__ == "__main__":
+    main()
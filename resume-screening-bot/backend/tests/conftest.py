@@ -0,0 +1,64 @@
+import itertools
+import os
+import shutil
+import tempfile
+
+# app.config reads the environment on import: point the app at a scratch database
+# and upload folder before anything from app is imported
+_workdir = tempfile.mkdtemp(prefix="resume-bot-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ["UPLOAD_FOLDER"] = os.path.join(_workdir, "uploads")
+os.environ["REPARSE_ON_STARTUP"] = "false"
+os.environ["PARSE_WORKERS"] = "2"
+
+import pytest
+from fastapi.testclient import TestClient
+from tests.helpers import JOB_DESCRIPTION, resume_text
+
+_user_ids = itertools.count(1000)
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_workdir, ignore_errors=True)
+
+@pytest.fixture(scope="session")
+def client():
+    from app.main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+@pytest.fixture
+def db(client):
+    from app.database import SessionLocal
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def user_id():
+    """A user nobody else in the test session uploads for"""
+    return next(_user_ids)
+
+@pytest.fixture
+def upload(client, user_id):
+    """Upload one file through /resumes/upload; returns the response"""
+    def upload_file(filename: str, content=None, owner=None, params=None):
+        if content is None:
+            content = resume_text(filename.rsplit(".", 1)[0])
+        if isinstance(content, str):
+            content = content.encode()
+        return client.post(
+            "/api/resumes/upload",
+            params={"user_id": owner or user_id, **(params or {})},
+            files={"file": (filename, content)}
+        )
+    return upload_file
+
+@pytest.fixture
+def create_job(client, user_id):
+    def create(description: str = JOB_DESCRIPTION, title: str = "Backend Engineer"):
+        response = client.post("/api/jobs/create", json={"user_id": user_id, "title": title, "description": description})
+        assert response.status_code == 200, response.text
+        return response.json()["id"]
+    return create
@@ -0,0 +1,96 @@
+"""Sample documents for the tests, built in memory so no real resumes are needed"""
+
+from typing import List, Optional
+
+JOB_DESCRIPTION = """Senior Backend Engineer
+
+Required skills: Python, SQL, Docker, Kubernetes, AWS, REST APIs.
+Nice to have: Terraform, React.
+
+Responsibilities:
+- Design and build backend services and data pipelines
+- Deploy and operate services on Kubernetes in AWS
+- Review code and mentor other engineers
+
+Requirements: 5+ years of experience as a software engineer.
+Bachelor's degree in Computer Science or a related field.
+"""
+
+def resume_text(name: str, skills: str = "Python, SQL, Docker, Kubernetes, AWS", years: int = 6) -> str:
+    """A plain-text resume; the name makes its bytes (and blob) unique"""
+    slug = name.lower().replace(" ", ".")
+    return f"""{name}
+{slug}@example.com | +1 555 0100
+
+SUMMARY
+Backend engineer with {years} years of experience building APIs and data pipelines.
+
+SKILLS
+{skills}
+
+EXPERIENCE
+Software Engineer, Acme Corp (2018 - 2024)
+- Built REST APIs in Python and deployed them with Docker on Kubernetes
+- Designed SQL schemas and data pipelines on AWS
+
+PROJECTS
+Resume Ranker: a Python service that ranks candidates with SQL and Docker
+
+EDUCATION
+Bachelor of Science in Computer Science, State University (2014 - 2018)
+"""
+
+def _pdf_string(text: str) -> str:
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+def make_pdf(pages: Optional[List[str]] = None, image_pages: int = 0) -> bytes:
+    """
+    A minimal PDF: one Helvetica text page per entry of pages, then image_pages pages
+    that only draw an image (like a scan without a text layer).
+    """
+    pages = pages or []
+    objects = {1: "<< /Type /Catalog /Pages 2 0 R >>", 3: "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"}
+    streams = {}
+    page_ids = []
+    next_id = 4
+
+    image_id = None
+    if image_pages:
+        image_id = next_id
+        next_id += 1
+        streams[image_id] = ("/Type /XObject /Subtype /Image /Width 2 /Height 2 /ColorSpace /DeviceGray "
+                             "/BitsPerComponent 8", b"\x00\xff\xff\x00")
+
+    for text in pages + [None] * image_pages:
+        page_id, content_id = next_id, next_id + 1
+        next_id += 2
+        if text is None:
+            resources = f"<< /XObject << /Im1 {image_id} 0 R >> >>"
+            content = b"q 612 0 0 792 0 0 cm /Im1 Do Q"
+        else:
+            resources = "<< /Font << /F1 3 0 R >> >>"
+            lines = " T* ".join(f"{_pdf_string(line)} Tj" for line in text.splitlines())
+            content = f"BT /F1 11 Tf 14 TL 50 760 Td {lines} ET".encode("latin-1")
+        objects[page_id] = (f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                            f"/Resources {resources} /Contents {content_id} 0 R >>")
+        streams[content_id] = ("", content)
+        page_ids.append(page_id)
+
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[2] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = {}
+    for number in range(1, next_id):
+        offsets[number] = len(out)
+        if number in streams:
+            attrs, data = streams[number]
+            out += f"{number} 0 obj\n<< {attrs} /Length {len(data)} >>\nstream\n".encode() + data + b"\nendstream\nendobj\n"
+        else:
+            out += f"{number} 0 obj\n{objects[number]}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {next_id}\n0000000000 65535 f \n".encode()
+    for number in range(1, next_id):
+        out += f"{offsets[number]:010d} 00000 n \n".encode()
+    out += f"trailer\n<< /Size {next_id} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
@@ -0,0 +1,25 @@
+"""
+Tasks for the sandbox tests. They run in the worker processes, which import this
+module under their memory limit: keep it free of heavy imports.
+"""
+
+import os
+import time
+
+def pid():
+    return os.getpid()
+
+def sleep(seconds):
+    time.sleep(seconds)
+
+def allocate(mb):
+    return len(bytearray(mb * 1024 * 1024))
+
+def exit_with(code):
+    os._exit(code)
+
+def fail(*args):
+    raise ValueError("bad input")
+
+def crash(*args):
+    os._exit(1)
@@ -0,0 +1,58 @@
+import pytest
+
+@pytest.fixture
+def pair(upload, create_job):
+    return upload("Detail Candidate.txt").json()["id"], create_job()
+
+def _analyze(client, resume_id, job_id, detail):
+    return client.post(
+        "/api/analysis/analyze-resume-job",
+        params={"fields": "full"},
+        json={"resume_id": resume_id, "job_id": job_id, "detail": detail}
+    )
+
+@pytest.mark.parametrize("path, body", [
+    ("/api/analysis/analyze-resume-job", {"resume_id": 1, "job_id": 1, "detail": "everything"}),
+    ("/api/analysis/bulk-analyze", {"resume_ids": [1], "job_id": 1, "detail": "everything"}),
+])
+def test_unknown_detail_level_is_400(client, path, body):
+    assert client.post(path, json=body).status_code == 400
+
+def test_unknown_resume_or_job_is_404(client, pair):
+    resume_id, job_id = pair
+    assert _analyze(client, 10 ** 9, job_id, "score").status_code == 404
+    assert _analyze(client, resume_id, 10 ** 9, "score").status_code == 404
+
+def test_detail_levels_only_build_what_they_return(client, pair):
+    resume_id, job_id = pair
+    score = _analyze(client, resume_id, job_id, "score").json()
+    summary = _analyze(client, resume_id, job_id, "summary").json()
+    full = _analyze(client, resume_id, job_id, "full").json()
+
+    assert score["overall_score"] == summary["overall_score"] == full["overall_score"]
+    assert not score.get("explanation") and not score.get("improvements")
+    assert summary["explanation"] and not summary.get("improvements")
+    assert full["explanation"] and full["improvements"]
+
+def test_explain_rebuilds_the_narrative_of_a_score_only_run(client, pair):
+    resume_id, job_id = pair
+    full = _analyze(client, resume_id, job_id, "full").json()
+    run_id = _analyze(client, resume_id, job_id, "score").json()["run_id"]
+
+    response = client.get(f"/api/analysis/{run_id}/{resume_id}/explain")
+    assert response.status_code == 200
+    explained = response.json()
+    assert explained["overall_score"] == full["overall_score"]
+    assert explained["explanation"] == full["explanation"]
+    assert explained["improvements"] == full["improvements"]
+
+def test_explain_unknown_run_is_404(client, pair):
+    resume_id, _ = pair
+    assert client.get(f"/api/analysis/no-such-run/{resume_id}/explain").status_code == 404
+
+def test_bulk_score_run_can_be_explained_per_resume(client, pair):
+    resume_id, job_id = pair
+    bulk = client.post("/api/analysis/bulk-analyze", json={"resume_ids": [resume_id], "job_id": job_id, "detail": "score"})
+    assert bulk.status_code == 200
+    run_id = bulk.json()["run_id"]
+    assert client.get(f"/api/analysis/{run_id}/{resume_id}/explain").json()["explanation"]
@@ -0,0 +1,114 @@
+import io
+import os
+import tarfile
+import zipfile
+import pytest
+from app.config import settings
+from app.services.archive_reader import ArchiveError, ArchiveReader, archive_format
+from tests.helpers import resume_text
+
+def _zip(members) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, data in members:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+def _tar(members, mode: str = "w:gz") -> bytes:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode=mode) as archive:
+        for name, data in members:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            archive.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+def _read(content: bytes, filename: str):
+    """Every member of an archive, with the staged files' bytes"""
+    members = []
+    for member in ArchiveReader(io.BytesIO(content), filename):
+        data = None
+        if member.staged:
+            with member.staged, open(member.staged.path, "rb") as f:
+                data = f.read()
+        members.append((member.filename, data, member.error))
+    return members
+
+def _upload_archive(client, user_id, filename, content):
+    return client.post("/api/resumes/archive-upload", params={"user_id": user_id}, files={"file": (filename, content)})
+
+@pytest.mark.parametrize("filename, expected", [
+    ("batch.zip", "zip"), ("batch.TAR.GZ", "tar"), ("batch.tgz", "tar"), ("batch.tar.xz", "tar"), ("batch.rar", None)
+])
+def test_archive_format(filename, expected):
+    assert archive_format(filename) == expected
+
+def test_members_are_staged_under_their_base_names():
+    members = _read(_zip([
+        ("agency/alice.txt", b"alice"), ("../../escape.txt", b"escape"), ("__MACOSX/._alice.txt", b"fork"),
+        (".DS_Store", b"hidden"), ("notes.exe", b"binary"), ("agency/", b""),
+    ]), "batch.zip")
+    assert members == [
+        ("alice.txt", b"alice", None), ("escape.txt", b"escape", None), ("notes.exe", None, "Invalid file type '.exe'"),
+    ]
+
+def test_tar_members_stream_in_order():
+    members = _read(_tar([("a.txt", b"first"), ("b.txt", b"second")], "w:bz2"), "batch.tar.bz2")
+    assert [(name, data) for name, data, _ in members] == [("a.txt", b"first"), ("b.txt", b"second")]
+
+def test_oversized_members_fail_alone(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", 10)
+    members = _read(_zip([("big.txt", b"x" * 11), ("small.txt", b"small")]), "batch.zip")
+    assert members[0][2].startswith("File exceeds") and members[1] == ("small.txt", b"small", None)
+
+def test_too_many_members(monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_MAX_MEMBERS", 2)
+    members = [(f"{n}.txt", b"resume") for n in range(3)]
+    with pytest.raises(ArchiveError, match="more than 2 members"):
+        _read(_zip(members), "batch.zip")
+    # TAR has no directory up front: the members before the limit are read
+    reader = iter(ArchiveReader(io.BytesIO(_tar(members)), "batch.tgz"))
+    for _ in range(2):
+        next(reader).staged.close()
+    with pytest.raises(ArchiveError):
+        next(reader)
+
+@pytest.mark.parametrize("content, filename", [
+    (_zip([("bomb.txt", b"\0" * 3 * 1024 * 1024)]), "bomb.zip"),
+    (_tar([("bomb.txt", b"\0" * 3 * 1024 * 1024)]), "bomb.tar.gz"),
+])
+def test_zip_bombs_are_stopped_by_their_expansion(content, filename):
+    with pytest.raises(ArchiveError, match="possible zip bomb"):
+        _read(content, filename)
+
+def test_total_expansion_limit(monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_MAX_TOTAL_MB", 1)
+    random_text = os.urandom(700 * 1024)
+    with pytest.raises(ArchiveError, match="more than 1 MB"):
+        _read(_zip([("a.txt", random_text), ("b.txt", random_text)]), "batch.zip")
+
+@pytest.mark.parametrize("content", [b"not an archive", _zip([("a.txt", b"a")])[:40]])
+def test_unreadable_archives(content):
+    with pytest.raises(ArchiveError):
+        _read(content, "broken.zip")
+
+def test_archive_upload(client, user_id):
+    content = _tar([
+        ("resumes/Archive One.txt", resume_text("Archive One").encode()),
+        ("resumes/Archive Two.txt", resume_text("Archive Two").encode()),
+        ("resumes/photo.png", b"png"),
+    ])
+    body = _upload_archive(client, user_id, "resumes.tar.gz", content).json()
+    assert (body["total_files"], body["successful"], body["failed"]) == (3, 2, 1)
+    assert sorted(r["filename"] for r in body["results"]) == ["Archive One.txt", "Archive Two.txt"]
+    assert body["archive"]["members"] == 3 and body["archive"]["stopped"] is None
+
+def test_archive_upload_reports_where_it_stopped(client, user_id, monkeypatch):
+    monkeypatch.setattr(settings, "ARCHIVE_MAX_MEMBERS", 1)
+    content = _tar([("Cut One.txt", resume_text("Cut One").encode()), ("Cut Two.txt", resume_text("Cut Two").encode())])
+    body = _upload_archive(client, user_id, "cut.tgz", content).json()
+    assert body["successful"] == 1 and "more than 1 members" in body["archive"]["stopped"]
+
+@pytest.mark.parametrize("filename, content", [("resumes.rar", b"rar"), ("resumes.zip", b"not a zip")])
+def test_rejected_archive_uploads(client, user_id, filename, content):
+    assert _upload_archive(client, user_id, filename, content).status_code == 400
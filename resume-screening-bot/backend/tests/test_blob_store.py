@@ -0,0 +1,70 @@
+import hashlib
+import io
+import os
+from unittest import mock
+from app.models.models import StoredBlob
+from app.services import resume_writer as resume_writer_module
+from app.services.blob_store import BlobStore, FileSystemBackend, blob_store
+from app.utils.write_queue import write_queue
+from tests.helpers import resume_text
+
+def _blob(db, sha256):
+    db.expire_all()
+    return db.get(StoredBlob, sha256)
+
+def _path(sha256):
+    return blob_store.backend.local_path(blob_store.key(sha256))
+
+def test_identical_uploads_share_one_blob(client, db, upload, user_id):
+    content = resume_text(f"Shared {user_id}")
+    first = upload("Shared A.txt", content).json()["id"]
+    second = upload("Shared B.txt", content).json()["id"]
+    sha256 = hashlib.sha256(content.encode()).hexdigest()
+
+    assert _blob(db, sha256).refcount == 2 and os.path.exists(_path(sha256))
+    client.delete(f"/api/resumes/{first}")
+    assert _blob(db, sha256).refcount == 1 and os.path.exists(_path(sha256))
+    # The last reference is gone: the purge runs as a background task after the response
+    client.delete(f"/api/resumes/{second}")
+    assert _blob(db, sha256) is None and not os.path.exists(_path(sha256))
+
+def test_failed_insert_does_not_leave_the_file_behind(client, db, upload, user_id):
+    content = resume_text(f"Failed Insert {user_id}")
+    sha256 = hashlib.sha256(content.encode()).hexdigest()
+    with mock.patch.object(resume_writer_module.resume_writer, "insert_async", side_effect=RuntimeError("disk full")):
+        assert upload("Failed Insert.txt", content).status_code == 500
+    assert _blob(db, sha256) is None and not os.path.exists(_path(sha256))
+
+def test_staging_hashes_while_streaming(tmp_path):
+    store = BlobStore(FileSystemBackend(str(tmp_path)))
+    with store.stage(io.BytesIO(b"x" * 3_000_000), ".pdf") as staged:
+        assert staged.size == 3_000_000 and staged.path.endswith(".pdf")
+        assert staged.sha256 == store.describe(staged.path).sha256
+        sha256 = store.store(staged)
+        assert os.path.getsize(store.backend.local_path(store.key(sha256))) == 3_000_000
+        staged_path = staged.path
+    assert not os.path.exists(staged_path)
+
+def test_purge_keeps_referenced_blobs_and_add_ref_restores_missing_bytes(client, db):
+    with blob_store.stage(io.BytesIO(b"referenced blob bytes"), ".txt") as staged:
+        sha256 = blob_store.store(staged)
+        write_queue.run(lambda writer: blob_store.add_ref(writer, sha256, staged))
+        blob_store.purge(sha256)
+        assert _blob(db, sha256).refcount == 1 and os.path.exists(_path(sha256))
+
+        # Released but not purged yet, and the bytes went missing meanwhile
+        write_queue.run(lambda writer: blob_store.release(writer, sha256))
+        os.remove(_path(sha256))
+        write_queue.run(lambda writer: blob_store.add_ref(writer, sha256, staged))
+        assert os.path.exists(_path(sha256))
+
+    assert write_queue.run(lambda writer: blob_store.release(writer, sha256)) is True
+    blob_store.purge(sha256)
+    assert _blob(db, sha256) is None and not os.path.exists(_path(sha256))
+
+def test_add_refs_counts_duplicates_in_one_batch(client, db):
+    with blob_store.stage(io.BytesIO(b"batched blob one")) as one, blob_store.stage(io.BytesIO(b"batched blob two")) as two:
+        write_queue.run(lambda writer: blob_store.add_refs(writer, [one, two, one]))
+        assert _blob(db, one.sha256).refcount == 2 and _blob(db, two.sha256).refcount == 1
+        write_queue.run(lambda writer: blob_store.add_refs(writer, [two]))
+        assert _blob(db, two.sha256).refcount == 2
@@ -0,0 +1,40 @@
+import asyncio
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from app import database
+from app.config import settings
+
+def test_async_url_swaps_the_driver(monkeypatch):
+    monkeypatch.setattr(settings, "ASYNC_DATABASE_URL", "")
+    assert database._async_url("sqlite:///./test.db").drivername == "sqlite+aiosqlite"
+    url = database._async_url("postgresql://user:secret@db/resumes")
+    assert url.drivername == "postgresql+asyncpg"
+    assert url.query["prepared_statement_cache_size"] == str(settings.DB_STATEMENT_CACHE_SIZE)
+
+def test_explicit_async_url_wins(monkeypatch):
+    monkeypatch.setattr(settings, "ASYNC_DATABASE_URL", "postgresql+psycopg_async://user@db/resumes")
+    assert database._async_url("sqlite:///./test.db").drivername == "postgresql+psycopg_async"
+
+def test_pool_and_connect_options():
+    assert database._pool_options(make_url("sqlite://")) == {}
+    options = database._pool_options(make_url("sqlite:///./test.db"))
+    assert options["pool_size"] == settings.DB_POOL_SIZE and options["pool_pre_ping"]
+    assert "check_same_thread" in database._connect_args(make_url("sqlite:///./test.db"))
+    assert "check_same_thread" not in database._connect_args(make_url("sqlite+aiosqlite:///./test.db"))
+    assert database._connect_args(make_url("postgresql://db/resumes")) == {}
+
+def test_async_engine_gets_the_sqlite_pragmas(client):
+    async def journal_mode():
+        async with database.async_engine.connect() as connection:
+            return (await connection.execute(text("PRAGMA journal_mode"))).scalar()
+    assert asyncio.run(journal_mode()).lower() == ("wal" if settings.SQLITE_WAL else "delete")
+
+def test_async_routes_read_committed_writes(client, upload, create_job):
+    resume_id = upload("Async Reader.txt").json()["id"]
+    assert client.get(f"/api/resumes/{resume_id}").json()["filename"] == "Async Reader.txt"
+    job_id = create_job()
+    assert client.get(f"/api/jobs/{job_id}").json()["id"] == job_id
+
+def test_async_routes_404(client):
+    assert client.get("/api/resumes/999999999").status_code == 404
+    assert client.get("/api/jobs/999999999").status_code == 404
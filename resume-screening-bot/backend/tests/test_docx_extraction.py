@@ -0,0 +1,89 @@
+import zipfile
+import docx
+import pytest
+from app.services.docx_extraction import iter_docx_lines
+from app.services.resume_parser import ResumeParser
+
+W = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+
+def _raw_docx(path, body: str) -> str:
+    """A .docx holding just word/document.xml with this body markup"""
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", f'<w:document xmlns:w="{W}"><w:body>{body}</w:body></w:document>')
+    return str(path)
+
+def _run(text: str) -> str:
+    return f'<w:r><w:t xml:space="preserve">{text}</w:t></w:r>'
+
+@pytest.fixture
+def resume_docx(tmp_path):
+    document = docx.Document()
+    document.add_paragraph("Jane Doe")
+    document.add_paragraph("")
+    document.add_paragraph("SKILLS")
+    skills = document.add_table(rows=1, cols=3)
+    for cell, skill in zip(skills.rows[0].cells, ("Python", "SQL", "Docker")):
+        cell.text = skill
+    layout = document.add_table(rows=1, cols=2)
+    layout.rows[0].cells[0].text = "EXPERIENCE\nAcme Corp"
+    layout.rows[0].cells[1].text = "EDUCATION\nState University"
+    merged = document.add_table(rows=1, cols=3)
+    merged.rows[0].cells[0].merge(merged.rows[0].cells[1]).text = "Merged"
+    merged.rows[0].cells[2].text = "Cell"
+    document.add_paragraph("Last line")
+    path = tmp_path / "resume.docx"
+    document.save(path)
+    return str(path)
+
+def test_paragraphs_and_tables_in_document_order(resume_docx):
+    assert list(iter_docx_lines(resume_docx)) == [
+        "Jane Doe", "", "SKILLS",
+        "Python | SQL | Docker",
+        "EXPERIENCE", "Acme Corp", "EDUCATION", "State University",
+        "Merged | Cell",
+        "Last line",
+    ]
+
+def test_runs_map_like_python_docx(tmp_path):
+    path = _raw_docx(tmp_path / "runs.docx", (
+        f'<w:p>{_run("Name")}<w:r><w:tab/></w:r>{_run("Doe")}</w:p>'
+        f'<w:p>{_run("first")}<w:r><w:br/></w:r>{_run("second")}<w:r><w:br w:type="page"/></w:r></w:p>'
+        f'<w:p>{_run("full")}<w:r><w:noBreakHyphen/></w:r>{_run("stack")}</w:p>'
+    ))
+    assert list(iter_docx_lines(path)) == ["Name\tDoe", "first\nsecond", "full-stack"]
+
+def test_text_python_docx_misses_is_read(tmp_path):
+    path = _raw_docx(tmp_path / "extras.docx", (
+        f'<w:p><w:hyperlink>{_run("github.com/jane")}</w:hyperlink></w:p>'
+        f'<w:p><w:ins>{_run("inserted")}</w:ins><w:del><w:r><w:delText>deleted</w:delText></w:r></w:del></w:p>'
+        f'<w:p><w:sdt><w:sdtContent>{_run("content control")}</w:sdtContent></w:sdt></w:p>'
+    ))
+    assert list(iter_docx_lines(path)) == ["github.com/jane", "inserted", "content control"]
+
+def test_deleted_revisions_and_drawing_fallbacks_are_skipped(tmp_path):
+    mc = "http://schemas.openxmlformats.org/markup-compatibility/2006"
+    path = _raw_docx(tmp_path / "skipped.docx", (
+        f'<w:p xmlns:mc="{mc}">{_run("kept")}<w:r><mc:AlternateContent>'
+        f'<mc:Fallback><w:p>{_run("legacy copy")}</w:p></mc:Fallback></mc:AlternateContent></w:r></w:p>'
+        f'<w:moveFrom><w:p>{_run("moved away")}</w:p></w:moveFrom>'
+    ))
+    assert list(iter_docx_lines(path)) == ["kept"]
+
+def test_entities_are_not_expanded(tmp_path):
+    path = tmp_path / "entities.docx"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("word/document.xml", (
+            f'<!DOCTYPE w:document [<!ENTITY boom "expanded">]>'
+            f'<w:document xmlns:w="{W}"><w:body><w:p>{_run("&boom;")}</w:p></w:body></w:document>'
+        ))
+    assert "expanded" not in "".join(iter_docx_lines(str(path)))
+
+def test_parser_reads_docx_through_the_stream(resume_docx):
+    text = ResumeParser.extract_text_from_docx(resume_docx)
+    assert "Python | SQL | Docker" in text and text.index("Jane Doe") < text.index("Last line")
+
+def test_docx_uploads(client, upload, resume_docx):
+    with open(resume_docx, "rb") as f:
+        response = upload("Docx Candidate.docx", f.read())
+    assert response.status_code == 200, response.text
+    assert upload("Broken.docx", b"not a zip archive").status_code == 400
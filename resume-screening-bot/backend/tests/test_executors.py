@@ -0,0 +1,41 @@
+import asyncio
+import os
+import threading
+import time
+import pytest
+from app.utils.executors import run_blocking, run_in_process
+
+def _fail(message: str):
+    raise ValueError(message)
+
+def test_run_blocking_leaves_the_event_loop_thread():
+    async def main():
+        return threading.get_ident(), await run_blocking(threading.get_ident)
+    loop_thread, worker_thread = asyncio.run(main())
+    assert loop_thread != worker_thread
+
+def test_run_blocking_propagates_errors():
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(run_blocking(_fail, "boom"))
+
+def test_run_in_process_uses_another_process_and_propagates_errors():
+    assert asyncio.run(run_in_process(os.getpid)) != os.getpid()
+    with pytest.raises(ValueError, match="bad file"):
+        asyncio.run(run_in_process(_fail, "bad file"))
+
+def test_event_loop_keeps_running_during_process_work():
+    async def main():
+        ticks = 0
+        task = asyncio.ensure_future(run_in_process(time.sleep, 0.5))
+        while not task.done():
+            await asyncio.sleep(0.01)
+            ticks += 1
+        await task
+        return ticks
+    # A blocked loop would tick once or twice; a free one about 50 times
+    assert asyncio.run(main()) > 10
+
+def test_upload_rejects_unsupported_types(upload):
+    response = upload("resume.exe", b"MZ")
+    assert response.status_code == 400
+    assert "Invalid file type" in response.json()["detail"]
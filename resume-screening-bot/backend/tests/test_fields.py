@@ -0,0 +1,58 @@
+from app.utils.fields import BULK_ANALYSIS_COMPACT_FIELDS, resolve_fields, select_fields, to_columns
+
+def test_resolve_fields():
+    assert resolve_fields(None, ["a"]) == ["a"]
+    assert resolve_fields("compact", ["a"]) == ["a"]
+    assert resolve_fields(None) is None
+    assert resolve_fields("full", ["a"]) is None
+    assert resolve_fields(" id, ,skill_match.score ") == ["id", "skill_match.score"]
+
+def test_select_fields_keeps_requested_paths_only():
+    payload = {"id": 1, "skill_match": {"score": 80, "matched": ["python"]}, "name": "x"}
+    assert select_fields(payload, ["id", "skill_match.score", "unknown"]) == {"id": 1, "skill_match": {"score": 80}}
+    assert select_fields(payload, None) is payload
+
+def test_to_columns_sends_names_once_and_fills_gaps_with_null():
+    items = [{"id": 1, "score": 50, "nested": {"a": 1}}, {"id": 2, "error": "failed"}]
+    table = to_columns(items, ["id", "score", "nested.a", "error", "never_present"])
+    assert table == {
+        "columns": ["id", "score", "nested.a", "error"],
+        "rows": [[1, 50, 1, None], [2, None, None, "failed"]]
+    }
+    assert to_columns([], ["id"]) == {"columns": [], "rows": []}
+
+def test_bulk_upload_compact_drops_parsed_data(client, user_id):
+    files = [("files", ("Fields Bulk A.txt", b"Fields Bulk A\nSkills: Python, SQL\nExperience: engineer")),
+             ("files", ("Fields Bulk B.txt", b"Fields Bulk B\nSkills: Go, Docker\nExperience: developer"))]
+    compact = client.post("/api/resumes/bulk-upload", params={"user_id": user_id}, files=files).json()
+    assert compact["results"] and all("parsed_data" not in item for item in compact["results"])
+
+def test_bulk_analyze_tables(client, upload, create_job):
+    resume_ids = [upload(f"Fields Candidate {i}.txt").json()["id"] for i in range(2)]
+    body = {"resume_ids": resume_ids + [10 ** 9], "job_id": create_job()}
+
+    compact = client.post("/api/analysis/bulk-analyze", json=body).json()
+    assert "results" not in compact
+    assert set(compact["columns"]) <= set(BULK_ANALYSIS_COMPACT_FIELDS)
+    assert "explanation" not in compact["columns"] and "improvements" not in compact["columns"]
+    assert len(compact["rows"]) == 2 and all(len(row) == len(compact["columns"]) for row in compact["rows"])
+    scores = [row[compact["columns"].index("overall_score")] for row in compact["rows"]]
+    assert scores == sorted(scores, reverse=True)
+
+    chosen = client.post("/api/analysis/bulk-analyze", params={"fields": "resume_id,overall_score"}, json=body).json()
+    assert chosen["columns"] == ["resume_id", "overall_score"]
+
+    full = client.post("/api/analysis/bulk-analyze", params={"fields": "full"}, json=body).json()
+    assert "columns" not in full and {"explanation", "improvements"} <= set(full["results"][0])
+
+def test_single_analysis_and_resume_fields(client, upload, create_job):
+    resume_id = upload("Fields Single.txt").json()["id"]
+    response = client.post(
+        "/api/analysis/analyze-resume-job",
+        params={"fields": "overall_score,skill_match.score"},
+        json={"resume_id": resume_id, "job_id": create_job()}
+    ).json()
+    assert set(response) == {"overall_score", "skill_match"} and set(response["skill_match"]) == {"score"}
+
+    resume = client.get(f"/api/resumes/{resume_id}", params={"fields": "id,filename"}).json()
+    assert resume == {"id": resume_id, "filename": "Fields Single.txt"}
@@ -0,0 +1,73 @@
+import hashlib
+import json
+import pytest
+from app.ingest import FolderImporter
+from app.models.models import Resume
+from app.services.quarantine import quarantine
+from tests.helpers import make_pdf, resume_text
+
+SCAN = make_pdf(image_pages=4)
+
+@pytest.fixture
+def tree(client, tmp_path, user_id):
+    root = tmp_path / "resumes"
+    for relative, content in {
+        "a/One.txt": resume_text(f"Ingest One {user_id}"),
+        "a/Two.txt": resume_text(f"Ingest Two {user_id}"),
+        "b/Copy of One.txt": resume_text(f"Ingest One {user_id}"),
+        "b/Blank.txt": "",
+        "c/Scan.pdf": SCAN,
+        ".git/Hidden.txt": resume_text(f"Hidden {user_id}"),
+        "notes.exe": "binary",
+    }.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content if isinstance(content, bytes) else content.encode())
+    yield root
+    quarantine.release(hashlib.sha256(SCAN).hexdigest())
+
+def _importer(tree, tmp_path, user_id) -> FolderImporter:
+    return FolderImporter(str(tree), user_id=user_id, batch_size=2, checkpoint_path=str(tmp_path / "ingest.json"),
+                          match=False)
+
+def _checkpoint(tmp_path) -> dict:
+    with open(tmp_path / "ingest.json") as f:
+        return json.load(f)
+
+def test_walk_is_stable_and_skips_what_is_not_a_resume(tree, tmp_path, user_id):
+    walked = [path[len(str(tree)) + 1:] for path in _importer(tree, tmp_path, user_id).walk()]
+    assert walked == ["a/One.txt", "a/Two.txt", "b/Blank.txt", "b/Copy of One.txt", "c/Scan.pdf"]
+
+def test_import_dedups_quarantines_and_reports(client, db, tree, tmp_path, user_id):
+    stats = _importer(tree, tmp_path, user_id).run()
+    assert dict(stats) == {"files": 5, "imported": 2, "duplicates": 1, "quarantined": 1, "failed": 1}
+    assert sorted(name for (name,) in db.query(Resume.filename).filter(Resume.user_id == user_id)) == ["One.txt", "Two.txt"]
+
+    checkpoint = _checkpoint(tmp_path)
+    assert checkpoint["finished"] and checkpoint["position"] == 5
+    assert checkpoint["errors"]["Could not extract text from file"]["examples"] == ["b/Blank.txt"]
+
+def test_an_interrupted_import_resumes_after_its_last_batch(client, db, tree, tmp_path, user_id, monkeypatch):
+    finish = FolderImporter._finish
+    calls = []
+
+    def interrupted(self, *args):
+        calls.append(1)
+        if len(calls) == 2:
+            raise KeyboardInterrupt
+        finish(self, *args)
+    monkeypatch.setattr(FolderImporter, "_finish", interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        _importer(tree, tmp_path, user_id).run()
+    assert _checkpoint(tmp_path)["position"] == 2 and not _checkpoint(tmp_path)["finished"]
+
+    monkeypatch.setattr(FolderImporter, "_finish", finish)
+    stats = _importer(tree, tmp_path, user_id).run()
+    # Counts carry over from the checkpoint; the first batch is not walked again
+    assert dict(stats) == {"files": 5, "imported": 2, "duplicates": 1, "quarantined": 1, "failed": 1}
+    assert db.query(Resume).filter(Resume.user_id == user_id).count() == 2
+
+def test_rerunning_a_finished_import_only_finds_duplicates(client, tree, tmp_path, user_id):
+    _importer(tree, tmp_path, user_id).run()
+    stats = _importer(tree, tmp_path, user_id).run()
+    assert stats["imported"] == 0 and stats["duplicates"] == 3
@@ -0,0 +1,78 @@
+from unittest import mock
+import pytest
+from app.models.models import JobMatch
+from app.services.match_index import MatchIndex, match_index
+
+def _scores(db, job_id):
+    return {row.resume_id: row.score for row in db.query(JobMatch).filter(JobMatch.job_id == job_id)}
+
+def test_new_job_is_scored_against_existing_resumes(client, db, upload, create_job):
+    resume_ids = [upload(f"Index Candidate {i}.txt").json()["id"] for i in range(2)]
+    job_id = create_job()
+    assert set(resume_ids) <= set(_scores(db, job_id))
+
+    candidates = client.get(f"/api/jobs/{job_id}/top-candidates", params={"limit": 500}).json()["candidates"]
+    scores = [candidate["score"] for candidate in candidates]
+    assert scores == sorted(scores, reverse=True)
+
+def test_new_resume_is_scored_against_existing_jobs(db, upload, create_job):
+    job_id = create_job()
+    resume_id = upload("Late Candidate.txt").json()["id"]
+    assert resume_id in _scores(db, job_id)
+
+def test_top_candidates_of_unknown_job_is_404(client):
+    assert client.get("/api/jobs/999999999/top-candidates").status_code == 404
+
+def test_scores_do_not_depend_on_the_chunk(db, upload, create_job):
+    for i in range(3):
+        upload(f"Chunk Candidate {i}.txt")
+    job_id = create_job()
+    one_pass = _scores(db, job_id)
+
+    MatchIndex(chunk_size=1).refresh_job(job_id)
+    db.expire_all()
+    assert _scores(db, job_id) == one_pass
+
+def test_failed_refresh_keeps_the_previous_scores(db, upload, create_job):
+    for i in range(3):
+        upload(f"Refresh Candidate {i}.txt")
+    job_id = create_job()
+    before = _scores(db, job_id)
+
+    index = MatchIndex(chunk_size=1)
+    calls = []
+    real_score_matrix = index.scorer.score_matrix
+
+    def fail_on_second_chunk(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 2:
+            raise RuntimeError("scorer crashed")
+        return real_score_matrix(*args, **kwargs)
+
+    with mock.patch.object(index.scorer, "score_matrix", side_effect=fail_on_second_chunk):
+        index.refresh_job(job_id)
+    db.expire_all()
+    assert _scores(db, job_id) == before
+
+def test_refresh_drops_rows_of_deleted_resumes(client, db, upload, create_job):
+    resume_id = upload("Deleted Candidate.txt").json()["id"]
+    job_id = create_job()
+    # A row left behind by a resume removed without going through the API
+    db.execute(JobMatch.__table__.insert().values(job_id=job_id, resume_id=10 ** 9, score=99.0, components={}))
+    db.commit()
+
+    match_index.refresh_job(job_id)
+    db.expire_all()
+    scores = _scores(db, job_id)
+    assert resume_id in scores and 10 ** 9 not in scores
+
+def test_deleting_a_resume_or_job_removes_its_rows(client, db, upload, create_job):
+    resume_id = upload("Removed Candidate.txt").json()["id"]
+    job_id = create_job()
+    assert client.delete(f"/api/resumes/{resume_id}").status_code == 200
+    db.expire_all()
+    assert resume_id not in _scores(db, job_id)
+
+    assert client.delete(f"/api/jobs/{job_id}").status_code == 200
+    db.expire_all()
+    assert _scores(db, job_id) == {}
@@ -0,0 +1,65 @@
+import io
+import numpy as np
+import pytest
+from app.services.match_matrix import MatchMatrixScorer
+from tests.helpers import JOB_DESCRIPTION, resume_text
+
+@pytest.fixture
+def pool(upload, create_job):
+    resume_ids = [upload(f"Matrix Candidate {i}.txt").json()["id"] for i in range(3)]
+    job_ids = [create_job(), create_job("Frontend developer: React, TypeScript, CSS and accessibility testing.")]
+    return resume_ids, job_ids
+
+def test_rejects_unknown_format(client, pool):
+    resume_ids, job_ids = pool
+    response = client.post("/api/analysis/matrix", json={"resume_ids": resume_ids, "job_ids": job_ids, "format": "csv"})
+    assert response.status_code == 400
+
+@pytest.mark.parametrize("body", [{"resume_ids": [], "job_ids": [1]}, {"resume_ids": [1], "job_ids": []}])
+def test_requires_both_id_lists(client, body):
+    assert client.post("/api/analysis/matrix", json=body).status_code == 400
+
+def test_unknown_ids_only_is_404(client):
+    response = client.post("/api/analysis/matrix", json={"resume_ids": [10 ** 9], "job_ids": [10 ** 9], "format": "json"})
+    assert response.status_code == 404
+
+def test_json_keeps_request_order_and_drops_unknown_ids(client, pool):
+    resume_ids, job_ids = pool
+    requested = [resume_ids[2], 10 ** 9, resume_ids[0], resume_ids[2]]
+    response = client.post("/api/analysis/matrix", json={
+        "resume_ids": requested, "job_ids": job_ids[::-1], "format": "json", "include_components": True
+    })
+    assert response.status_code == 200
+    body = response.json()
+    assert body["resume_ids"] == [resume_ids[2], resume_ids[0]]
+    assert body["job_ids"] == job_ids[::-1]
+    for name in ("overall",) + MatchMatrixScorer.COMPONENTS:
+        assert np.array(body[name]).shape == (2, 2)
+    assert all(0 <= score <= 100 for row in body["overall"] for score in row)
+
+def test_npz_matches_json(client, pool):
+    resume_ids, job_ids = pool
+    request = {"resume_ids": resume_ids, "job_ids": job_ids}
+    response = client.post("/api/analysis/matrix", json=request)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    arrays = np.load(io.BytesIO(response.content))
+    assert set(arrays.files) == {"resume_ids", "job_ids", "overall"}
+    as_json = client.post("/api/analysis/matrix", json={**request, "format": "json"}).json()
+    assert arrays["resume_ids"].tolist() == as_json["resume_ids"]
+    np.testing.assert_allclose(arrays["overall"], as_json["overall"], atol=0.01)
+
+def test_scorer_handles_empty_inputs():
+    scorer = MatchMatrixScorer()
+    matrices = scorer.score_matrix([], [JOB_DESCRIPTION])
+    assert matrices["overall"].shape == (0, 1)
+    matrices = scorer.score_matrix([{"parsed_data": {}, "raw_text": resume_text("Empty Jobs")}], [])
+    assert matrices["overall"].shape == (1, 0)
+
+def test_scorer_tolerates_missing_data():
+    matrices = MatchMatrixScorer().score_matrix(
+        [{"parsed_data": None, "raw_text": None}, {"parsed_data": {}, "raw_text": resume_text("No Parse")}],
+        [JOB_DESCRIPTION, ""]
+    )
+    assert matrices["overall"].shape == (2, 2)
+    assert np.isfinite(matrices["overall"]).all()
@@ -0,0 +1,66 @@
+import os
+import time
+import pdfplumber
+import pytest
+from app.services import pdf_extraction
+from app.services.pdf_extraction import PdfTextExtractor
+from app.utils.page_cache import PageTextCache, page_fingerprint
+from tests.helpers import make_pdf
+
+@pytest.fixture
+def cache(tmp_path):
+    return PageTextCache(str(tmp_path / "page_cache"), memory_items=2)
+
+def test_entries_survive_the_memory_lru(cache):
+    for key in ("aa01", "aa02", "aa03"):
+        cache.set(key, f"text of {key}")
+    assert len(cache._memory) == 2
+    # Evicted from memory, read back from disk
+    assert cache.get("aa01") == "text of aa01"
+    assert cache.get("missing") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+@pytest.mark.parametrize("entry", [b"zlib\nnot zlib data", b"zstd\n\x28\xb5\x2f\xfd truncated", b"identity\n\xff\xfe"])
+def test_a_corrupt_entry_is_a_miss_and_is_dropped(cache, entry):
+    path = cache._path("bb01")
+    os.makedirs(os.path.dirname(path))
+    with open(path, "wb") as f:
+        f.write(entry)
+    assert cache.get("bb01") is None and cache.misses == 1
+    assert not os.path.exists(path)
+
+def test_disabled_cache_stores_nothing(tmp_path):
+    cache = PageTextCache(str(tmp_path), enabled=False)
+    cache.set("cc01", "text")
+    assert cache.get("cc01") is None and not os.listdir(tmp_path)
+
+def test_prune_removes_only_old_entries(cache):
+    cache.set("dd01", "old")
+    cache.set("dd02", "new")
+    old = time.time() - 40 * 86400
+    os.utime(cache._path("dd01"), (old, old))
+    assert cache.prune(max_age_days=30) == 1
+    assert os.path.exists(cache._path("dd02"))
+
+def _fingerprints(tmp_path, name, pages):
+    path = tmp_path / name
+    path.write_bytes(make_pdf(pages))
+    with pdfplumber.open(str(path)) as pdf:
+        return [page_fingerprint(page, "salt") for page in pdf.pages]
+
+def test_only_edited_pages_change_their_fingerprint(tmp_path):
+    original = _fingerprints(tmp_path, "v1.pdf", ["Jane Doe\nPython", "Experience\nAcme Corp"])
+    edited = _fingerprints(tmp_path, "v2.pdf", ["Jane Doe\nPython, SQL", "Experience\nAcme Corp"])
+    assert original[1] == edited[1] and original[0] != edited[0]
+
+def test_unchanged_pages_are_served_from_the_cache(tmp_path, cache, monkeypatch):
+    monkeypatch.setattr(pdf_extraction, "page_cache", cache)
+    extractor = PdfTextExtractor()
+    first, second = tmp_path / "first.pdf", tmp_path / "second.pdf"
+    first.write_bytes(make_pdf(["Cached Candidate\nPython", "Experience\nAcme Corp"]))
+    second.write_bytes(make_pdf(["Cached Candidate\nPython, SQL", "Experience\nAcme Corp"]))
+
+    text, stats = extractor.extract(str(first))
+    assert stats["cached"] == 0 and "Acme Corp" in text
+    text, stats = extractor.extract(str(second))
+    assert stats["cached"] == 1 and "Python, SQL" in text and "Acme Corp" in text
@@ -0,0 +1,45 @@
+import asyncio
+import pytest
+from app.config import settings
+from app.services import page_parallel
+from app.services.page_parallel import page_ranges, parse_file
+from app.services.resume_parser import parse_resume_file
+from app.utils.sandbox import ParseAborted
+from tests import sandbox_tasks as tasks
+from tests.helpers import make_pdf
+
+@pytest.mark.parametrize("pages, workers, expected", [
+    (30, 4, [(0, 7), (7, 15), (15, 22), (22, 30)]),
+    (7, 4, [(0, 3), (3, 7)]),
+    (2, 4, [(0, 2)]),
+])
+def test_page_ranges_cover_every_page_once(pages, workers, expected):
+    assert page_ranges(pages, workers) == expected
+
+@pytest.fixture
+def long_pdf(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "PDF_PARALLEL_MIN_PAGES", 4)
+    path = tmp_path / "long.pdf"
+    path.write_bytes(make_pdf([f"Page {n}\nPublication number {n} on Python and SQL" for n in range(1, 11)]))
+    return str(path)
+
+def test_long_pdfs_are_split_across_workers(client, long_pdf):
+    parsed = asyncio.run(parse_file(long_pdf, ".pdf"))
+    assert parsed["extraction_stats"]["ranges"] == settings.PARSE_WORKERS
+    assert parsed["extraction_stats"]["pages"] == 10
+    assert parsed["raw_text"] == parse_resume_file(long_pdf, ".pdf")["raw_text"]
+
+def test_short_pdfs_are_parsed_in_one_task(client, tmp_path):
+    path = tmp_path / "short.pdf"
+    path.write_bytes(make_pdf(["Short resume\nPython and SQL"]))
+    assert "ranges" not in asyncio.run(parse_file(str(path), ".pdf"))["extraction_stats"]
+
+def test_a_failed_range_falls_back_to_serial_extraction(client, long_pdf, monkeypatch):
+    monkeypatch.setattr(page_parallel, "extract_pdf_pages", tasks.fail)
+    parsed = asyncio.run(parse_file(long_pdf, ".pdf"))
+    assert "ranges" not in parsed["extraction_stats"] and "Publication number 10" in parsed["raw_text"]
+
+def test_an_aborted_range_aborts_the_parse(client, long_pdf, monkeypatch):
+    monkeypatch.setattr(page_parallel, "extract_pdf_pages", tasks.crash)
+    with pytest.raises(ParseAborted):
+        asyncio.run(parse_file(long_pdf, ".pdf"))
@@ -0,0 +1,62 @@
+import pytest
+from app.config import settings
+from app.utils.pagination import CountCache
+
+@pytest.fixture
+def resume_ids(client, user_id):
+    files = [("files", (f"Paged {i}.txt", f"Paged Candidate {i}\nSkills: Python\nExperience: engineer".encode()))
+             for i in range(5)]
+    response = client.post("/api/resumes/bulk-upload", params={"user_id": user_id}, files=files)
+    return sorted(item["id"] for item in response.json()["results"])
+
+def _walk(client, url, **params):
+    pages, after_id = [], None
+    while True:
+        response = client.get(url, params={**params, **({"after_id": after_id} if after_id else {})})
+        assert response.status_code == 200
+        pages.append([item["id"] for item in response.json()])
+        after_id = response.headers.get("X-Next-After-Id")
+        if after_id is None:
+            return pages, int(response.headers["X-Total-Count"])
+
+def test_pages_chain_in_both_directions(client, user_id, resume_ids):
+    url = f"/api/resumes/user/{user_id}/resumes"
+    pages, total = _walk(client, url, limit=2)
+    assert pages == [resume_ids[0:2], resume_ids[2:4], resume_ids[4:]] and total == 5
+
+    pages, total = _walk(client, url, limit=2, order="desc")
+    assert pages == [resume_ids[:2:-1], resume_ids[2:0:-1], resume_ids[:1]] and total == 5
+
+def test_latest_is_a_single_row_page(client, user_id, resume_ids):
+    response = client.get(f"/api/resumes/user/{user_id}/resumes", params={"order": "desc", "limit": 1})
+    assert [item["id"] for item in response.json()] == [resume_ids[-1]]
+    assert response.headers["X-Next-After-Id"] == str(resume_ids[-1])
+
+def test_exact_last_page_has_no_next_link(client, user_id, resume_ids):
+    response = client.get(f"/api/resumes/user/{user_id}/resumes", params={"limit": 5})
+    assert len(response.json()) == 5 and "X-Next-After-Id" not in response.headers
+
+@pytest.mark.parametrize("params", [
+    {"order": "sideways"}, {"limit": 0}, {"limit": settings.LIST_MAX_PAGE_SIZE + 1}, {"after_id": -1}
+])
+def test_invalid_page_parameters_are_422(client, params):
+    assert client.get("/api/resumes/user/1/resumes", params=params).status_code == 422
+
+def test_total_follows_uploads_and_deletes(client, user_id, resume_ids, upload):
+    url = f"/api/resumes/user/{user_id}/resumes"
+    assert client.get(url).headers["X-Total-Count"] == "5"
+    upload("Paged Extra.txt")
+    assert client.get(url).headers["X-Total-Count"] == "6"
+    client.delete(f"/api/resumes/{resume_ids[0]}")
+    assert client.get(url).headers["X-Total-Count"] == "5"
+
+def test_count_cache_expires_and_invalidates():
+    cache = CountCache(ttl=60)
+    cache.set(("resumes", 1), 3)
+    assert cache.get(("resumes", 1)) == 3
+    cache.invalidate(("resumes", 1), ("resumes", 2))
+    assert cache.get(("resumes", 1)) is None
+
+    expired = CountCache(ttl=-1)
+    expired.set("key", 1)
+    assert expired.get("key") is None
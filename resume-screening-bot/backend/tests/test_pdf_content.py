@@ -0,0 +1,53 @@
+import hashlib
+import pytest
+from PyPDF2 import PdfReader
+from app.services.pdf_extraction import classify_pdf
+from app.services.quarantine import quarantine
+from app.services.resume_parser import parse_resume_file
+from tests.helpers import make_pdf
+
+def _classify(tmp_path, content: bytes) -> dict:
+    path = tmp_path / "classified.pdf"
+    path.write_bytes(content)
+    return classify_pdf(PdfReader(str(path)))
+
+@pytest.mark.parametrize("pages, image_pages, content", [
+    (["Typed resume"], 0, "text"),
+    (["Typed resume"], 1, "mixed"),
+    ([], 2, "image-only"),
+    ([""], 0, "empty"),
+])
+def test_content_classification(tmp_path, pages, image_pages, content):
+    assert _classify(tmp_path, make_pdf(pages, image_pages))["content"] == content
+
+def test_only_the_first_pages_are_sampled_when_they_show_text(tmp_path):
+    stats = _classify(tmp_path, make_pdf([f"Page {n}" for n in range(10)]))
+    assert stats["checked_pages"] == 3 and stats["text_pages"] == 3
+
+def test_scanned_pdfs_skip_extraction(tmp_path):
+    path = tmp_path / "scan.pdf"
+    path.write_bytes(make_pdf(image_pages=3))
+    parsed = parse_resume_file(str(path), ".pdf")
+    assert parsed["raw_text"] == "" and parsed["extraction_stats"]["content"] == "image-only"
+    assert "strategy" not in parsed["extraction_stats"]
+
+def test_scanned_uploads_are_rejected_and_kept_aside(client, upload):
+    content = make_pdf(image_pages=2)
+    response = upload("Scanned.pdf", content)
+    assert response.status_code == 422 and "OCR is not supported" in response.json()["detail"]
+    sha256 = hashlib.sha256(content).hexdigest()
+    assert quarantine.lookup([sha256]) == {sha256: "image-only"}
+    assert upload("Scanned again.pdf", content).status_code == 422
+    quarantine.release(sha256)
+
+def test_blank_uploads_are_rejected(client, upload):
+    response = upload("Blank.pdf", make_pdf([""]))
+    assert response.status_code == 400
+
+def test_bulk_uploads_report_scanned_files(client, user_id):
+    files = [("files", ("Bulk Scan.pdf", make_pdf(image_pages=7))),
+             ("files", ("Bulk Typed.txt", b"Bulk Typed\nSkills: Python, SQL\nExperience: engineer"))]
+    body = client.post("/api/resumes/bulk-upload", params={"user_id": user_id}, files=files).json()
+    assert [item["filename"] for item in body["results"]] == ["Bulk Typed.txt"]
+    assert "OCR is not supported" in body["errors"][0]["error"]
+    quarantine.release(hashlib.sha256(make_pdf(image_pages=7)).hexdigest())
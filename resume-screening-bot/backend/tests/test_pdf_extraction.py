@@ -0,0 +1,56 @@
+import pytest
+from app.models.models import Resume
+from app.services import pdf_extraction
+from app.services.pdf_extraction import PdfTextExtractor, normalize_page_text, text_quality
+from app.services.resume_parser import EXTRACTOR_VERSION
+from app.utils.page_cache import PageTextCache
+from tests.helpers import make_pdf
+
+PAGE = """Jane Doe
+jane.doe@example.com
+SKILLS
+Python, SQL, Docker and Kubernetes
+EXPERIENCE
+Software Engineer at Acme Corp building REST APIs"""
+
+@pytest.fixture
+def no_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(pdf_extraction, "page_cache", PageTextCache(str(tmp_path), enabled=False))
+
+def test_text_quality_tells_clean_from_broken_text():
+    assert text_quality(PAGE)["score"] > 0.9
+    assert text_quality("too short")["score"] == 0.0
+    assert text_quality(PAGE.replace("o", "(cid:12)"))["score"] < 0.8
+    assert text_quality(" ".join(PAGE))["score"] < 0.8  # Letter-spaced
+    assert text_quality(PAGE.replace("@", " @"))["defects"] == 1
+
+def test_normalize_page_text():
+    assert normalize_page_text("  Jane   Doe \n\n\t Python  SQL  ") == "Jane Doe\nPython SQL"
+
+def test_good_pages_stay_on_the_fast_path(tmp_path, no_cache):
+    path = tmp_path / "clean.pdf"
+    path.write_bytes(make_pdf([PAGE, PAGE]))
+    text, stats = PdfTextExtractor(min_quality=0.5).extract(str(path))
+    assert stats["strategy"] == "fast" and (stats["fast"], stats["layout"]) == (2, 0)
+    assert "Software Engineer at Acme Corp" in text
+
+def test_poor_pages_fall_back_to_layout_analysis(tmp_path, no_cache):
+    path = tmp_path / "fallback.pdf"
+    path.write_bytes(make_pdf([PAGE, "x"]))
+    text, stats = PdfTextExtractor(min_quality=0.5).extract(str(path))
+    assert stats["strategy"] == "mixed" and stats["layout"] == 1
+    assert stats["fallback_pages"][0]["page"] == 2
+    assert "Jane Doe" in text
+
+def test_page_range(tmp_path, no_cache):
+    path = tmp_path / "range.pdf"
+    path.write_bytes(make_pdf(["First page text", "Second page text", "Third page text"]))
+    text, stats = PdfTextExtractor(min_quality=0).extract(str(path), 1, 2)
+    assert text == "Second page text" and stats["pages"] == 1
+
+def test_uploads_record_how_their_text_was_extracted(client, db, upload):
+    response = upload("Stamped Candidate.pdf", make_pdf([PAGE]))
+    assert response.status_code == 200, response.text
+    resume = db.get(Resume, response.json()["id"])
+    assert resume.extractor_version == EXTRACTOR_VERSION
+    assert resume.extraction_stats["format"] == "pdf" and resume.extraction_stats["pages"] == 1
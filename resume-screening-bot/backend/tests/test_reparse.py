@@ -0,0 +1,74 @@
+from sqlalchemy import update
+from sqlalchemy.orm import selectinload
+from app.models.models import MaintenanceCheckpoint, Resume
+from app.services.reparse import ResumeReparser
+from app.services.resume_parser import EXTRACTOR_VERSION, PARSER_VERSION
+from app.utils.write_queue import write_queue
+
+def _outdate(db, *resume_ids, **values):
+    db.execute(update(Resume).where(Resume.id.in_(resume_ids)).values(**values))
+    db.commit()
+
+def _resume(db, resume_id) -> Resume:
+    db.expire_all()
+    return db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id == resume_id).one()
+
+def test_outdated_resumes_are_parsed_again(client, db, upload):
+    resume_id = upload("Reparsed Candidate.txt").json()["id"]
+    parsed_data = _resume(db, resume_id).parsed_data
+    _outdate(db, resume_id, parser_version=0, parsed_data={"skills": []})
+
+    reparser = ResumeReparser(chunk_size=2)
+    assert reparser.outdated_count(db) >= 1
+    stats = reparser.run()
+    assert stats["changed"] >= 1 and stats["failed"] == 0
+
+    resume = _resume(db, resume_id)
+    assert resume.parser_version == PARSER_VERSION and resume.parsed_data == parsed_data
+    assert reparser.outdated_count(db) == 0
+    assert reparser.run() == {"checked": 0, "changed": 0, "failed": 0}
+
+def test_a_text_pass_never_marks_text_as_reextracted(client, db, upload):
+    resume_id = upload("Text Pass.txt").json()["id"]
+    _outdate(db, resume_id, parser_version=0, extractor_version=0)
+
+    ResumeReparser().run()
+    resume = _resume(db, resume_id)
+    assert resume.parser_version == PARSER_VERSION and resume.extractor_version == 0
+
+def test_a_file_pass_extracts_the_text_again(client, db, upload):
+    resume_id = upload("File Pass.txt").json()["id"]
+    original = _resume(db, resume_id).raw_text
+
+    def corrupt(writer):
+        resume = writer.get(Resume, resume_id, options=[selectinload(Resume.text_record)])
+        resume.raw_text = "text from an old extractor"
+        resume.extractor_version = 0
+    write_queue.run(corrupt)
+
+    ResumeReparser().run(from_files=True)
+    resume = _resume(db, resume_id)
+    assert resume.raw_text == original
+    assert resume.extractor_version == EXTRACTOR_VERSION and resume.extraction_stats
+
+def test_an_interrupted_run_resumes_from_its_checkpoint(client, db, upload):
+    first = upload("Checkpoint One.txt").json()["id"]
+    second = upload("Checkpoint Two.txt").json()["id"]
+    _outdate(db, first, second, parser_version=0)
+    reparser = ResumeReparser(chunk_size=1)
+    write_queue.run(lambda writer: reparser._save_cursor(writer, first, False))
+
+    reparser.run()
+    assert _resume(db, first).parser_version == 0
+    assert _resume(db, second).parser_version == PARSER_VERSION
+    # The pass completed, so the next one starts over and picks up what came before the cursor
+    assert db.get(MaintenanceCheckpoint, ResumeReparser.CHECKPOINT).cursor == 0
+    reparser.run()
+    assert _resume(db, first).parser_version == PARSER_VERSION
+
+def test_a_checkpoint_from_another_kind_of_pass_is_ignored(client, db):
+    reparser = ResumeReparser()
+    write_queue.run(lambda writer: reparser._save_cursor(writer, 10 ** 9, True))
+    assert reparser._load_cursor(db, from_files=True) == 10 ** 9
+    assert reparser._load_cursor(db, from_files=False) == 0
+    write_queue.run(lambda writer: reparser._save_cursor(writer, 0, False))
@@ -0,0 +1,73 @@
+import gzip
+import json
+from datetime import datetime
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse
+from fastapi.testclient import TestClient
+from app.utils.responses import CompressionMiddleware, FastJSONResponse
+
+LARGE = {"items": [{"id": i, "name": f"candidate {i}"} for i in range(200)]}
+
+@pytest.fixture(scope="module")
+def small_app():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=1024)
+
+    @app.get("/large")
+    def large():
+        return FastJSONResponse(LARGE, headers={"Vary": "Origin"})
+
+    @app.get("/small")
+    def small():
+        return FastJSONResponse({"ok": True})
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\x00" * 4096, media_type="application/octet-stream")
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"x" * 2048, b"y" * 2048]), media_type="text/plain")
+
+    @app.get("/numpy")
+    def numpy_values():
+        return FastJSONResponse({"scores": np.array([1.5, 2.0], dtype=np.float32), "at": datetime(2024, 1, 2, 3, 4, 5)})
+
+    return TestClient(app)
+
+def _get(client, path, accept):
+    # httpx decodes gzip and br bodies itself, so .json() works either way
+    return client.get(path, headers={"Accept-Encoding": accept})
+
+def test_large_json_is_gzipped(small_app):
+    response = _get(small_app, "/large", "gzip")
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Origin, Accept-Encoding"
+    assert response.json() == LARGE
+
+def test_brotli_is_preferred_when_accepted(small_app):
+    pytest.importorskip("brotli")
+    response = _get(small_app, "/large", "gzip, br")
+    assert response.headers["content-encoding"] == "br"
+
+def test_refused_or_unknown_encodings_pass_through(small_app):
+    for accept in ("gzip;q=0", "identity", ""):
+        response = _get(small_app, "/large", accept)
+        assert "content-encoding" not in response.headers
+        assert response.json() == LARGE
+
+@pytest.mark.parametrize("path", ["/small", "/binary", "/stream"])
+def test_small_binary_and_streaming_bodies_are_not_compressed(small_app, path):
+    response = _get(small_app, path, "gzip")
+    assert "content-encoding" not in response.headers
+
+def test_compressed_length_matches_body(small_app):
+    with small_app.stream("GET", "/large", headers={"Accept-Encoding": "gzip"}) as response:
+        raw = b"".join(response.iter_raw())
+    assert int(response.headers["content-length"]) == len(raw)
+    assert json.loads(gzip.decompress(raw)) == LARGE
+
+def test_fast_json_serializes_numpy_and_datetimes(small_app):
+    assert _get(small_app, "/numpy", "").json() == {"scores": [1.5, 2.0], "at": "2024-01-02T03:04:05"}
@@ -0,0 +1,52 @@
+import pytest
+from app.services.resume_search import resume_search
+from tests.helpers import resume_text
+
+@pytest.fixture
+def indexed(upload, user_id):
+    first = upload("Search One.txt", resume_text("Search One", skills="Zephyrlang, Quokkadb, C++")).json()["id"]
+    second = upload("Search Two.txt", resume_text("Search Two", skills="Zephyrlang, Wombatmq")).json()["id"]
+    return first, second
+
+def _search(client, q, **params):
+    response = client.get("/api/resumes/search/text", params={"q": q, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+def test_all_and_any_matching(client, indexed, user_id):
+    first, second = indexed
+    assert {r["resume_id"] for r in _search(client, "zephyrlang", user_id=user_id)["results"]} == {first, second}
+    assert [r["resume_id"] for r in _search(client, "zephyrlang quokkadb", user_id=user_id)["results"]] == [first]
+    found = _search(client, "quokkadb wombatmq", match="any", user_id=user_id)
+    assert {r["resume_id"] for r in found["results"]} == {first, second} and found["total"] == 2
+
+def test_stemmed_terms_and_marked_snippets(client, indexed, user_id):
+    first, _ = indexed
+    [result] = _search(client, "quokkadbs", user_id=user_id)["results"]
+    assert result["resume_id"] == first
+    assert "<mark>Quokkadb</mark>" in result["snippet"]
+
+def test_owner_filter_and_paging(client, indexed, user_id):
+    assert _search(client, "zephyrlang", user_id=user_id + 10 ** 6)["total"] == 0
+    page = _search(client, "zephyrlang", user_id=user_id, limit=1, offset=1)
+    assert page["total"] == 2 and len(page["results"]) == 1
+
+@pytest.mark.parametrize("q", ['"', 'NEAR(zephyrlang', "c++ OR", "*", "-zephyrlang", "a:b"])
+def test_query_syntax_is_never_interpreted(client, indexed, q):
+    _search(client, q)
+
+@pytest.mark.parametrize("params", [{"q": ""}, {"q": "x", "match": "some"}, {"q": "x", "limit": 101}])
+def test_invalid_parameters_are_422(client, params):
+    assert client.get("/api/resumes/search/text", params=params).status_code == 422
+
+def test_unavailable_search_is_503(client, monkeypatch):
+    monkeypatch.setattr(resume_search, "dialect", None)
+    assert client.get("/api/resumes/search/text", params={"q": "python"}).status_code == 503
+
+def test_snippet_window():
+    doc = " ".join(f"word{i}" for i in range(100)) + " target " + " ".join(f"tail{i}" for i in range(100))
+    snippet = resume_search.snippet(doc, ["target"])
+    assert snippet.startswith("…") and snippet.endswith("…")
+    assert "<mark>target</mark>" in snippet
+    assert resume_search.snippet("", ["target"]) == ""
+    assert "<mark>" not in resume_search.snippet("no match here", ["target"])
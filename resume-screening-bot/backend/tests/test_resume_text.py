@@ -0,0 +1,109 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import selectinload
+from app import database
+from app.database import Base, SessionLocal, engine
+from app.models.models import Resume, ResumeText
+from app.services.resume_search import resume_search
+from app.utils.text_codec import compress_text, decompress_text
+
+SAMPLE = "Résumé of Jane Doe — Python, SQL, C++ " * 50
+
+@pytest.mark.parametrize("codec", ["zstd", "zlib", "identity"])
+def test_codecs_round_trip(codec):
+    used, data = compress_text(SAMPLE, codec)
+    assert decompress_text(used, data) == SAMPLE
+    if used != "identity":
+        assert len(data) < len(SAMPLE.encode())
+
+def test_missing_text_decodes_to_empty():
+    assert decompress_text(None, None) == ""
+    assert decompress_text(*compress_text(None)) == ""
+
+def test_text_is_only_loaded_on_request(client, upload):
+    resume_id = upload("Lazy Text.txt").json()["id"]
+    db = SessionLocal()
+    try:
+        with pytest.raises(InvalidRequestError):
+            db.get(Resume, resume_id).raw_text
+        db.expunge_all()
+        resume = db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id == resume_id).one()
+        assert "Lazy Text" in resume.raw_text
+        assert resume.text_record.size == len(resume.raw_text.encode())
+    finally:
+        db.close()
+
+def _found(client, term, user_id):
+    response = client.get("/api/resumes/search/text", params={"q": term, "user_id": user_id})
+    return [r["resume_id"] for r in response.json()["results"]]
+
+def test_orm_updates_and_deletes_keep_the_index_in_sync(client, upload, user_id):
+    resume_id = upload("Synced Text.txt", "Synced Text\nSkills: Oldskillium").json()["id"]
+    assert _found(client, "oldskillium", user_id) == [resume_id]
+
+    db = SessionLocal()
+    try:
+        resume = db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id == resume_id).one()
+        resume.raw_text = "Synced Text\nSkills: Newskillium"
+        db.commit()
+        assert _found(client, "oldskillium", user_id) == []
+        assert _found(client, "newskillium", user_id) == [resume_id]
+
+        db.delete(db.get(ResumeText, resume_id))
+        db.commit()
+        assert _found(client, "newskillium", user_id) == []
+    finally:
+        db.close()
+
+def test_startup_indexes_rows_written_behind_the_application(client, user_id):
+    codec, data = compress_text("Written directly with Hiddenskillium")
+    with engine.begin() as conn:
+        resume_id = conn.execute(
+            text("INSERT INTO resumes (user_id, filename) VALUES (:user_id, 'raw.txt') RETURNING id"), {"user_id": user_id}
+        ).scalar()
+        conn.execute(text("INSERT INTO resume_texts (resume_id, codec, data) VALUES (:id, :codec, :data)"),
+                     {"id": resume_id, "codec": codec, "data": data})
+        # An entry whose text is gone: forces a rebuild
+        conn.execute(text("INSERT INTO resumes_fts(rowid, raw_text) VALUES (999999999, 'orphan')"))
+    assert _found(client, "hiddenskillium", user_id) == []
+
+    resume_search.ensure_index(engine)
+    assert _found(client, "hiddenskillium", user_id) == [resume_id]
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT count(*) FROM resumes_fts WHERE rowid = 999999999")).scalar() == 0
+
+def test_legacy_trigger_index_is_replaced(tmp_path):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        conn.execute(text("CREATE VIRTUAL TABLE resumes_fts USING fts5(raw_text, content='resumes', content_rowid='id')"))
+        conn.execute(text("CREATE TRIGGER resumes_fts_insert AFTER INSERT ON resumes BEGIN SELECT 1; END"))
+    try:
+        resume_search.ensure_index(legacy)
+        with legacy.connect() as conn:
+            schema = conn.execute(text("SELECT sql FROM sqlite_master WHERE name = 'resumes_fts'")).scalar()
+            triggers = conn.execute(text("SELECT count(*) FROM sqlite_master WHERE type = 'trigger'")).scalar()
+        assert "content=''" in schema and triggers == 0
+    finally:
+        resume_search.ensure_index(engine)
+        legacy.dispose()
+
+def test_inline_text_moves_to_the_side_table(tmp_path, monkeypatch):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'inline.db'}")
+    Base.metadata.create_all(legacy)
+    with legacy.begin() as conn:
+        conn.execute(text("ALTER TABLE resumes ADD COLUMN raw_text TEXT"))
+        conn.execute(text("INSERT INTO resumes (id, filename, raw_text) VALUES (1, 'a.txt', 'Inline text one'), "
+                          "(2, 'b.txt', 'Inline text two'), (3, 'c.txt', NULL)"))
+    monkeypatch.setattr(database, "engine", legacy)
+
+    database.move_inline_resume_text(batch_size=1)
+    database.move_inline_resume_text(batch_size=1)  # Resumable: nothing left to move
+
+    with legacy.connect() as conn:
+        stored = {row.resume_id: decompress_text(row.codec, row.data)
+                  for row in conn.execute(text("SELECT resume_id, codec, data FROM resume_texts"))}
+        leftover = conn.execute(text("SELECT count(*) FROM resumes WHERE raw_text IS NOT NULL")).scalar()
+    assert stored == {1: "Inline text one", 2: "Inline text two"} and leftover == 0
+    legacy.dispose()
@@ -0,0 +1,77 @@
+import io
+import pytest
+from sqlalchemy.orm import selectinload
+from app.models.models import Resume, StoredBlob
+from app.services import resume_writer as resume_writer_module
+from app.services.blob_store import LocalFile, blob_store
+from app.services.resume_writer import ResumeWriter
+
+@pytest.fixture
+def batch(client, user_id):
+    """Build n new resumes with staged files; the staged copies are removed afterwards"""
+    staged = []
+
+    def build(n: int, tag: str = ""):
+        resumes, sources = [], []
+        for i in range(n):
+            text = f"Writer candidate {tag}{i} of user {user_id}"
+            source = blob_store.stage(io.BytesIO(text.encode()), ".txt")
+            blob_store.store(source)
+            staged.append(source)
+            resumes.append(Resume(user_id=user_id, filename=f"{tag}{i}.txt", blob_sha256=source.sha256, raw_text=text))
+            sources.append(source)
+        return resumes, sources
+    yield build
+    for source in staged:
+        source.close()
+
+def _stored(db, ids):
+    db.expire_all()
+    rows = db.query(Resume).options(selectinload(Resume.text_record)).filter(Resume.id.in_(ids))
+    return {row.id: (row.filename, row.raw_text) for row in rows}
+
+def test_returned_ids_line_up_with_the_rows(db, batch, monkeypatch):
+    monkeypatch.setattr(resume_writer_module, "ROWS_PER_STATEMENT", 3)
+    resumes, sources = batch(8)
+    ids = ResumeWriter().insert(resumes, sources)
+    assert [resume.id for resume in resumes] == ids
+    assert _stored(db, ids) == {resume.id: (resume.filename, resume.raw_text) for resume in resumes}
+    assert all(db.get(StoredBlob, source.sha256).refcount == 1 for source in sources)
+    assert db.get(Resume, ids[0]).parser_version == 0  # Column defaults are filled in
+
+def test_inserted_text_is_searchable(client, batch, user_id):
+    resumes, sources = batch(2, tag="Quillfeather")
+    ResumeWriter().insert(resumes, sources)
+    found = client.get("/api/resumes/search/text", params={"q": "quillfeather1", "user_id": user_id}).json()
+    assert [r["resume_id"] for r in found["results"]] == [resumes[1].id]
+
+def test_batch_size_follows_the_measured_row_cost():
+    writer = ResumeWriter(target_ms=100)
+    assert writer.batch_size == ResumeWriter.MIN_BATCH * 10
+    writer._observe(100, 1.0)  # 10 ms per row
+    assert writer.batch_size == 10
+    writer._observe(1000, 0.001)
+    assert ResumeWriter.MIN_BATCH < writer.batch_size <= ResumeWriter.MAX_BATCH
+    fast = ResumeWriter(target_ms=100)
+    fast._observe(1, 1e-9)
+    assert fast.batch_size == ResumeWriter.MAX_BATCH
+
+def test_a_failed_chunk_keeps_the_committed_ones(db, batch):
+    writer = ResumeWriter()
+    writer.row_seconds = 1  # Smallest chunks: MIN_BATCH rows per transaction
+    resumes, sources = batch(ResumeWriter.MIN_BATCH + 2)
+    # A file that cannot be stored fails the second chunk
+    sources[-1] = LocalFile("/nonexistent/file.txt", "0" * 64, 1)
+    resumes[-1].blob_sha256 = sources[-1].sha256
+    with pytest.raises(OSError):
+        writer.insert(resumes, sources)
+    committed = [resume.id for resume in resumes[:ResumeWriter.MIN_BATCH]]
+    assert all(committed) and len(_stored(db, committed)) == ResumeWriter.MIN_BATCH
+    assert all(resume.id is None for resume in resumes[ResumeWriter.MIN_BATCH:])
+    assert db.get(StoredBlob, sources[-2].sha256) is None
+
+def test_databases_without_returning_use_the_orm(db, batch, monkeypatch):
+    monkeypatch.setattr(resume_writer_module, "_insert_rows", lambda db, rows: None)
+    resumes, sources = batch(3, tag="orm")
+    ids = ResumeWriter().insert(resumes, sources)
+    assert _stored(db, ids) == {resume.id: (resume.filename, resume.raw_text) for resume in resumes}
@@ -0,0 +1,91 @@
+import hashlib
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app.models.models import QuarantinedFile, StoredBlob
+from app.routes import resume_routes
+from app.services.quarantine import quarantine
+from app.utils.sandbox import ParseAborted, SandboxPool
+from tests import sandbox_tasks as tasks
+from tests.helpers import resume_text
+
+@pytest.fixture(scope="module")
+def pool():
+    sandbox = SandboxPool(1, timeout=2, memory_mb=256, max_tasks=3)
+    yield sandbox
+    sandbox.shutdown()
+
+def test_errors_are_raised_and_the_worker_is_kept(pool):
+    pid = pool.run(tasks.pid)
+    with pytest.raises(ValueError, match="bad input"):
+        pool.run(tasks.fail)
+    assert pool.run(tasks.pid) == pid
+
+def test_workers_are_retired_after_max_tasks(pool):
+    pids = [pool.run(tasks.pid) for _ in range(4)]
+    assert len(set(pids)) == 2
+
+@pytest.mark.parametrize("fn, args, reason", [
+    (tasks.sleep, (30,), "timeout"),
+    (tasks.allocate, (2048,), "memory"),
+    (tasks.exit_with, (3,), "crash"),
+])
+def test_aborted_tasks_are_replaced_with_a_fresh_worker(pool, fn, args, reason):
+    pid = pool.run(tasks.pid)
+    with pytest.raises(ParseAborted) as aborted:
+        pool.run(fn, *args)
+    assert aborted.value.reason == reason
+    assert pool.run(tasks.pid) != pid
+    assert pool.stats()["workers"] == 1
+
+def test_a_shut_down_pool_refuses_work():
+    sandbox = SandboxPool(1)
+    sandbox.shutdown()
+    with pytest.raises(RuntimeError):
+        sandbox.run(tasks.pid)
+
+@pytest.fixture
+def quarantined(client, db, upload, user_id, monkeypatch):
+    """Upload a file whose parse "times out"; returns its content and SHA-256"""
+    async def timed_out(path, extension):
+        raise ParseAborted("timeout", "no result after 60 s")
+    content = resume_text(f"Quarantined {user_id}")
+    with monkeypatch.context() as patch:
+        patch.setattr(resume_routes, "parse_file", timed_out)
+        response = upload("Quarantined.txt", content)
+    assert response.status_code == 422 and "quarantined" in response.json()["detail"]
+    return content, hashlib.sha256(content.encode()).hexdigest()
+
+def test_quarantined_files_are_rejected_up_front(client, db, upload, quarantined):
+    content, sha256 = quarantined
+    assert db.get(StoredBlob, sha256).refcount == 1
+    response = upload("Quarantined again.txt", content)
+    assert response.status_code == 422 and "parsing it failed before (timeout)" in response.json()["detail"]
+
+def test_released_files_are_parsed_again(client, db, upload, quarantined):
+    content, sha256 = quarantined
+    assert quarantine.release(sha256) == 1
+    db.expire_all()
+    assert db.get(StoredBlob, sha256) is None  # The quarantine held the only reference
+    assert upload("Released.txt", content).status_code == 200
+
+def test_entries_expire_and_are_swept(client, db, upload, quarantined):
+    content, sha256 = quarantined
+    db.execute(update(QuarantinedFile).where(QuarantinedFile.sha256 == sha256)
+               .values(created_at=datetime.utcnow() - timedelta(days=30)))
+    db.commit()
+    assert quarantine.lookup([sha256]) == {}
+    assert quarantine.sweep() >= 1
+    db.expire_all()
+    assert db.query(QuarantinedFile).filter(QuarantinedFile.sha256 == sha256).count() == 0
+    assert db.get(StoredBlob, sha256) is None
+
+def test_image_only_entries_never_expire(client, db):
+    sha256 = hashlib.sha256(b"scanned pdf").hexdigest()
+    quarantine.add(sha256, None, "scan.pdf", None, "image-only", "no text layer")
+    db.execute(update(QuarantinedFile).where(QuarantinedFile.sha256 == sha256)
+               .values(created_at=datetime.utcnow() - timedelta(days=365)))
+    db.commit()
+    quarantine.sweep()
+    assert quarantine.lookup([sha256]) == {sha256: "image-only"}
+    quarantine.release(sha256)
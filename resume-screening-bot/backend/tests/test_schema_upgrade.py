@@ -0,0 +1,77 @@
+import pytest
+from sqlalchemy import create_engine, inspect, select, text
+from app import database
+from app.models.models import AnalysisResult, Resume
+from app.utils.pagination import PageParams
+
+LEGACY_ANALYSES = """
+CREATE TABLE analysis_results (
+    id INTEGER PRIMARY KEY, user_id INTEGER, resume_id INTEGER, job_id INTEGER,
+    overall_score FLOAT, skills_matched JSON, skills_missing JSON, extra_skills JSON,
+    recommendations JSON, created_at DATETIME
+)
+"""
+# The listing index before it was keyed for keyset paging
+RETIRED_INDEX = "CREATE INDEX ix_analysis_results_resume_created ON analysis_results (resume_id, created_at, id)"
+
+def _plan(db, statement) -> str:
+    sql = statement.compile(database.engine, compile_kwargs={"literal_binds": True})
+    return " ".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+def test_upgrade_backfills_new_columns_and_adds_indexes(tmp_path, monkeypatch):
+    legacy = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with legacy.begin() as conn:
+        conn.execute(text(LEGACY_ANALYSES))
+        conn.execute(text(RETIRED_INDEX))
+        conn.execute(text(
+            "INSERT INTO analysis_results (id, resume_id, skills_matched, skills_missing) "
+            "VALUES (1, 7, '[\"python\", \"sql\"]', NULL)"
+        ))
+    monkeypatch.setattr(database, "engine", legacy)
+
+    database.upgrade_schema()
+    database.upgrade_schema()  # Nothing left to do the second time
+
+    with legacy.connect() as conn:
+        row = conn.execute(text("SELECT matched_count, missing_count FROM analysis_results")).one()
+    assert tuple(row) == (2, 0)
+    indexes = {index["name"] for index in inspect(legacy).get_indexes("analysis_results")}
+    assert {"ix_analysis_results_resume_listing", "ix_analysis_results_job_id"} <= indexes
+    assert "ix_analysis_results_resume_created" not in indexes
+    legacy.dispose()
+
+@pytest.mark.parametrize("order, after_id", [("asc", None), ("asc", 5), ("desc", None), ("desc", 5)])
+def test_listing_pages_seek_their_covering_indexes_without_sorting(db, order, after_id):
+    page = PageParams(after_id=after_id, limit=20, order=order)
+    resumes = page.apply(
+        select(Resume.id, Resume.filename, Resume.ats_score, Resume.uploaded_at).where(Resume.user_id == 1),
+        Resume.id
+    )
+    plan = _plan(db, resumes)
+    assert "USING COVERING INDEX ix_resumes_user_listing" in plan and "TEMP B-TREE" not in plan
+
+    analyses = page.apply(
+        select(AnalysisResult.id, AnalysisResult.overall_score, AnalysisResult.created_at,
+               AnalysisResult.matched_count, AnalysisResult.missing_count)
+        .where(AnalysisResult.resume_id == 1),
+        AnalysisResult.id
+    )
+    plan = _plan(db, analyses)
+    assert "USING COVERING INDEX ix_analysis_results_resume_listing" in plan and "TEMP B-TREE" not in plan
+    if after_id is not None:
+        # after_id seeks into the index instead of filtering the resume's entries
+        assert f"(resume_id=? AND id{'>' if order == 'asc' else '<'}?)" in plan
+
+def test_analyses_store_and_list_skill_counts(client, db, upload, create_job):
+    resume_id = upload("Counted Candidate.txt").json()["id"]
+    client.post("/api/analysis/bulk-analyze", json={"resume_ids": [resume_id], "job_id": create_job(), "detail": "score"})
+
+    stored = db.query(AnalysisResult).filter(AnalysisResult.resume_id == resume_id).one()
+    assert stored.matched_count == len(stored.skills_matched)
+    assert stored.missing_count == len(stored.skills_missing)
+
+    listed = client.get(f"/api/analysis/resume/{resume_id}/analyses").json()
+    assert listed == [{
+        "id": stored.id, "overall_score": stored.overall_score, "created_at": listed[0]["created_at"],
+        "matched_skills": stored.matched_count, "missing_skills": stored.missing_count
+    }]
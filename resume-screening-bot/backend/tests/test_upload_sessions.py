@@ -0,0 +1,158 @@
+import asyncio
+import os
+from datetime import datetime, timedelta
+import pytest
+from sqlalchemy import update
+from app.config import settings
+from app.models.models import UploadSession
+from app.services.upload_sessions import SessionGone, UploadSessions, upload_sessions
+from tests.helpers import resume_text
+
+URL = "/api/resumes/upload-sessions"
+
+@pytest.fixture
+def open_session(client, user_id):
+    def open_with(*files):
+        response = client.post(URL, params={"user_id": user_id},
+                               json={"files": [{"filename": name, "size": size} for name, size in files]})
+        assert response.status_code == 200, response.text
+        return response.json()
+    return open_with
+
+def _put(client, session, index, offset, data):
+    file_id = session["files"][index]["id"]
+    return client.put(f"{URL}/{session['session_id']}/files/{file_id}", params={"offset": offset}, content=data)
+
+def test_declared_files_get_the_single_upload_checks(open_session):
+    session = open_session(("ok.txt", 10), ("virus.exe", 10), ("empty.pdf", 0), ("huge.pdf", settings.MAX_UPLOAD_SIZE + 1))
+    assert [(f["status"], f["error"]) for f in session["files"]] == [
+        ("receiving", None), ("rejected", "Invalid file type '.exe'"), ("rejected", "File is empty"),
+        ("rejected", f"File exceeds {settings.MAX_UPLOAD_SIZE // (1024 * 1024)} MB"),
+    ]
+
+def test_chunks_resume_from_what_the_server_has(client, open_session, user_id):
+    content = resume_text(f"Chunked {user_id}").encode()
+    session = open_session(("Chunked.txt", len(content)))
+    half = len(content) // 2
+
+    assert _put(client, session, 0, 0, content[:half]).json()["received"] == half
+    # A resent chunk (its response was lost) only adds the bytes past what was received
+    assert _put(client, session, 0, 0, content[:half + 10]).json()["received"] == half + 10
+    gap = _put(client, session, 0, half + 20, content[half + 20:])
+    assert gap.status_code == 409 and gap.headers["Upload-Offset"] == str(half + 10)
+
+    done = _put(client, session, 0, half + 10, content[half + 10:]).json()
+    assert done["received"] == len(content) and done["status"] == "parsing"
+    status = client.get(f"{URL}/{session['session_id']}").json()
+    assert status["files"][0]["received"] == len(content)
+
+def test_chunks_cannot_run_past_the_declared_size(client, open_session):
+    session = open_session(("Short.txt", 5))
+    response = _put(client, session, 0, 0, b"too many bytes")
+    assert response.status_code == 409 and response.headers["Upload-Offset"] == "0"
+
+def test_commit_reports_every_file(client, open_session, user_id):
+    content = resume_text(f"Committed {user_id}").encode()
+    session = open_session(("Committed.txt", len(content)), ("Partial.txt", 100), ("bad.exe", 10))
+    _put(client, session, 0, 0, content)
+    _put(client, session, 1, 0, b"partial")
+
+    summary = client.post(f"{URL}/{session['session_id']}/commit").json()
+    assert (summary["successful"], summary["failed"]) == (1, 2)
+    assert summary["errors"][0] == {"filename": "Partial.txt", "error": "Upload incomplete: 7 of 100 bytes received"}
+    resume_id = summary["results"][0]["id"]
+    assert client.get(f"/api/resumes/{resume_id}").json()["filename"] == "Committed.txt"
+
+    assert client.post(f"{URL}/{session['session_id']}/commit").json() == summary
+    assert _put(client, session, 1, 7, b"more").status_code == 409
+    assert not os.path.exists(upload_sessions.directory(session["session_id"]))
+
+def test_rejected_files_take_no_chunks(client, open_session):
+    session = open_session(("ok.txt", 10), ("bad.exe", 10))
+    assert _put(client, session, 1, 0, b"0123456789").status_code == 409
+
+@pytest.mark.parametrize("body", [{"files": []}, {"files": [{"filename": "a.txt", "size": 1}] * 3}])
+def test_session_size_limits(client, body, monkeypatch):
+    monkeypatch.setattr(settings, "UPLOAD_SESSION_MAX_FILES", 2)
+    assert client.post(URL, json=body).status_code == 400
+
+def test_unknown_sessions_and_files(client, open_session):
+    session = open_session(("ok.txt", 10))
+    assert client.get(f"{URL}/missing").status_code == 404
+    assert client.put(f"{URL}/{session['session_id']}/files/0", params={"offset": 0}, content=b"x").status_code == 404
+
+def _expire(db, session_id):
+    db.execute(update(UploadSession).where(UploadSession.id == session_id)
+               .values(created_at=datetime.utcnow() - timedelta(hours=settings.UPLOAD_SESSION_TTL_HOURS + 1)))
+    db.commit()
+
+def test_expired_sessions_are_refused(client, db, open_session):
+    session = open_session(("late.txt", 10))
+    _put(client, session, 0, 0, b"01234")
+    _expire(db, session["session_id"])
+    assert client.get(f"{URL}/{session['session_id']}").status_code == 410
+    assert _put(client, session, 0, 5, b"56789").status_code == 410
+    assert client.post(f"{URL}/{session['session_id']}/commit").status_code == 410
+    # The client can still clean up after itself
+    assert client.delete(f"{URL}/{session['session_id']}").status_code == 200
+    assert client.get(f"{URL}/{session['session_id']}").status_code == 404
+
+def test_expired_sessions_are_swept(client, db, open_session):
+    old = open_session(("old.txt", 10))
+    _expire(db, old["session_id"])
+    open_session(("new.txt", 10))
+    assert client.get(f"{URL}/{old['session_id']}").status_code == 404
+    assert not os.path.exists(upload_sessions.directory(old["session_id"]))
+
+def test_deleted_sessions_are_gone(client, open_session):
+    session = open_session(("ok.txt", 10))
+    _put(client, session, 0, 0, b"01234")
+    assert client.delete(f"{URL}/{session['session_id']}").status_code == 200
+    assert client.get(f"{URL}/{session['session_id']}").status_code == 404
+
+def test_sweep_leaves_sessions_with_work_in_flight(client, db):
+    sessions = UploadSessions()
+    session = sessions.open(None, [("busy.txt", 10)])
+    _expire(db, session.id)
+    [file] = session.files
+
+    async def scenario():
+        parse_done = asyncio.Event()
+        lock = sessions._locks.setdefault(file.id, asyncio.Lock())
+        async with lock:  # A chunk being written
+            assert await sessions.sweep() == 0
+        sessions.start(file, parse_done.wait)  # A parse still reading the part file
+        assert await sessions.sweep() == 0
+        assert os.path.isdir(sessions.directory(session.id))
+        parse_done.set()
+        assert await sessions.sweep() == 1
+        assert file.id not in sessions._locks and file.id not in sessions._tasks
+    asyncio.run(scenario())
+    assert sessions.get(session.id) is None and not os.path.exists(sessions.directory(session.id))
+
+def test_removal_waits_for_parses_and_refuses_later_chunks(client):
+    sessions = UploadSessions()
+    session = sessions.open(None, [("removed.txt", 10)])
+    [file] = session.files
+
+    async def body():
+        yield b"01234"
+
+    async def scenario():
+        finished = []
+
+        async def parse():
+            await asyncio.sleep(0.05)
+            # The part file is still there for a parse that started before the removal
+            finished.append(os.path.isdir(sessions.directory(session.id)))
+        sessions.start(file, parse)
+        removal = asyncio.create_task(sessions.remove(session))
+        await asyncio.sleep(0)
+        with pytest.raises(SessionGone):
+            await sessions.write(file, 0, body(), parse)
+        await removal
+        assert finished == [True]
+        # A request that looked the session up before it went
+        with pytest.raises(SessionGone):
+            await sessions.write(file, 0, body(), parse)
+    asyncio.run(scenario())
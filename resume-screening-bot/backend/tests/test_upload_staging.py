@@ -0,0 +1,70 @@
+import hashlib
+import io
+import mmap
+import os
+from types import SimpleNamespace
+import pytest
+from app.routes import resume_routes
+from app.services import blob_store as blob_store_module, pdf_extraction
+from app.services.blob_store import CHUNK_SIZE, BlobStore, FileSystemBackend, blob_store
+from app.services.pdf_extraction import PdfTextExtractor
+from tests.helpers import make_pdf, resume_text
+
+@pytest.fixture
+def store(tmp_path):
+    return BlobStore(FileSystemBackend(str(tmp_path / "blobs")))
+
+def test_staged_files_are_linked_into_the_store(store):
+    with store.stage(io.BytesIO(b"linked content"), ".txt") as staged:
+        assert os.path.dirname(staged.path) == store.backend.staging_dir()
+        stored = store.backend.local_path(store.key(store.store(staged)))
+        assert os.path.samefile(staged.path, stored)
+    assert os.path.exists(stored)
+
+def test_stores_without_hard_links_copy_the_file(store, monkeypatch):
+    def no_links(source, target):
+        raise OSError("links not supported")
+    monkeypatch.setattr(blob_store_module.os, "link", no_links)
+    with store.stage(io.BytesIO(b"copied content" * CHUNK_SIZE)) as staged:
+        stored = store.backend.local_path(store.key(store.store(staged)))
+        assert not os.path.samefile(staged.path, stored)
+        assert os.path.getsize(stored) == staged.size
+    assert not [name for name in os.listdir(os.path.dirname(stored)) if name.startswith(".tmp-")]
+
+def test_failed_staging_leaves_nothing_behind(store):
+    class Broken(io.BytesIO):
+        def read(self, size=-1):
+            raise ConnectionResetError("client went away")
+    with pytest.raises(ConnectionResetError):
+        store.stage(Broken())
+    assert os.listdir(store.backend.staging_dir()) == []
+
+def test_uploads_hand_workers_a_path_and_clean_up_their_staged_copy(client, upload, user_id, monkeypatch):
+    content = resume_text(f"Streamed {user_id}") + "\n" + "x" * (2 * CHUNK_SIZE)
+    parsed_paths = []
+    real_parse_file = resume_routes.parse_file
+
+    async def recording_parse_file(path, extension):
+        parsed_paths.append(path)
+        return await real_parse_file(path, extension)
+    monkeypatch.setattr(resume_routes, "parse_file", recording_parse_file)
+
+    assert upload("Streamed.txt", content).status_code == 200
+    [path] = parsed_paths
+    assert path.startswith(blob_store.backend.staging_dir()) and not os.path.exists(path)
+    stored = blob_store.backend.local_path(blob_store.key(hashlib.sha256(content.encode()).hexdigest()))
+    assert os.path.getsize(stored) == len(content)
+
+def test_pdfs_are_read_through_a_memory_map(tmp_path, monkeypatch):
+    maps = []
+    def recording_mmap(fileno, length, access):
+        maps.append(access)
+        return mmap.mmap(fileno, length, access=access)
+    monkeypatch.setattr(pdf_extraction, "mmap", SimpleNamespace(mmap=recording_mmap, ACCESS_READ=mmap.ACCESS_READ))
+
+    path = tmp_path / "mapped.pdf"
+    path.write_bytes(make_pdf(["Mapped page one", "Mapped page two"]))
+    assert PdfTextExtractor.inspect(str(path))["pages"] == 2
+    text, _ = PdfTextExtractor(min_quality=0).extract(str(path))
+    assert text.splitlines() == ["Mapped page one", "Mapped page two"]
+    assert maps == [mmap.ACCESS_READ, mmap.ACCESS_READ]
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine, select, text
+from sqlalchemy.orm import declarative_base, sessionmaker
+from app.utils.write_queue import WriteQueue
+
+Base = declarative_base()
+
+class Item(Base):
+    __tablename__ = "items"
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+@pytest.fixture
+def queue(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    write_queue = WriteQueue(sessionmaker(bind=engine, expire_on_commit=False), max_delay=0.05)
+    write_queue.engine = engine
+    yield write_queue
+    write_queue.stop()
+    engine.dispose()
+
+def _names(queue):
+    with queue.engine.connect() as connection:
+        return sorted(connection.execute(select(Item.name)).scalars())
+
+def test_run_returns_the_job_result(queue):
+    assert queue.run(lambda db: db.execute(text("SELECT 41 + 1")).scalar()) == 42
+
+def test_add_all_populates_primary_keys(queue):
+    items = queue.add_all([Item(name="a"), Item(name="b")])
+    assert all(item.id for item in items)
+    assert _names(queue) == ["a", "b"]
+
+def test_a_failing_job_only_fails_its_own_caller(queue):
+    queue.run(lambda db: db.add(Item(name="taken")))
+    # Submitted together so the writer groups them into one transaction first
+    futures = [queue.submit(lambda db, n=name: db.add(Item(name=n))) for name in ("x", "taken", "y")]
+    assert futures[0].result() is None and futures[2].result() is None
+    with pytest.raises(Exception, match="UNIQUE"):
+        futures[1].result()
+    assert _names(queue) == ["taken", "x", "y"]
+
+def test_jobs_run_on_one_writer_thread(queue):
+    threads = {queue.run(lambda db: threading.get_ident()) for _ in range(5)}
+    assert len(threads) == 1 and threading.get_ident() not in threads
+
+def test_run_async(queue):
+    assert asyncio.run(queue.run_async(lambda db: "done")) == "done"
+
+def test_stop_commits_queued_jobs_and_the_queue_restarts(queue):
+    futures = [queue.submit(lambda db, n=i: db.add(Item(name=f"q{n}"))) for i in range(3)]
+    queue.stop()
+    assert all(future.done() for future in futures)
+    queue.run(lambda db: db.add(Item(name="after-stop")))
+    assert "after-stop" in _names(queue)
+
+def test_disabled_queue_runs_in_the_caller_thread(queue):
+    queue.enabled = False
+    assert queue.run(lambda db: threading.get_ident()) == threading.get_ident()
+    with pytest.raises(Exception):
+        queue.run(lambda db: db.execute(text("SELECT * FROM missing_table")))
+
+def test_app_database_runs_in_wal_mode(client, db):
+    assert db.execute(text("PRAGMA journal_mode")).scalar().lower() == "wal"
+    assert db.execute(text("PRAGMA busy_timeout")).scalar() > 0
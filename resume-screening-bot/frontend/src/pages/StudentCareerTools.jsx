@@ -21,14 +21,13 @@ const StudentCareerTools = () => {
     // Fetch existing resumes on component mount
     const fetchResumes = async () => {
       try {
-        const response = await resumeService.getUserResumes(userId);
+        // Newest first: the list is paginated, so only this order puts the latest upload on the first page
+        const response = await resumeService.getUserResumes(userId, { order: 'desc' });
         const resumes = response.data || [];
         setAvailableResumes(resumes);
         // Set the most recent resume as current if available
         if (resumes.length > 0 && !currentResume) {
-          const latestResume = resumes.sort((a, b) => 
-            new Date(b.uploaded_at) - new Date(a.uploaded_at)
-          )[0];
+          const latestResume = resumes[0];
           setCurrentResume(latestResume.id);
           console.log('Auto-selected resume:', latestResume.id);
         }
@@ -59,7 +58,7 @@ const StudentCareerTools = () => {
       toast.success('Resume uploaded. Analyzing...');
       // Refresh the resumes list
       try {
-        const response = await resumeService.getUserResumes(userId);
+        const response = await resumeService.getUserResumes(userId, { order: 'desc' });
         setAvailableResumes(response.data || []);
       } catch (error) {
         console.error('Failed to refresh resumes:', error);
@@ -42,7 +42,8 @@ export const resumeService = {
   },
 
   getResume: (resumeId) => apiClient.get(`/resumes/${resumeId}`),
-  getUserResumes: (userId) => apiClient.get(`/resumes/user/${userId}/resumes`),
+  // One page (params: limit, after_id, order); order 'desc' lists the newest uploads first
+  getUserResumes: (userId, params = {}) => apiClient.get(`/resumes/user/${userId}/resumes`, { params }),
   deleteResume: (resumeId) => apiClient.delete(`/resumes/${resumeId}`),
 };
 